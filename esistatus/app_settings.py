@@ -18,3 +18,247 @@ def debug_enabled() -> RegexFlag:
     """
 
     return settings.DEBUG
+
+
+def esi_base_url() -> str:
+    """
+    Base URL of ESI, the ESI meta endpoints are requested relative to it
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_ESI_BASE_URL", "https://esi.evetech.net")
+
+
+def esi_meta_transport() -> str | None:
+    """
+    Dotted path to a `requests` transport adapter for the ESI meta endpoints.
+    The default HTTP adapter (with connection pooling and retries) is used if not set.
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_HTTP_TRANSPORT", None)
+
+
+def esi_meta_transport_options() -> dict:
+    """
+    Keyword arguments for the transport adapter set in `ESISTATUS_HTTP_TRANSPORT`
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_HTTP_TRANSPORT_OPTIONS", {})
+
+
+def esi_meta_pool_size() -> int:
+    """
+    Number of pooled connections the ESI meta client keeps per worker process
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_HTTP_POOL_SIZE", 4)
+
+
+def esi_meta_max_retries() -> int:
+    """
+    Number of retries for failed requests to the ESI meta endpoints
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_HTTP_MAX_RETRIES", 2)
+
+
+def esi_meta_backoff_factor() -> float:
+    """
+    Backoff factor between retries to the ESI meta endpoints
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_HTTP_BACKOFF_FACTOR", 0.5)
+
+
+def esi_meta_timeout() -> tuple[float, float]:
+    """
+    Connect and read timeout for requests to the ESI meta endpoints
+
+    :return:
+    :rtype:
+    """
+
+    return (
+        getattr(settings, "ESISTATUS_HTTP_CONNECT_TIMEOUT", 5),
+        getattr(settings, "ESISTATUS_HTTP_READ_TIMEOUT", 10),
+    )
+
+
+def openapi_streaming_enabled() -> bool:
+    """
+    Check if the ESI OpenAPI specs should be parsed while they are downloaded.
+    Needs the optional `ijson` package.
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_OPENAPI_STREAMING", True)
+
+
+def cache_compression_enabled() -> bool:
+    """
+    Check if large cache values should be stored compressed
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_CACHE_COMPRESSION", False)
+
+
+def cache_compression_threshold() -> int:
+    """
+    Minimum size (in bytes) of a pickled cache value to be stored compressed
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_CACHE_COMPRESSION_THRESHOLD", 4096)
+
+
+def history_retention_days() -> int:
+    """
+    Number of days the status changes of ESI routes are kept
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_HISTORY_RETENTION_DAYS", 30)
+
+
+def history_prune_batch_size() -> int:
+    """
+    Number of status changes deleted per batch when pruning the history
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_HISTORY_PRUNE_BATCH_SIZE", 1000)
+
+
+def live_updates_enabled() -> bool:
+    """
+    Check if the ESI status pages are updated via Server-Sent Events.
+    Needs Auth to be served via ASGI, the stream isn't served under WSGI,
+    where each open page would keep a web worker busy.
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_LIVE_UPDATES", False)
+
+
+def live_updates_timeout() -> int:
+    """
+    Maximum time (in seconds) a live update connection is kept open before the
+    browser has to reconnect
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_LIVE_UPDATES_TIMEOUT", 300)
+
+
+def metrics_enabled() -> bool:
+    """
+    Check if metrics of the ESI status update are recorded and exposed
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_METRICS", False)
+
+
+def metrics_token() -> str | None:
+    """
+    Bearer token for the metrics endpoint, without it only superusers can access it
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_METRICS_TOKEN", None)
+
+
+def update_lock_timeout() -> int:
+    """
+    Maximum time (in seconds) an ESI status update run holds its lock, a run of a
+    worker that died releases it after this time
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_UPDATE_LOCK_TIMEOUT", 300)
+
+
+def update_task_expires() -> int | None:
+    """
+    Time (in seconds) after which a queued ESI status update task is discarded
+    instead of being run late
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_UPDATE_TASK_EXPIRES", 55)
+
+
+def cache_lock_timeout() -> int:
+    """
+    Maximum time (in seconds) a process holds the lock to refetch a missing cache
+    value, and the others wait for it
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_CACHE_LOCK_TIMEOUT", 60)
+
+
+def cache_stale_ttl() -> int:
+    """
+    Time (in seconds) a cached value is still served after the daily ESI rollover,
+    while a fresh one is fetched in the background
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_CACHE_STALE_TTL", 3600)
+
+
+def cache_expiry_jitter() -> int:
+    """
+    Maximum random time (in seconds) added to the expiry of a cached value, so not
+    all values expire at the same moment
+
+    :return:
+    :rtype:
+    """
+
+    return getattr(settings, "ESISTATUS_CACHE_EXPIRY_JITTER", 300)
@@ -0,0 +1,101 @@
+"""
+Route-level changes between two ESI status runs
+"""
+
+# Standard Library
+from dataclasses import dataclass, field
+
+RouteKey = tuple[str, str]
+"""A route, identified by (method, path)"""
+
+
+@dataclass(frozen=True)
+class StatusTransition:
+    """
+    Status change of a route that exists in both runs
+    """
+
+    method: str
+    path: str
+    old_status: str
+    new_status: str
+
+
+@dataclass(frozen=True)
+class Changeset:
+    """
+    Changes between two ESI status runs
+    """
+
+    added: dict[RouteKey, str] = field(default_factory=dict)
+    """Routes that are new, with their status"""
+
+    removed: dict[RouteKey, str] = field(default_factory=dict)
+    """Routes that are gone, with their last status"""
+
+    transitions: list[StatusTransition] = field(default_factory=list)
+    """Status changes of routes that exist in both runs"""
+
+    def __bool__(self) -> bool:
+        """
+        Check if there are any changes
+
+        :return:
+        :rtype:
+        """
+
+        return bool(self.added or self.removed or self.transitions)
+
+
+def route_statuses(routes: list) -> dict[RouteKey, str]:
+    """
+    Get the status of each route from an (enriched) ESI status route list
+
+    :param routes: The ESI status routes
+    :type routes: list
+    :return: The status, keyed by (method, path)
+    :rtype: dict[RouteKey, str]
+    """
+
+    return {
+        (route["method"].upper(), route["path"]): route["status"] for route in routes
+    }
+
+
+def diff_route_statuses(
+    previous: dict[RouteKey, str], current: dict[RouteKey, str]
+) -> Changeset:
+    """
+    Compare the route statuses of two runs in linear time
+
+    :param previous: The previous status, keyed by (method, path)
+    :type previous: dict[RouteKey, str]
+    :param current: The current status, keyed by (method, path)
+    :type current: dict[RouteKey, str]
+    :return: The changes
+    :rtype: Changeset
+    """
+
+    added = {}
+    transitions = []
+
+    for key, new_status in current.items():
+        old_status = previous.get(key)
+
+        if old_status is None:
+            added[key] = new_status
+        elif old_status != new_status:
+            transitions.append(
+                StatusTransition(
+                    method=key[0],
+                    path=key[1],
+                    old_status=old_status,
+                    new_status=new_status,
+                )
+            )
+
+    removed = {
+        key: old_status for key, old_status in previous.items() if key not in current
+    }
+
+    return Changeset(added=added, removed=removed, transitions=transitions)
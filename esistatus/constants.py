@@ -5,24 +5,121 @@ Constants we use throughout the app
 # All internal URLs need to start with this prefix
 INTERNAL_URL_PREFIX = "-"
 
+# Statuses an ESI route can have
+ESI_ROUTE_STATUSES = ("Unknown", "OK", "Degraded", "Down", "Recovering")
+
 
 # Standard Library
 from enum import Enum
+from urllib.parse import urlsplit
+
+# AA ESI Status
+from esistatus.app_settings import esi_base_url
 
 
 class ESIMetaUrl(Enum):
     """
-    ESI Meta Endpoint URLs
+    ESI Meta Endpoint paths, relative to the ESI base URL
+    """
+
+    COMPATIBILITY_DATES = "/meta/compatibility-dates"
+    """ESI Compatibility Dates path"""
+
+    STATUS = "/meta/status"
+    """ESI Status path"""
+
+    NAME = "/meta/name"
+    """ESI Name path"""
+
+    OPENAPI_SPECS = "/meta/openapi.json"
+    """ESI OpenAPI Specs path"""
+
+    @property
+    def url(self) -> str:
+        """
+        Get the full URL of the endpoint for the configured ESI base URL
+
+        :return:
+        :rtype:
+        """
+
+        return f"{esi_base_url().rstrip('/')}{self.value}"
+
+    @classmethod
+    def from_url(cls, url: str) -> "ESIMetaUrl | None":
+        """
+        Get the endpoint of a URL, whatever the ESI base URL
+
+        :param url: The URL
+        :type url: str
+        :return: The endpoint, or None if the URL is not an ESI meta endpoint
+        :rtype: ESIMetaUrl | None
+        """
+
+        path = urlsplit(url).path
+
+        for endpoint in cls:
+            if path.endswith(endpoint.value):
+                return endpoint
+
+        return None
+
+
+class EsiStatusFragment(Enum):
+    """
+    HTML fragments of the ESI status, served by the AJAX views
     """
 
-    COMPATIBILITY_DATES = "https://esi.evetech.net/meta/compatibility-dates"
-    """ESI Compatibility Dates URL"""
+    INDEX = "esistatus/partials/index/esi-status.html"
+    """ESI status on the index page"""
+
+    DASHBOARD_WIDGET = "esistatus/partials/dashboard-widget/esi-status.html"
+    """ESI status in the dashboard widget"""
+
+
+class UpdateResult(Enum):
+    """
+    Results of the ESI status update task
+    """
+
+    UPDATED = "updated"
+    """ESI status has been written to the database"""
+
+    NOT_MODIFIED = "skipped: not modified"
+    """ESI answered the conditional request with 304"""
+
+    UNCHANGED = "skipped: unchanged"
+    """ESI status has the same fingerprint as the stored one"""
+
+    FAILED = "failed"
+    """ESI status could not be updated"""
+
+    IN_PROGRESS = "in_progress"
+    """Another update run is still in progress"""
+
+
+class UpdateStage(Enum):
+    """
+    Stages of the ESI status update task, timed by the metrics
+    """
+
+    COMPATIBILITY_DATE = "compatibility_date"
+    """Lookup of the latest compatibility date"""
+
+    FETCH = "fetch"
+    """Fetching ESI status, OpenAPI specs and ESI name"""
+
+    ENRICH = "enrich"
+    """Enriching the ESI status routes from the OpenAPI specs"""
+
+    AGGREGATE = "aggregate"
+    """Grouping and counting the routes per status"""
 
-    STATUS = "https://esi.evetech.net/meta/status"
-    """ESI Status URL"""
+    DB_WRITE = "db_write"
+    """Writing the ESI status and routes to the database"""
 
-    NAME = "https://esi.evetech.net/meta/name"
-    """ESI Name URL"""
+    PRERENDER = "prerender"
+    """Pre-rendering the HTML fragments"""
 
-    OPENAPI_SPECS = "https://esi.evetech.net/meta/openapi.json"
-    """ESI OpenAPI Specs URL"""
+    TOTAL = "total"
+    """The whole update run"""
@@ -0,0 +1,152 @@
+"""
+Pre-rendered HTML fragments of the ESI status
+"""
+
+# Django
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import translation
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA ESI Status
+from esistatus import __version__
+from esistatus.constants import EsiStatusFragment
+from esistatus.models import EsiStatus
+from esistatus.providers.applogger import AppLogger
+from esistatus.providers.cache import Cache
+
+logger = AppLogger(my_logger=get_extension_logger(__name__))
+
+
+def stored_esi_status_version() -> str | None:
+    """
+    Get the version (fingerprint) of the stored ESI status, bypassing the cache.
+
+    :return: The version, or None if nothing is stored yet
+    :rtype: str | None
+    """
+
+    return (
+        EsiStatus.objects.filter(pk=1).values_list("fingerprint", flat=True).first()
+        or None
+    )
+
+
+def esi_status_version() -> str | None:
+    """
+    Get the version (fingerprint) of the ESI status currently stored in the database.
+
+    Read from the cache, a version read from the database on a miss is cached again.
+
+    :return: The version, or None if nothing is stored yet
+    :rtype: str | None
+    """
+
+    version_cache = Cache(subkey="status:fingerprint")
+    cached = version_cache.get()
+
+    if cached:
+        return cached
+
+    version = stored_esi_status_version()
+
+    if version:
+        version_cache.set(value=version)
+
+    return version
+
+
+def _fragment_cache(fragment: EsiStatusFragment, language: str) -> Cache:
+    """
+    Get the cache for a fragment in a language.
+
+    The app version is part of the key, so fragments rendered with the templates
+    of an older version are not served after an update.
+
+    :param fragment: The fragment
+    :type fragment: EsiStatusFragment
+    :param language: The language code
+    :type language: str
+    :return: The cache
+    :rtype: Cache
+    """
+
+    return Cache(subkey=f"html:{fragment.name.lower()}:{language}:{__version__}")
+
+
+def get_fragment(
+    fragment: EsiStatusFragment, version: str, language: str
+) -> str | None:
+    """
+    Get a pre-rendered fragment for a data version and language.
+
+    :param fragment: The fragment
+    :type fragment: EsiStatusFragment
+    :param version: The data version
+    :type version: str
+    :param language: The language code
+    :type language: str
+    :return: The rendered HTML, or None if it hasn't been rendered for this version
+    :rtype: str | None
+    """
+
+    cached = _fragment_cache(fragment=fragment, language=language).get()
+
+    if not cached or cached.get("version") != version:
+        return None
+
+    return cached.get("html")
+
+
+def store_fragment(
+    fragment: EsiStatusFragment, version: str, language: str, html: str
+) -> None:
+    """
+    Store a rendered fragment for a data version and language.
+
+    Only the latest version is kept per fragment and language.
+
+    :param fragment: The fragment
+    :type fragment: EsiStatusFragment
+    :param version: The data version
+    :type version: str
+    :param language: The language code
+    :type language: str
+    :param html: The rendered HTML
+    :type html: str
+    :return: None
+    :rtype: None
+    """
+
+    _fragment_cache(fragment=fragment, language=language).set(
+        value={"version": version, "html": html}
+    )
+
+
+def prerender_fragments(version: str, context: dict) -> None:
+    """
+    Render all fragments in all configured languages and store them.
+
+    :param version: The data version
+    :type version: str
+    :param context: The template context
+    :type context: dict
+    :return: None
+    :rtype: None
+    """
+
+    for language, _ in settings.LANGUAGES:
+        with translation.override(language):
+            for fragment in EsiStatusFragment:
+                store_fragment(
+                    fragment=fragment,
+                    version=version,
+                    language=language,
+                    html=render_to_string(
+                        template_name=fragment.value, context=context
+                    ),
+                )
+
+    logger.debug("Pre-rendered ESI status fragments for version: %s", version)
@@ -0,0 +1,369 @@
+"""
+Benchmark the ESI status update pipeline and views
+"""
+
+# Standard Library
+import copy
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# AA ESI Status
+from esistatus import __version__
+from esistatus.constants import ESIMetaUrl
+from esistatus.models import EsiRoute, EsiRouteStatusChange, EsiStatus
+from esistatus.providers.esi_meta import EsiMetaClient
+from esistatus.tasks import (
+    _build_openapi_operation_index,
+    _enrich_status_json,
+    _esi_endpoint_status_from_json,
+    update_esi_status,
+)
+from esistatus.views import ajax_dashboard_widget, ajax_esi_status
+
+# The benchmarks run against an isolated cache, so they never touch cached ESI data
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "esistatus-benchmark",
+    }
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Measurements of a benchmark
+    """
+
+    name: str
+    timings: list[float] = field(default_factory=list)
+    """Wall time (in seconds) of each round"""
+
+    peak_memory: int = 0
+    """Peak memory (in bytes) allocated during a round"""
+
+    queries: int = 0
+    """Database queries of a round"""
+
+    def as_dict(self) -> dict:
+        """
+        Get the result for the JSON report
+
+        :return:
+        :rtype:
+        """
+
+        return {
+            "median_ms": round(statistics.median(self.timings) * 1000, 3),
+            "min_ms": round(min(self.timings) * 1000, 3),
+            "max_ms": round(max(self.timings) * 1000, 3),
+            "peak_kib": round(self.peak_memory / 1024, 1),
+            "queries": self.queries,
+        }
+
+
+def _measure(
+    name: str, func: Callable, rounds: int, setup: Callable | None = None
+) -> BenchmarkResult:
+    """
+    Measure a function
+
+    The wall time and query count are taken from the timed rounds, the peak memory
+    from one extra round, since tracing the allocations slows the code down.
+
+    :param name: The benchmark name
+    :type name: str
+    :param func: The function to measure, called with the return value of `setup`
+    :type func: Callable
+    :param rounds: The number of timed rounds
+    :type rounds: int
+    :param setup: Called before each round (not measured), returns the arguments for `func`
+    :type setup: Callable | None
+    :return: The result
+    :rtype: BenchmarkResult
+    """
+
+    result = BenchmarkResult(name=name)
+
+    for _ in range(rounds):
+        kwargs = setup() if setup else None
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func(**(kwargs or {}))
+            result.timings.append(time.perf_counter() - start)
+
+        result.queries = len(queries)
+
+    kwargs = setup() if setup else None
+
+    tracemalloc.start()
+
+    try:
+        func(**(kwargs or {}))
+        _, result.peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the ESI status update pipeline and views
+    """
+
+    help = (
+        "Benchmark the ESI status update pipeline and views against the local ESI "
+        "stand-in. All database changes are rolled back and an isolated cache is "
+        "used, but run it on a development or staging installation."
+    )
+
+    def add_arguments(self, parser):
+        """
+        Add the command arguments
+
+        :param parser:
+        :type parser:
+        :return:
+        :rtype:
+        """
+
+        parser.add_argument(
+            "--rounds", type=int, default=5, help="Timed rounds per benchmark"
+        )
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=1,
+            help="Number of copies of each route, to simulate a larger ESI",
+        )
+        parser.add_argument(
+            "--fixtures-dir",
+            default=None,
+            help="Directory with the ESI payloads, the sample payloads if not set",
+        )
+        parser.add_argument(
+            "--output", default=None, help="Write the results as JSON to this file"
+        )
+        parser.add_argument(
+            "--baseline",
+            default=None,
+            help="Compare the results with a JSON file written by --output",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the benchmarks
+
+        :param args:
+        :type args:
+        :param options:
+        :type options:
+        :return:
+        :rtype:
+        """
+
+        if options["rounds"] < 1:
+            raise CommandError("--rounds must be at least 1.")
+
+        baseline = None
+
+        if options["baseline"]:
+            try:
+                baseline = json.loads(Path(options["baseline"]).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Unable to read the baseline: {exc}") from exc
+
+        transport_options = {"size": options["size"]}
+
+        if options["fixtures_dir"]:
+            transport_options["fixtures_dir"] = options["fixtures_dir"]
+
+        with override_settings(
+            CACHES=BENCHMARK_CACHES,
+            ESISTATUS_HTTP_TRANSPORT="esistatus.providers.esi_stub.EsiStubAdapter",
+            ESISTATUS_HTTP_TRANSPORT_OPTIONS=transport_options,
+        ):
+            EsiMetaClient.reset_session()
+
+            try:
+                results = self._run(rounds=options["rounds"])
+            finally:
+                EsiMetaClient.reset_session()
+
+        report = {
+            "app_version": __version__,
+            "python_version": platform.python_version(),
+            "created": timezone.now().isoformat(),
+            "rounds": options["rounds"],
+            "size": options["size"],
+            "results": {result.name: result.as_dict() for result in results},
+        }
+
+        self._print_report(report=report, baseline=baseline)
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=4))
+
+            self.stdout.write(f"Results written to: {options['output']}")
+
+    def _run(self, rounds: int) -> list[BenchmarkResult]:
+        """
+        Run the benchmarks in a transaction that is rolled back afterwards
+
+        :param rounds: The number of timed rounds per benchmark
+        :type rounds: int
+        :return: The results
+        :rtype: list[BenchmarkResult]
+        """
+
+        status = EsiMetaClient.get(url=ESIMetaUrl.STATUS.url).json()
+        operation_index = _build_openapi_operation_index(
+            openapi=EsiMetaClient.get(url=ESIMetaUrl.OPENAPI_SPECS.url).json()
+        )
+        enriched_status = _enrich_status_json(
+            status=copy.deepcopy(status), operation_index=operation_index
+        )
+
+        self.stdout.write(
+            f"Benchmarking with {len(status['routes'])} routes, {rounds} round(s) each …"
+        )
+
+        def clear_data():
+            cache.clear()
+
+            EsiRouteStatusChange.objects.all().delete()
+            EsiRoute.objects.all().delete()
+            EsiStatus.objects.all().delete()
+
+        def view_request(view: Callable):
+            return lambda: view(request=RequestFactory().get("/"))
+
+        results = []
+
+        with transaction.atomic():
+            results.append(
+                _measure(
+                    name="_enrich_status_json",
+                    func=_enrich_status_json,
+                    rounds=rounds,
+                    setup=lambda: {
+                        "status": copy.deepcopy(status),
+                        "operation_index": operation_index,
+                    },
+                )
+            )
+            results.append(
+                _measure(
+                    name="_esi_endpoint_status_from_json",
+                    func=_esi_endpoint_status_from_json,
+                    rounds=rounds,
+                    setup=lambda: {"esi_endpoint_json": enriched_status},
+                )
+            )
+            results.append(
+                _measure(
+                    name="update_esi_status",
+                    func=update_esi_status,
+                    rounds=rounds,
+                    setup=clear_data,
+                )
+            )
+
+            for name, view in (
+                ("ajax_esi_status", ajax_esi_status),
+                ("ajax_dashboard_widget", ajax_dashboard_widget),
+            ):
+                # Without the pre-rendered fragments, the view renders the template
+                results.append(
+                    _measure(
+                        name=f"{name} (render)",
+                        func=view_request(view=view),
+                        rounds=rounds,
+                        setup=cache.clear,
+                    )
+                )
+
+                view_request(view=view)()
+
+                results.append(
+                    _measure(
+                        name=f"{name} (cached)",
+                        func=view_request(view=view),
+                        rounds=rounds,
+                    )
+                )
+
+            transaction.set_rollback(True)
+
+        return results
+
+    def _print_report(self, report: dict, baseline: dict | None) -> None:
+        """
+        Print the results, compared with the baseline if given
+
+        :param report: The report
+        :type report: dict
+        :param baseline: The baseline report
+        :type baseline: dict | None
+        :return:
+        :rtype:
+        """
+
+        def delta(name: str, key: str, value: float) -> str:
+            previous = (baseline or {}).get("results", {}).get(name, {}).get(key)
+
+            if not previous:
+                return "-"
+
+            return f"{(value - previous) / previous * 100:+.1f}%"
+
+        header = (
+            f"{'Benchmark':<34} {'median ms':>10} {'min ms':>10} {'max ms':>10} "
+            f"{'peak KiB':>10} {'queries':>8}"
+        )
+
+        if baseline:
+            header += f" {'Δ median':>9} {'Δ peak':>9}"
+
+        self.stdout.write("")
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for name, result in report["results"].items():
+            line = (
+                f"{name:<34} {result['median_ms']:>10.2f} {result['min_ms']:>10.2f} "
+                f"{result['max_ms']:>10.2f} {result['peak_kib']:>10.1f} "
+                f"{result['queries']:>8}"
+            )
+
+            if baseline:
+                line += (
+                    f" {delta(name, 'median_ms', result['median_ms']):>9}"
+                    f" {delta(name, 'peak_kib', result['peak_kib']):>9}"
+                )
+
+            self.stdout.write(line)
+
+        if baseline:
+            self.stdout.write(
+                f"Baseline: {baseline.get('app_version')} "
+                f"from {baseline.get('created')}, size {baseline.get('size')}"
+            )
+
+        self.stdout.write("")
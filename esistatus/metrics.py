@@ -0,0 +1,337 @@
+"""
+Metrics of the ESI status update, exposed in the Prometheus text format
+
+The metrics are kept in the cache, so the values recorded by the Celery workers
+and the web processes end up in one place. Every metric has a fixed set of
+label values, which is what makes them renderable without scanning the cache.
+"""
+
+# Standard Library
+import itertools
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+# Django
+from django.core.cache import cache
+
+# AA ESI Status
+from esistatus.app_settings import metrics_enabled
+from esistatus.constants import ESIMetaUrl, UpdateResult, UpdateStage
+
+METRICS_KEY_PREFIX = "esi:meta:metrics"
+
+# Label values of the ESI meta endpoints, "other" for any other URL
+ESI_ENDPOINTS = tuple(endpoint.name.lower() for endpoint in ESIMetaUrl) + ("other",)
+
+# Label values of the cache subkeys (their first segment), "other" for any other
+CACHE_KINDS = (
+    "compatibility-dates",
+    "status",
+    "openapi-index",
+    "name",
+    "html",
+    "other",
+)
+
+
+@dataclass(frozen=True)
+class Metric:
+    """
+    A metric with a fixed set of label values
+    """
+
+    name: str
+    kind: str
+    """Prometheus metric type: counter, gauge or summary"""
+
+    description: str
+    labels: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    """Label names and all their values"""
+
+    def _key(self, suffix: str = "", **labels) -> str:
+        """
+        Get the cache key of a series
+
+        :param suffix: Suffix of the metric name (summaries are stored as two series)
+        :type suffix: str
+        :param labels: The label values
+        :type labels: dict
+        :return: The cache key
+        :rtype: str
+        """
+
+        # Spaces are not valid in cache keys of all backends
+        label_values = ",".join(
+            f"{name}={labels[name]}".replace(" ", "_") for name in self.labels
+        )
+
+        return f"{METRICS_KEY_PREFIX}:{self.name}{suffix}:{label_values}"
+
+    def series(self) -> Iterator[dict[str, str]]:
+        """
+        Get all label combinations of the metric
+
+        :return:
+        :rtype:
+        """
+
+        for values in itertools.product(*self.labels.values()):
+            yield dict(zip(self.labels, values))
+
+    def inc(self, amount: int = 1, **labels) -> None:
+        """
+        Increment a counter
+
+        :param amount: The amount
+        :type amount: int
+        :param labels: The label values
+        :type labels: dict
+        :return:
+        :rtype:
+        """
+
+        if metrics_enabled():
+            _increment(key=self._key(**labels), amount=amount)
+
+    def set(self, value: float, **labels) -> None:
+        """
+        Set a gauge
+
+        :param value: The value
+        :type value: float
+        :param labels: The label values
+        :type labels: dict
+        :return:
+        :rtype:
+        """
+
+        if metrics_enabled():
+            cache.set(key=self._key(**labels), value=value, timeout=None)
+
+    def observe(self, seconds: float, **labels) -> None:
+        """
+        Add a duration to a summary
+
+        The sum is kept in microseconds, so it can be incremented atomically.
+
+        :param seconds: The duration
+        :type seconds: float
+        :param labels: The label values
+        :type labels: dict
+        :return:
+        :rtype:
+        """
+
+        if metrics_enabled():
+            _increment(
+                key=self._key(suffix="_sum", **labels), amount=round(seconds * 1e6)
+            )
+            _increment(key=self._key(suffix="_count", **labels))
+
+    def render(self, values: dict) -> list[str]:
+        """
+        Render the metric in the Prometheus text format, series without a value
+        are left out
+
+        :param values: The cached values, keyed by cache key
+        :type values: dict
+        :return: The lines
+        :rtype: list[str]
+        """
+
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        suffixes = ("_sum", "_count") if self.kind == "summary" else ("",)
+
+        for labels in self.series():
+            label_str = ",".join(f'{name}="{value}"' for name, value in labels.items())
+            label_str = f"{{{label_str}}}" if label_str else ""
+
+            for suffix in suffixes:
+                value = values.get(self._key(suffix=suffix, **labels))
+
+                if value is None:
+                    continue
+
+                if suffix == "_sum":
+                    value = value / 1e6
+
+                lines.append(f"{self.name}{suffix}{label_str} {value}")
+
+        return lines
+
+    def keys(self) -> list[str]:
+        """
+        Get the cache keys of all series
+
+        :return:
+        :rtype:
+        """
+
+        suffixes = ("_sum", "_count") if self.kind == "summary" else ("",)
+
+        return [
+            self._key(suffix=suffix, **labels)
+            for labels in self.series()
+            for suffix in suffixes
+        ]
+
+
+def _increment(key: str, amount: int = 1) -> None:
+    """
+    Increment a value in the cache, creating it if needed
+
+    :param key: The cache key
+    :type key: str
+    :param amount: The amount
+    :type amount: int
+    :return:
+    :rtype:
+    """
+
+    try:
+        cache.incr(key=key, delta=amount)
+    except ValueError:
+        # Another process may have created it in the meantime, hence add() over set()
+        cache.add(key=key, value=0, timeout=None)
+        cache.incr(key=key, delta=amount)
+
+
+UPDATE_RUNS = Metric(
+    name="esistatus_update_runs_total",
+    kind="counter",
+    description="ESI status update runs by result",
+    labels={"result": tuple(result.value for result in UpdateResult)},
+)
+UPDATE_LAST_RUN = Metric(
+    name="esistatus_update_last_run_timestamp_seconds",
+    kind="gauge",
+    description="Time of the last ESI status update run",
+)
+UPDATE_STAGE_DURATION = Metric(
+    name="esistatus_update_stage_duration_seconds",
+    kind="summary",
+    description="Time spent in each stage of the ESI status update",
+    labels={"stage": tuple(stage.value for stage in UpdateStage)},
+)
+UPDATE_STAGE_LAST_DURATION = Metric(
+    name="esistatus_update_stage_last_duration_seconds",
+    kind="gauge",
+    description="Time spent in each stage of the last ESI status update",
+    labels={"stage": tuple(stage.value for stage in UpdateStage)},
+)
+ESI_REQUESTS = Metric(
+    name="esistatus_esi_requests_total",
+    kind="counter",
+    description="Requests to the ESI meta endpoints by outcome",
+    labels={"endpoint": ESI_ENDPOINTS, "outcome": ("ok", "not_modified", "error")},
+)
+ESI_REQUEST_DURATION = Metric(
+    name="esistatus_esi_request_duration_seconds",
+    kind="summary",
+    description=(
+        "Time until a response from the ESI meta endpoints was received, "
+        "streamed responses are read afterwards"
+    ),
+    labels={"endpoint": ESI_ENDPOINTS},
+)
+ESI_RESPONSE_SIZE = Metric(
+    name="esistatus_esi_response_size_bytes",
+    kind="gauge",
+    description="Size of the last response from the ESI meta endpoints",
+    labels={"endpoint": ESI_ENDPOINTS},
+)
+CACHE_REQUESTS = Metric(
+    name="esistatus_cache_requests_total",
+    kind="counter",
+    description="Cache lookups by subkey and result",
+    labels={"subkey": CACHE_KINDS, "result": ("hit", "stale", "miss")},
+)
+
+METRICS = (
+    UPDATE_RUNS,
+    UPDATE_LAST_RUN,
+    UPDATE_STAGE_DURATION,
+    UPDATE_STAGE_LAST_DURATION,
+    ESI_REQUESTS,
+    ESI_REQUEST_DURATION,
+    ESI_RESPONSE_SIZE,
+    CACHE_REQUESTS,
+)
+
+
+def esi_endpoint_label(url: str) -> str:
+    """
+    Get the endpoint label of a URL
+
+    :param url: The URL
+    :type url: str
+    :return: The label
+    :rtype: str
+    """
+
+    endpoint = ESIMetaUrl.from_url(url=url)
+
+    return endpoint.name.lower() if endpoint else "other"
+
+
+def cache_kind_label(subkey: str) -> str:
+    """
+    Get the subkey label of a cache subkey
+
+    :param subkey: The cache subkey
+    :type subkey: str
+    :return: The label
+    :rtype: str
+    """
+
+    kind = subkey.split(":", maxsplit=1)[0]
+
+    return kind if kind in CACHE_KINDS else "other"
+
+
+@contextmanager
+def update_stage(stage: UpdateStage, timings: dict | None = None) -> Iterator[None]:
+    """
+    Time a stage of the ESI status update
+
+    :param stage: The stage
+    :type stage: UpdateStage
+    :param timings: Collects the duration (in seconds) per stage, also with the metrics disabled
+    :type timings: dict | None
+    :return:
+    :rtype:
+    """
+
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+
+        UPDATE_STAGE_DURATION.observe(seconds=duration, stage=stage.value)
+        UPDATE_STAGE_LAST_DURATION.set(value=duration, stage=stage.value)
+
+        if timings is not None:
+            timings[stage.value] = duration
+
+
+def render_metrics() -> str:
+    """
+    Render all metrics in the Prometheus text format
+
+    :return:
+    :rtype:
+    """
+
+    values = cache.get_many(keys=[key for metric in METRICS for key in metric.keys()])
+
+    return (
+        "\n".join(line for metric in METRICS for line in metric.render(values=values))
+        + "\n"
+    )
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:54
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("esistatus", "0004_esi_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="esistatus",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Fingerprint of the ESI status this data was built from.",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:10
+
+# Django
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("esistatus", "0005_esistatus_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EsiRouteStatusChange",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "method",
+                    models.CharField(
+                        help_text="The HTTP method of the route.", max_length=10
+                    ),
+                ),
+                (
+                    "path",
+                    models.CharField(
+                        help_text="The path of the route.", max_length=255
+                    ),
+                ),
+                (
+                    "old_status",
+                    models.CharField(
+                        help_text="The status of the route before the change.",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "new_status",
+                    models.CharField(
+                        help_text="The status of the route after the change.",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "changed_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="When the change was detected.",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "ESI Route Status Change",
+                "verbose_name_plural": "ESI Route Status Changes",
+                "default_permissions": (),
+                "indexes": [
+                    models.Index(
+                        fields=["path", "method", "-changed_at"],
+                        name="esistatus_route_changed_idx",
+                    ),
+                    models.Index(
+                        fields=["changed_at"], name="esistatus_changed_at_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,130 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:12
+
+# Django
+from django.db import migrations, models
+
+
+def populate_esi_routes(apps, schema_editor):  # pylint: disable=unused-argument
+    """
+    Populate the ESI routes from the stored ESI status data
+
+    :param apps:
+    :type apps:
+    :param schema_editor:
+    :type schema_editor:
+    :return:
+    :rtype:
+    """
+
+    EsiStatus = apps.get_model("esistatus", "EsiStatus")
+    EsiRoute = apps.get_model("esistatus", "EsiRoute")
+
+    status_data = (
+        EsiStatus.objects.filter(pk=1).values_list("status_data", flat=True).first()
+    )
+    routes = {}
+
+    for status, data in (status_data or {}).items():
+        for tag, endpoints in data.get("endpoints", {}).items():
+            for endpoint in endpoints:
+                routes[(endpoint["method"].upper(), endpoint["path"])] = EsiRoute(
+                    method=endpoint["method"].upper(),
+                    path=endpoint["path"],
+                    status=status,
+                    tag=tag,
+                    operation_id=endpoint.get("operation_id"),
+                    summary=endpoint.get("summary"),
+                    description=endpoint.get("description"),
+                )
+
+    EsiRoute.objects.bulk_create(routes.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("esistatus", "0006_esiroutestatuschange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EsiRoute",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "method",
+                    models.CharField(
+                        help_text="The HTTP method of the route.", max_length=10
+                    ),
+                ),
+                (
+                    "path",
+                    models.CharField(
+                        help_text="The path of the route.", max_length=255
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        db_index=True,
+                        help_text="The status of the route.",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "tag",
+                    models.CharField(
+                        db_index=True,
+                        help_text="The (first) tag of the route.",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "operation_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="The operation ID of the route.",
+                        max_length=255,
+                        null=True,
+                    ),
+                ),
+                (
+                    "summary",
+                    models.TextField(
+                        blank=True, help_text="The summary of the route.", null=True
+                    ),
+                ),
+                (
+                    "description",
+                    models.TextField(
+                        blank=True, help_text="The description of the route.", null=True
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "ESI Route",
+                "verbose_name_plural": "ESI Routes",
+                "default_permissions": (),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("method", "path"), name="esistatus_unique_route"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            code=populate_esi_routes, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.RemoveField(
+            model_name="esistatus",
+            name="status_data",
+        ),
+    ]
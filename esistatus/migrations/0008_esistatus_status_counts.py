@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:17
+
+# Django
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_status_counts(apps, schema_editor):  # pylint: disable=unused-argument
+    """
+    Populate the status counts from the stored ESI routes
+
+    :param apps:
+    :type apps:
+    :param schema_editor:
+    :type schema_editor:
+    :return:
+    :rtype:
+    """
+
+    EsiStatus = apps.get_model("esistatus", "EsiStatus")
+    EsiRoute = apps.get_model("esistatus", "EsiRoute")
+
+    counts = dict(
+        EsiRoute.objects.values_list("status").annotate(count=Count("pk")).order_by()
+    )
+    total = sum(counts.values())
+
+    EsiStatus.objects.filter(pk=1).update(
+        status_counts={
+            status: {
+                "count": count,
+                "percentage": f"{count / total * 100:.2f}%",
+            }
+            for status, count in counts.items()
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("esistatus", "0007_esiroute"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="esistatus",
+            name="status_counts",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Number and percentage of ESI endpoints per status.",
+            ),
+        ),
+        migrations.RunPython(
+            code=populate_status_counts, reverse_code=migrations.RunPython.noop
+        ),
+    ]
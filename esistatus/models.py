@@ -4,6 +4,7 @@ The models
 
 # Django
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -26,14 +27,23 @@ class EsiStatus(models.Model):
         blank=True,
     )
 
-    status_data = models.JSONField(
-        help_text=_("The ESI status data."), null=True, blank=True
-    )
-
     total_endpoints = models.PositiveIntegerField(
         help_text=_("Total number of ESI endpoints."), default=0
     )
 
+    status_counts = models.JSONField(
+        help_text=_("Number and percentage of ESI endpoints per status."),
+        default=dict,
+        blank=True,
+    )
+
+    fingerprint = models.CharField(
+        help_text=_("Fingerprint of the ESI status this data was built from."),
+        max_length=64,
+        blank=True,
+        default="",
+    )
+
     class Meta:
         """
         Meta definitions
@@ -42,3 +52,92 @@ class EsiStatus(models.Model):
         default_permissions = ()
         verbose_name = _("ESI Endpoint Status")
         verbose_name_plural = _("ESI Endpoint Statuses")
+
+
+class EsiRoute(models.Model):
+    """
+    Model to store the current status of an ESI route
+    """
+
+    method = models.CharField(
+        help_text=_("The HTTP method of the route."), max_length=10
+    )
+
+    path = models.CharField(help_text=_("The path of the route."), max_length=255)
+
+    status = models.CharField(
+        help_text=_("The status of the route."), max_length=20, db_index=True
+    )
+
+    tag = models.CharField(
+        help_text=_("The (first) tag of the route."), max_length=100, db_index=True
+    )
+
+    operation_id = models.CharField(
+        help_text=_("The operation ID of the route."),
+        max_length=255,
+        null=True,
+        blank=True,
+    )
+
+    summary = models.TextField(
+        help_text=_("The summary of the route."), null=True, blank=True
+    )
+
+    description = models.TextField(
+        help_text=_("The description of the route."), null=True, blank=True
+    )
+
+    class Meta:
+        """
+        Meta definitions
+        """
+
+        default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(
+                fields=["method", "path"], name="esistatus_unique_route"
+            )
+        ]
+        verbose_name = _("ESI Route")
+        verbose_name_plural = _("ESI Routes")
+
+
+class EsiRouteStatusChange(models.Model):
+    """
+    Model to store the status changes of ESI routes (append-only)
+    """
+
+    method = models.CharField(
+        help_text=_("The HTTP method of the route."), max_length=10
+    )
+
+    path = models.CharField(help_text=_("The path of the route."), max_length=255)
+
+    old_status = models.CharField(
+        help_text=_("The status of the route before the change."), max_length=20
+    )
+
+    new_status = models.CharField(
+        help_text=_("The status of the route after the change."), max_length=20
+    )
+
+    changed_at = models.DateTimeField(
+        help_text=_("When the change was detected."), default=timezone.now
+    )
+
+    class Meta:
+        """
+        Meta definitions
+        """
+
+        default_permissions = ()
+        indexes = [
+            models.Index(
+                fields=["path", "method", "-changed_at"],
+                name="esistatus_route_changed_idx",
+            ),
+            models.Index(fields=["changed_at"], name="esistatus_changed_at_idx"),
+        ]
+        verbose_name = _("ESI Route Status Change")
+        verbose_name_plural = _("ESI Route Status Changes")
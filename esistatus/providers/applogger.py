@@ -4,6 +4,7 @@ AppLogger provider
 
 # Standard Library
 import logging
+from collections.abc import Callable
 
 # AA ESI Status
 from esistatus import __title__
@@ -13,6 +14,11 @@ class AppLogger(logging.LoggerAdapter):
     """
     Custom logger adapter that adds a prefix to log messages.
 
+    Arguments are formatted lazily, %-style, like with `logging` itself:
+    `logger.debug("Getting cache for: %s", cache_key)` only builds the message when
+    the record is emitted. Arguments that are expensive to compute can be wrapped in
+    `LazyArg`, or guarded with `logger.isEnabledFor(logging.DEBUG)`.
+
     Taken from the `allianceauth-app-utils` package.
     Credits to: Erik Kalkoken
     """
@@ -33,6 +39,9 @@ class AppLogger(logging.LoggerAdapter):
         """
         Prepares the log message by adding the prefix.
 
+        Only called for records that are emitted, the arguments are left to the
+        handler to format.
+
         :param msg: Log message
         :type msg: str
         :param kwargs: Additional keyword arguments
@@ -42,3 +51,31 @@ class AppLogger(logging.LoggerAdapter):
         """
 
         return f"[{self.prefix}] {msg}", kwargs
+
+
+class LazyArg:  # pylint: disable=too-few-public-methods
+    """
+    Log argument that is only computed when the log record is formatted.
+    """
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[[], object]):
+        """
+        Initializes the argument with the function computing it.
+
+        :param func: Function returning the value
+        :type func: Callable[[], object]
+        """
+
+        self.func = func
+
+    def __str__(self) -> str:
+        """
+        Computes the value.
+
+        :return: The value as string
+        :rtype: str
+        """
+
+        return str(self.func())
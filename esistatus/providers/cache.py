@@ -3,8 +3,17 @@ Cache handler for AA ESI Status.
 """
 
 # Standard Library
+import logging
+import pickle
+import random
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from datetime import timedelta
 from typing import Any
+from uuid import uuid4
 
 # Django
 from django.core.cache import cache
@@ -14,10 +23,63 @@ from django.utils.timezone import now
 from allianceauth.services.hooks import get_extension_logger
 
 # AA ESI Status
+from esistatus.app_settings import (
+    cache_compression_enabled,
+    cache_compression_threshold,
+    cache_expiry_jitter,
+    cache_lock_timeout,
+    cache_stale_ttl,
+)
+from esistatus.metrics import CACHE_REQUESTS, cache_kind_label
 from esistatus.providers.applogger import AppLogger
 
 logger = AppLogger(my_logger=get_extension_logger(__name__))
 
+# Time (in seconds) between two looks into the cache while waiting for a refetch
+SINGLE_FLIGHT_POLL_INTERVAL = 0.2
+
+# Returned by a `Cache.get_or_set` default when the value is unchanged at its source
+NOT_MODIFIED = object()
+
+
+class CompressedValue:  # pylint: disable=too-few-public-methods
+    """
+    A zlib compressed, pickled cache value.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes) -> None:
+        """
+        Initialize the compressed value.
+
+        :param data: The compressed, pickled value.
+        :type data: bytes
+        """
+
+        self.data = data
+
+
+class CacheEntry:  # pylint: disable=too-few-public-methods
+    """
+    A cache value and the time until which it is fresh.
+    """
+
+    __slots__ = ("value", "fresh_until")
+
+    def __init__(self, value: Any, fresh_until: float) -> None:
+        """
+        Initialize the cache entry.
+
+        :param value: The (possibly compressed) value.
+        :type value: Any
+        :param fresh_until: Timestamp until which the value is fresh.
+        :type fresh_until: float
+        """
+
+        self.value = value
+        self.fresh_until = fresh_until
+
 
 class Cache:
     """
@@ -50,11 +112,7 @@ class Cache:
         :rtype: string
         """
 
-        cache_key = f"{self.redis_key_base}:{self.subkey}"
-
-        logger.debug(f"Generating cache key for: {cache_key}")
-
-        return cache_key
+        return f"{self.redis_key_base}:{self.subkey}"
 
     @staticmethod
     def _get_max_cache_time() -> int:
@@ -73,36 +131,314 @@ class Cache:
 
         return int((target - expire_time).total_seconds())
 
-    def set(self, value: Any) -> None:
+    @staticmethod
+    def _get_expiry_time(fresh_time: int) -> int:
+        """
+        Get the time a value is kept in the cache: past its freshness, it is still
+        served while a fresh one is fetched. The jitter spreads the expiry of the
+        values cached at the same time.
+
+        :param fresh_time: The time (in seconds) the value is fresh.
+        :type fresh_time: int
+        :return: The time (in seconds) the value is kept.
+        :rtype: int
+        """
+
+        return fresh_time + cache_stale_ttl() + random.randint(0, cache_expiry_jitter())
+
+    def _get_validators_cache_key(self) -> str:
+        """
+        Generate the cache key for the HTTP validators stored next to the value.
+
+        :return: The full cache key for the validators.
+        :rtype: string
+        """
+
+        return f"{self._get_cache_key()}:validators"
+
+    def _compress(self, value: Any) -> Any:
+        """
+        Compress a value when compression is enabled and the value is large enough.
+
+        :param value: The value to compress.
+        :type value: Any
+        :return: The compressed value, or the value itself.
+        :rtype: Any
+        """
+
+        if not cache_compression_enabled():
+            return value
+
+        pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if len(pickled) < cache_compression_threshold():
+            return value
+
+        compressed = zlib.compress(pickled)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Compressed cache value for %s: %s → %s bytes (ratio %.2f)",
+                self._get_cache_key(),
+                len(pickled),
+                len(compressed),
+                len(pickled) / len(compressed),
+            )
+
+        return CompressedValue(data=compressed)
+
+    @staticmethod
+    def _decompress(value: Any) -> Any:
+        """
+        Decompress a value if it has been stored compressed.
+
+        :param value: The cached value.
+        :type value: Any
+        :return: The decompressed value.
+        :rtype: Any
+        """
+
+        if isinstance(value, CompressedValue):
+            return pickle.loads(zlib.decompress(value.data))
+
+        return value
+
+    def set(self, value: Any, validators: dict | None = None) -> None:
         """
         Set a specific cache value for a URL.
 
         :param value: The value to cache.
         :type value: Any
+        :param validators: Optional HTTP validators (ETag/Last-Modified) to store next to the value.
+        :type validators: dict | None
         :return: None
         :rtype: None
         """
 
         cache_key = self._get_cache_key()
+        fresh_time = self._get_max_cache_time()
+        timeout = self._get_expiry_time(fresh_time=fresh_time)
+
+        logger.debug("Setting cache for: %s", cache_key)
+
+        cache.set(
+            key=cache_key,
+            value=CacheEntry(
+                value=self._compress(value), fresh_until=time.time() + fresh_time
+            ),
+            timeout=timeout,
+        )
+
+        if validators:
+            self.set_validators(validators=validators, timeout=timeout)
+
+    def set_validators(self, validators: dict, timeout: int | None = None) -> None:
+        """
+        Set the HTTP validators (ETag/Last-Modified) for a URL.
+
+        :param validators: The HTTP validators to cache.
+        :type validators: dict
+        :param timeout: The time (in seconds) they are kept, until the next ESI rollover if not set.
+        :type timeout: int | None
+        :return: None
+        :rtype: None
+        """
+
+        cache_key = self._get_validators_cache_key()
 
-        logger.debug(f"Setting cache for: {cache_key}")
+        logger.debug("Setting HTTP validators for: %s", cache_key)
 
         cache.set(
             key=cache_key,
-            value=value,
-            timeout=self._get_max_cache_time(),
+            value=validators,
+            timeout=timeout if timeout is not None else self._get_max_cache_time(),
         )
 
+    def get_validators(self) -> dict:
+        """
+        Get the HTTP validators (ETag/Last-Modified) for a URL.
+
+        :return: The cached HTTP validators, or an empty dict if not found.
+        :rtype: dict
+        """
+
+        cache_key = self._get_validators_cache_key()
+
+        logger.debug("Getting HTTP validators for: %s", cache_key)
+
+        return cache.get(key=cache_key, default=None) or {}
+
+    def _get_entry(self) -> tuple[Any, bool]:
+        """
+        Get a specific cache value for a URL and whether it is still fresh.
+
+        :return: The cached value, or False if not found, and whether it is fresh.
+        :rtype: tuple[Any, bool]
+        """
+
+        cache_key = self._get_cache_key()
+
+        logger.debug("Getting cache for: %s", cache_key)
+
+        entry = cache.get(key=cache_key, default=False)
+
+        if isinstance(entry, CacheEntry):
+            value, fresh = entry.value, entry.fresh_until > time.time()
+        else:
+            # Not found, or cached without freshness by an older version
+            value, fresh = entry, True
+
+        if value is False:
+            result = "miss"
+        else:
+            result = "hit" if fresh else "stale"
+
+        CACHE_REQUESTS.inc(subkey=cache_kind_label(subkey=self.subkey), result=result)
+
+        return self._decompress(value), fresh
+
     def get(self) -> Any:
         """
-        Get a specific cache value for a URL.
+        Get a specific cache value for a URL, fresh or not.
 
         :return: The cached value for a cache key, or False if not found.
         :rtype: Any
         """
 
-        cache_key = self._get_cache_key()
+        return self._get_entry()[0]
+
+    @contextmanager
+    def lock(self, timeout: int) -> Iterator[bool]:
+        """
+        Try to take a lock on the subkey, shared by all processes using the cache.
+
+        The lock is not waited for, the block runs either way and gets whether the
+        lock was acquired. It expires after `timeout`, so a process that died
+        doesn't keep it forever, and is only released by the process holding it.
+
+        :param timeout: Maximum time (in seconds) the lock is held.
+        :type timeout: int
+        :return: True if the lock was acquired, False if another process holds it.
+        :rtype: Iterator[bool]
+        """
+
+        lock_key = f"{self._get_cache_key()}:lock"
+        token = uuid4().hex
+        acquired = cache.add(key=lock_key, value=token, timeout=timeout)
+
+        logger.debug(
+            "%s lock: %s", "Acquired" if acquired else "Unable to acquire", lock_key
+        )
+
+        try:
+            yield acquired
+        finally:
+            # The lock may have expired and been taken by another process meanwhile
+            if acquired and cache.get(key=lock_key) == token:
+                cache.delete(key=lock_key)
+
+    def _set_from(
+        self, default: Callable[..., tuple[Any, dict | None]], stale: Any = None
+    ) -> Any:
+        """
+        Compute a value and cache it, a value of None is not cached.
+
+        With a stale value, the cached HTTP validators are passed to `default`, so it
+        can revalidate the value instead of fetching it again.
+
+        :param default: Called with the HTTP validators, returns the value (or `NOT_MODIFIED`) and its HTTP validators.
+        :type default: Callable[..., tuple[Any, dict | None]]
+        :param stale: The stale cached value, if any.
+        :type stale: Any
+        :return: The value.
+        :rtype: Any
+        """
+
+        validators = self.get_validators() if stale else {}
+        value, new_validators = default(validators=validators)
+
+        if value is NOT_MODIFIED:
+            logger.debug("Cached value still valid for: %s", self._get_cache_key())
+
+            value, new_validators = stale, new_validators or validators
+
+        if value is not None:
+            self.set(value=value, validators=new_validators)
+
+        return value
+
+    def _refresh_in_background(
+        self, default: Callable[..., tuple[Any, dict | None]], stale: Any
+    ) -> None:
+        """
+        Refresh a stale value in a background thread, one process at a time.
+
+        :param default: See `get_or_set`.
+        :type default: Callable[..., tuple[Any, dict | None]]
+        :param stale: The stale cached value.
+        :type stale: Any
+        :return: None
+        :rtype: None
+        """
+
+        def refresh() -> None:
+            with self.lock(timeout=cache_lock_timeout()) as acquired:
+                # Another process may have refreshed it while this one was starting
+                if acquired and not self._get_entry()[1]:
+                    self._set_from(default=default, stale=stale)
+
+        threading.Thread(
+            target=refresh, name=f"esistatus-refresh:{self.subkey}", daemon=True
+        ).start()
+
+    def get_or_set(self, default: Callable[..., tuple[Any, dict | None]]) -> Any:
+        """
+        Get a cached value, or compute and cache it when it is missing.
+
+        Only one process computes a missing value at a time, the others wait for it
+        to show up in the cache. Should it take longer than the lock timeout, they
+        compute it themselves. A value past its freshness is returned right away,
+        while it is refreshed in the background.
+
+        :param default: Called with the cached HTTP validators (empty when the value is missing), returns the value (or `NOT_MODIFIED` when the validators still match) and its HTTP validators, a value of None is not cached.
+        :type default: Callable[..., tuple[Any, dict | None]]
+        :return: The cached or computed value.
+        :rtype: Any
+        """
+
+        value, fresh = self._get_entry()
+
+        if value:
+            if not fresh:
+                logger.debug("Refreshing stale value for: %s", self._get_cache_key())
+
+                self._refresh_in_background(default=default, stale=value)
+
+            return value
+
+        timeout = cache_lock_timeout()
+        deadline = time.monotonic() + timeout
+        waited = False
+
+        while True:
+            with self.lock(timeout=timeout) as acquired:
+                if acquired:
+                    # The previous holder may have cached it in the meantime
+                    value = self.get() if waited else None
+
+                    return value if value else self._set_from(default=default)
+
+            if time.monotonic() >= deadline:
+                logger.debug(
+                    "Gave up waiting for: %s, computing it", self._get_cache_key()
+                )
+
+                return self._set_from(default=default)
+
+            time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
 
-        logger.debug(f"Getting cache for: {cache_key}")
+            waited = True
+            value = self.get()
 
-        return cache.get(key=cache_key, default=False)
+            if value:
+                return value
@@ -0,0 +1,188 @@
+"""
+ESI meta client provider
+"""
+
+# Standard Library
+import os
+import time
+from http import HTTPStatus
+
+# Third Party
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Django
+from django.utils.module_loading import import_string
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA ESI Status
+from esistatus import __user_agent__
+from esistatus.app_settings import (
+    esi_meta_backoff_factor,
+    esi_meta_max_retries,
+    esi_meta_pool_size,
+    esi_meta_timeout,
+    esi_meta_transport,
+    esi_meta_transport_options,
+)
+from esistatus.metrics import (
+    ESI_REQUEST_DURATION,
+    ESI_REQUESTS,
+    ESI_RESPONSE_SIZE,
+    esi_endpoint_label,
+)
+from esistatus.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(__name__))
+
+
+class EsiMetaClient:
+    """
+    HTTP client for the ESI meta endpoints.
+
+    Keeps one pooled keep-alive session per worker process, so consecutive
+    task runs reuse their connections to ESI instead of doing a new TLS
+    handshake for every request.
+    """
+
+    _session: requests.Session | None = None
+    _session_pid: int | None = None
+
+    @staticmethod
+    def _create_adapter() -> BaseAdapter:
+        """
+        Create the transport adapter for the session.
+
+        This is the configured transport (`ESISTATUS_HTTP_TRANSPORT`) if set,
+        otherwise an HTTP adapter with connection pooling and retries.
+
+        :return: The transport adapter
+        :rtype: BaseAdapter
+        """
+
+        transport = esi_meta_transport()
+
+        if transport:
+            logger.info("Using ESI meta transport: %s", transport)
+
+            return import_string(transport)(**esi_meta_transport_options())
+
+        retries = Retry(
+            total=esi_meta_max_retries(),
+            backoff_factor=esi_meta_backoff_factor(),
+            status_forcelist=(502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+        )
+
+        return HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=esi_meta_pool_size(),
+            max_retries=retries,
+        )
+
+    @classmethod
+    def _create_session(cls) -> requests.Session:
+        """
+        Create a new session with the transport adapter mounted.
+
+        :return: The session
+        :rtype: requests.Session
+        """
+
+        adapter = cls._create_adapter()
+
+        session = requests.Session()
+        session.headers.update({"User-Agent": __user_agent__})
+        session.mount(prefix="https://", adapter=adapter)
+        session.mount(prefix="http://", adapter=adapter)
+
+        return session
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        """
+        Get the session for the current process.
+
+        A session created before the worker process was forked is never
+        reused, since its sockets are shared with the parent process.
+
+        :return: The session
+        :rtype: requests.Session
+        """
+
+        pid = os.getpid()
+
+        if cls._session is None or cls._session_pid != pid:
+            logger.debug("Creating ESI meta session for process: %s", pid)
+
+            cls._session = cls._create_session()
+            cls._session_pid = pid
+
+        return cls._session
+
+    @classmethod
+    def reset_session(cls) -> None:
+        """
+        Drop the session of the current process, the next request creates a new one
+        with the current settings.
+
+        :return:
+        :rtype:
+        """
+
+        cls._session = None
+        cls._session_pid = None
+
+    @classmethod
+    def get(cls, url: str, headers: dict | None = None, **kwargs) -> requests.Response:
+        """
+        Send a GET request to an ESI meta endpoint.
+
+        :param url: The URL
+        :type url: str
+        :param headers: Additional request headers
+        :type headers: dict | None
+        :param kwargs: Additional arguments for `requests.Session.get`
+        :type kwargs: dict
+        :return: The response
+        :rtype: requests.Response
+        """
+
+        kwargs.setdefault("timeout", esi_meta_timeout())
+
+        endpoint = esi_endpoint_label(url=url)
+        start = time.perf_counter()
+
+        try:
+            response = cls.session().get(url=url, headers=headers, **kwargs)
+        except requests.exceptions.RequestException:
+            ESI_REQUESTS.inc(endpoint=endpoint, outcome="error")
+
+            raise
+        finally:
+            ESI_REQUEST_DURATION.observe(
+                seconds=time.perf_counter() - start, endpoint=endpoint
+            )
+
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            outcome = "not_modified"
+        else:
+            outcome = "ok" if response.ok else "error"
+
+        ESI_REQUESTS.inc(endpoint=endpoint, outcome=outcome)
+
+        # The body of a streamed response hasn't been read yet
+        size = (
+            response.headers.get("Content-Length")
+            if kwargs.get("stream")
+            else len(response.content)
+        )
+
+        if size:
+            ESI_RESPONSE_SIZE.set(value=int(size), endpoint=endpoint)
+
+        return response
@@ -0,0 +1,246 @@
+"""
+ESI stand-in transport provider
+
+Answers requests to the ESI meta endpoints from local payloads instead of calling
+ESI, to load-test the update pipeline and reproduce ESI outages offline.
+
+Enable it in your settings:
+
+    ESISTATUS_HTTP_TRANSPORT = "esistatus.providers.esi_stub.EsiStubAdapter"
+    ESISTATUS_HTTP_TRANSPORT_OPTIONS = {"latency": 0.5, "error_rate": 0.1, "size": 10}
+"""
+
+# Standard Library
+import hashlib
+import io
+import json
+import random
+import time
+from http import HTTPStatus
+from pathlib import Path
+
+# Third Party
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA ESI Status
+from esistatus.constants import ESIMetaUrl
+from esistatus.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(__name__))
+
+# Payloads served when no fixtures directory is given
+DEFAULT_FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+# Payload file per ESI meta endpoint
+FIXTURE_FILES = {
+    ESIMetaUrl.COMPATIBILITY_DATES: "compatibility-dates.json",
+    ESIMetaUrl.STATUS: "openapi-status.json",
+    ESIMetaUrl.NAME: "esi-name.json",
+    ESIMetaUrl.OPENAPI_SPECS: "openapi-spec.json",
+}
+
+
+class EsiStubAdapter(BaseAdapter):
+    """
+    Transport adapter serving the ESI meta endpoints from local payloads.
+
+    Answers conditional requests with 304 like ESI does, and can add latency,
+    answer a share of the requests with an error, and scale the ESI status and
+    OpenAPI specs up to simulate a larger API.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        fixtures_dir: str | Path | None = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = HTTPStatus.SERVICE_UNAVAILABLE,
+        size: int = 1,
+        seed: int | None = None,
+    ):
+        """
+        Initialize the adapter
+
+        :param fixtures_dir: Directory with the payloads (see `FIXTURE_FILES`)
+        :type fixtures_dir: str | Path | None
+        :param latency: Delay (in seconds) before each response
+        :type latency: float
+        :param error_rate: Share of requests (0 to 1) answered with `error_status`
+        :type error_rate: float
+        :param error_status: HTTP status of the simulated errors
+        :type error_status: int
+        :param size: Number of copies of each route in the ESI status and OpenAPI specs
+        :type size: int
+        :param seed: Seed for the error simulation, for reproducible runs
+        :type seed: int | None
+        """
+
+        super().__init__()
+
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir else DEFAULT_FIXTURES_DIR
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.size = max(1, size)
+        self._random = random.Random(seed)
+        self._payloads: dict[ESIMetaUrl, bytes] = {}
+
+    def _scale(self, endpoint: ESIMetaUrl, data: dict) -> dict:
+        """
+        Scale the ESI status and OpenAPI specs up by copying each route under
+        another path prefix
+
+        :param endpoint: The ESI meta endpoint
+        :type endpoint: ESIMetaUrl
+        :param data: The payload
+        :type data: dict
+        :return: The scaled payload
+        :rtype: dict
+        """
+
+        prefixes = [""] + [f"/stub-{copy}" for copy in range(1, self.size)]
+
+        if endpoint is ESIMetaUrl.STATUS:
+            data["routes"] = [
+                {**route, "path": f"{prefix}{route['path']}"}
+                for prefix in prefixes
+                for route in data.get("routes", [])
+            ]
+        elif endpoint is ESIMetaUrl.OPENAPI_SPECS:
+            data["paths"] = {
+                f"{prefix}{path}": path_item
+                for prefix in prefixes
+                for path, path_item in data.get("paths", {}).items()
+            }
+
+        return data
+
+    def _payload(self, endpoint: ESIMetaUrl) -> bytes:
+        """
+        Get the payload of an ESI meta endpoint, loaded once per adapter
+
+        :param endpoint: The ESI meta endpoint
+        :type endpoint: ESIMetaUrl
+        :return: The payload
+        :rtype: bytes
+        """
+
+        if endpoint not in self._payloads:
+            with open(
+                self.fixtures_dir / FIXTURE_FILES[endpoint], encoding="utf-8"
+            ) as fixture:
+                data = json.load(fixture)
+
+            if self.size > 1:
+                data = self._scale(endpoint=endpoint, data=data)
+
+            self._payloads[endpoint] = json.dumps(data).encode("utf-8")
+
+        return self._payloads[endpoint]
+
+    def _response(
+        self,
+        request: requests.PreparedRequest,
+        status: int,
+        body: bytes = b"",
+        headers: dict | None = None,
+    ) -> requests.Response:
+        """
+        Build a response
+
+        :param request: The request
+        :type request: requests.PreparedRequest
+        :param status: The HTTP status
+        :type status: int
+        :param body: The response body
+        :type body: bytes
+        :param headers: Additional response headers
+        :type headers: dict | None
+        :return: The response
+        :rtype: requests.Response
+        """
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = HTTPStatus(status).phrase
+        response.headers = CaseInsensitiveDict(
+            {
+                "Content-Type": "application/json",
+                "Content-Length": str(len(body)),
+                **(headers or {}),
+            }
+        )
+        response.raw = io.BytesIO(body)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+
+        return response
+
+    def send(  # pylint: disable=too-many-arguments, unused-argument
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: float | tuple | None = None,
+        verify: bool | str = True,
+        cert: str | tuple | None = None,
+        proxies: dict | None = None,
+    ) -> requests.Response:
+        """
+        Answer a request from the local payloads
+
+        :param request: The request
+        :type request: requests.PreparedRequest
+        :return: The response
+        :rtype: requests.Response
+        """
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        endpoint = ESIMetaUrl.from_url(url=request.url)
+
+        if endpoint is None:
+            return self._response(
+                request=request,
+                status=HTTPStatus.NOT_FOUND,
+                body=b'{"error":"Not found"}',
+            )
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            logger.debug(
+                "ESI stub simulates error %s for: %s", self.error_status, endpoint
+            )
+
+            return self._response(
+                request=request,
+                status=self.error_status,
+                body=b'{"error":"Simulated error"}',
+            )
+
+        body = self._payload(endpoint=endpoint)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+        if request.headers.get("If-None-Match") == etag:
+            return self._response(
+                request=request, status=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+        return self._response(
+            request=request, status=HTTPStatus.OK, body=body, headers={"ETag": etag}
+        )
+
+    def close(self) -> None:
+        """
+        Nothing to clean up, there are no connections
+
+        :return:
+        :rtype:
+        """
@@ -0,0 +1,16 @@
+"""
+Signals sent by the app
+"""
+
+# Django
+from django.dispatch import Signal
+
+esi_status_changed = Signal()
+"""
+Sent after an ESI status update with route changes has been committed.
+
+Keyword arguments:
+
+- ``changeset``: The :class:`esistatus.changeset.Changeset` of the update
+- ``compatibility_date``: The compatibility date of the new ESI status
+"""
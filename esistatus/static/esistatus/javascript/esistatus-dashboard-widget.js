@@ -1,4 +1,4 @@
-/* global bootstrap, esistatusSettings, fetchGet */
+/* global bootstrap, esistatusDom, esistatusSettings */
 
 $(document).ready(() => {
     'use strict';
@@ -6,32 +6,85 @@ $(document).ready(() => {
     /**
      * ESI Status Dashboard Widget
      *
-     * @type {{dashboardWidget: HTMLElement, tooltipElements: string, refreshInterval: null}}
+     * @type {{dashboardWidget: HTMLElement, eventSource: null, etag: null, version: null}}
      */
     const esistatus = {
         dashboardWidget: $('#esi-status-dashboard-panel'),
-        tooltipElements: '[data-bs-tooltip="aa-esi-status"]',
-        refreshInterval: null
+        eventSource: null,
+        etag: null,
+        version: null
+    };
+
+    /**
+     * Adaptive polling, the delay doubles while nothing changes
+     *
+     * @type {{active: boolean, timer: null, baseDelay: number, maxDelay: number, delay: number}}
+     */
+    const polling = {
+        active: false,
+        timer: null,
+        baseDelay: 30000,
+        maxDelay: 300000,
+        delay: 30000
+    };
+
+    /**
+     * Point the links to the ESI status page at the URL rendered for this page
+     *
+     * The widget is pre-rendered outside a request, so it can't carry the URL itself.
+     *
+     * @returns {void}
+     */
+    const setIndexLinks = () => {
+        esistatus.dashboardWidget[0].querySelectorAll('[data-esistatus-index-link]').forEach((link) => {
+            link.href = esistatusSettings.dashboardWidget.indexUrl;
+        });
     };
 
     /**
      * Update the ESI Status Dashboard Widget content
      *
-     * @returns {Promise<void>}
-     * @throws {Error} If the fetch request fails
+     * @returns {Promise<boolean>} Whether the content changed
      */
     const updateWidget = async () => {
         try {
-            const data = await fetchGet({
-                url: esistatusSettings.dashboardWidget.ajaxUrl,
-                responseIsJson: false
+            const headers = {};
+
+            if (esistatus.etag) {
+                headers['If-None-Match'] = esistatus.etag;
+            }
+
+            const response = await fetch(esistatusSettings.dashboardWidget.ajaxUrl, {
+                cache: 'no-store',
+                headers: headers
             });
 
+            if (response.status === 304) {
+                return false;
+            }
+
+            if (!response.ok) {
+                throw new Error(`Error: ${response.status} ${response.statusText}`);
+            }
+
+            const version = response.headers.get('X-ESI-Status-Version');
+
+            esistatus.etag = response.headers.get('ETag');
+
+            if (version && version === esistatus.version) {
+                return false;
+            }
+
+            const data = await response.text();
+
+            esistatus.version = version;
+
             if (!data) {
-                return;
+                return false;
             }
 
-            esistatus.dashboardWidget.html(data);
+            esistatusDom.patch(esistatus.dashboardWidget[0], data);
+            setIndexLinks();
 
             if (!esistatus.dashboardWidget[0].classList.contains('show')) {
                 new bootstrap.Collapse(esistatus.dashboardWidget[0], { // jshint ignore:line
@@ -39,58 +92,116 @@ $(document).ready(() => {
                 });
             }
 
-            // Initialize Bootstrap tooltips
-            $(esistatus.tooltipElements).each((_, el) => {
-                // Dispose existing tooltip instance if it exists
-                const existing = bootstrap.Tooltip.getInstance(el);
+            return true;
+        } catch (error) {
+            console.error(error);
+
+            return false;
+        }
+    };
 
-                if (existing) {
-                    existing.dispose();
-                }
+    /**
+     * Schedule the next poll, unless polling is stopped or the page is hidden
+     *
+     * @returns {void}
+     */
+    const scheduleRefresh = () => {
+        clearTimeout(polling.timer);
 
-                // Remove any leftover tooltip elements
-                $('.bs-tooltip-auto').remove();
+        polling.timer = null;
 
-                // Create new tooltip instance
-                return new bootstrap.Tooltip(el, {html: true});
-            });
-        } catch (error) {
-            console.error(error);
+        if (!polling.active || document.hidden) {
+            return;
         }
+
+        polling.timer = setTimeout(async () => {
+            const changed = await updateWidget();
+
+            // Back off while the server reports no changes
+            polling.delay = changed ? polling.baseDelay : Math.min(polling.delay * 2, polling.maxDelay);
+
+            scheduleRefresh();
+        }, polling.delay);
     };
 
     /**
-     * Start automatic refresh
+     * Start automatic refresh (polling)
      *
      * @returns {void}
      */
     const startRefresh = () => {
+        if (polling.active) {
+            return;
+        }
+
         console.log('ESI Status Dashboard Widget: Starting automatic refresh');
 
-        updateWidget().then(() => console.log('ESI Status Dashboard Widget: Initial update complete'));
+        polling.active = true;
+        polling.delay = polling.baseDelay;
 
-        esistatus.refreshInterval = setInterval(updateWidget, 30000);
+        scheduleRefresh();
     };
 
     /**
-     * Stop automatic refresh
+     * Stop automatic refresh (polling)
      *
      * @returns {void}
      */
-    // const stopRefresh = () => {
-    //     if (esistatus.refreshInterval) {
-    //         console.log('ESI Status Dashboard Widget: Stopping automatic refresh');
-    //
-    //         clearInterval(esistatus.refreshInterval);
-    //
-    //         esistatus.refreshInterval = null;
-    //     }
-    // };
-
-    // Event listeners for tab focus/blur
-    // window.addEventListener('focus', startRefresh);
-    // window.addEventListener('blur', stopRefresh);
+    const stopRefresh = () => {
+        if (polling.active) {
+            console.log('ESI Status Dashboard Widget: Stopping automatic refresh');
+
+            polling.active = false;
+
+            scheduleRefresh();
+        }
+    };
+
+    /**
+     * Subscribe to live updates (Server-Sent Events), polling is used as a fallback
+     * while the connection is not open
+     *
+     * @returns {boolean} Whether live updates are available
+     */
+    const subscribe = () => {
+        const eventsUrl = esistatusSettings.dashboardWidget.eventsUrl;
+
+        if (!eventsUrl || typeof EventSource === 'undefined') {
+            return false;
+        }
+
+        esistatus.eventSource = new EventSource(eventsUrl);
+
+        esistatus.eventSource.addEventListener('open', stopRefresh);
+        esistatus.eventSource.addEventListener('error', startRefresh);
+        esistatus.eventSource.addEventListener('version', (event) => {
+            if (event.data !== esistatus.version) {
+                updateWidget();
+            }
+        });
+
+        return true;
+    };
+
+    // Pause polling while the page is hidden, refresh right away when it is visible again
+    document.addEventListener('visibilitychange', () => {
+        if (document.hidden || !polling.active) {
+            scheduleRefresh();
+
+            return;
+        }
+
+        polling.delay = polling.baseDelay;
+
+        updateWidget().then(scheduleRefresh);
+    });
 
     // Initialize
-    startRefresh();
+    esistatusDom.initTooltips(esistatus.dashboardWidget[0]);
+
+    updateWidget().then(() => console.log('ESI Status Dashboard Widget: Initial update complete'));
+
+    if (!subscribe()) {
+        startRefresh();
+    }
 });
@@ -1,2 +1,12 @@
-$(document).ready(()=>{'use strict';const t={dashboardWidget:$('#esi-status-dashboard-panel'),tooltipElements:'[data-bs-tooltip="aa-esi-status"]',refreshInterval:null},s=async()=>{try{const s=await fetchGet({url:esistatusSettings.dashboardWidget.ajaxUrl,responseIsJson:!1});if(!s)return;t.dashboardWidget.html(s),t.dashboardWidget[0].classList.contains('show')||new bootstrap.Collapse(t.dashboardWidget[0],{show:!0}),$(t.tooltipElements).each((t,s)=>{const e=bootstrap.Tooltip.getInstance(s);return e&&e.dispose(),$('.bs-tooltip-auto').remove(),new bootstrap.Tooltip(s,{html:!0})})}catch(t){console.error(t)}};(()=>{console.log('ESI Status Dashboard Widget: Starting automatic refresh'),s().then(()=>console.log('ESI Status Dashboard Widget: Initial update complete')),t.refreshInterval=setInterval(s,3e4)})()});
+$(document).ready(()=>{'use strict';const esistatus={dashboardWidget:$('#esi-status-dashboard-panel'),eventSource:null,etag:null,version:null};const polling={active:false,timer:null,baseDelay:30000,maxDelay:300000,delay:30000};const setIndexLinks=()=>{esistatus.dashboardWidget[0].querySelectorAll('[data-esistatus-index-link]').forEach((link)=>{link.href=esistatusSettings.dashboardWidget.indexUrl;});};const updateWidget=async()=>{try{const headers={};if(esistatus.etag){headers['If-None-Match']=esistatus.etag;}
+const response=await fetch(esistatusSettings.dashboardWidget.ajaxUrl,{cache:'no-store',headers:headers});if(response.status===304){return false;}
+if(!response.ok){throw new Error(`Error: ${response.status} ${response.statusText}`);}
+const version=response.headers.get('X-ESI-Status-Version');esistatus.etag=response.headers.get('ETag');if(version&&version===esistatus.version){return false;}
+const data=await response.text();esistatus.version=version;if(!data){return false;}
+esistatusDom.patch(esistatus.dashboardWidget[0],data);setIndexLinks();if(!esistatus.dashboardWidget[0].classList.contains('show')){new bootstrap.Collapse(esistatus.dashboardWidget[0],{show:true});}
+return true;}catch(error){console.error(error);return false;}};const scheduleRefresh=()=>{clearTimeout(polling.timer);polling.timer=null;if(!polling.active||document.hidden){return;}
+polling.timer=setTimeout(async()=>{const changed=await updateWidget();polling.delay=changed?polling.baseDelay:Math.min(polling.delay*2,polling.maxDelay);scheduleRefresh();},polling.delay);};const startRefresh=()=>{if(polling.active){return;}
+console.log('ESI Status Dashboard Widget: Starting automatic refresh');polling.active=true;polling.delay=polling.baseDelay;scheduleRefresh();};const stopRefresh=()=>{if(polling.active){console.log('ESI Status Dashboard Widget: Stopping automatic refresh');polling.active=false;scheduleRefresh();}};const subscribe=()=>{const eventsUrl=esistatusSettings.dashboardWidget.eventsUrl;if(!eventsUrl||typeof EventSource==='undefined'){return false;}
+esistatus.eventSource=new EventSource(eventsUrl);esistatus.eventSource.addEventListener('open',stopRefresh);esistatus.eventSource.addEventListener('error',startRefresh);esistatus.eventSource.addEventListener('version',(event)=>{if(event.data!==esistatus.version){updateWidget();}});return true;};document.addEventListener('visibilitychange',()=>{if(document.hidden||!polling.active){scheduleRefresh();return;}
+polling.delay=polling.baseDelay;updateWidget().then(scheduleRefresh);});esistatusDom.initTooltips(esistatus.dashboardWidget[0]);updateWidget().then(()=>console.log('ESI Status Dashboard Widget: Initial update complete'));if(!subscribe()){startRefresh();}});
 //# sourceMappingURL=esistatus-dashboard-widget.min.js.map
\ No newline at end of file
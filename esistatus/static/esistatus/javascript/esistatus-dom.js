@@ -0,0 +1,231 @@
+/* global bootstrap */
+
+/**
+ * In-place DOM updates for the ESI Status views
+ *
+ * Freshly rendered HTML is patched into the live DOM, only nodes that changed are
+ * touched, so open categories and shown tooltips survive an update.
+ *
+ * @type {{patch: function(HTMLElement, string): void, initTooltips: function(HTMLElement): void}}
+ */
+const esistatusDom = (() => {
+    'use strict';
+
+    const tooltipSelector = '[data-bs-tooltip="aa-esi-status"]';
+
+    // Attribute to identify nodes between updates (categories and routes)
+    const keyAttribute = 'data-esistatus-key';
+
+    // Attributes and classes Bootstrap sets at runtime, they are kept as they are
+    const runtimeAttributes = new Set([
+        'aria-describedby',
+        'aria-expanded',
+        'aria-label',
+        'data-bs-original-title',
+        'title'
+    ]);
+    const runtimeClasses = ['collapsed', 'collapsing', 'show'];
+
+    /**
+     * Get the key of a node
+     *
+     * @param {Node} node The node
+     * @returns {string|null} The key, or null if the node has none
+     */
+    const keyOf = (node) => {
+        return node.nodeType === Node.ELEMENT_NODE ? node.getAttribute(keyAttribute) : null;
+    };
+
+    /**
+     * Dispose the tooltips of a node and its descendants
+     *
+     * @param {Node} node The node
+     * @returns {void}
+     */
+    const disposeTooltips = (node) => {
+        if (node.nodeType !== Node.ELEMENT_NODE) {
+            return;
+        }
+
+        const elements = Array.from(node.querySelectorAll(tooltipSelector));
+
+        if (node.matches(tooltipSelector)) {
+            elements.push(node);
+        }
+
+        elements.forEach((el) => {
+            const existing = bootstrap.Tooltip.getInstance(el);
+
+            if (existing) {
+                existing.dispose();
+            }
+        });
+    };
+
+    /**
+     * Patch the attributes of an element
+     *
+     * @param {Element} oldEl The live element
+     * @param {Element} newEl The freshly rendered element
+     * @returns {void}
+     */
+    const patchAttributes = (oldEl, newEl) => {
+        Array.from(newEl.attributes).forEach(({name, value}) => {
+            if (name === 'class' || name === 'title' || (runtimeAttributes.has(name) && oldEl.hasAttribute(name))) {
+                return;
+            }
+
+            if (oldEl.getAttribute(name) !== value) {
+                oldEl.setAttribute(name, value);
+            }
+        });
+
+        Array.from(oldEl.attributes).forEach(({name}) => {
+            if (name !== 'class' && !runtimeAttributes.has(name) && !newEl.hasAttribute(name)) {
+                oldEl.removeAttribute(name);
+            }
+        });
+
+        // A changed tooltip title needs a new tooltip instance
+        const title = newEl.getAttribute('title');
+        const currentTitle = oldEl.getAttribute('data-bs-original-title') ?? oldEl.getAttribute('title');
+
+        if (title !== null && title !== currentTitle) {
+            disposeTooltips(oldEl);
+
+            oldEl.removeAttribute('data-bs-original-title');
+            oldEl.setAttribute('title', title);
+        }
+
+        const classes = [
+            ...newEl.classList,
+            ...runtimeClasses.filter((cls) => oldEl.classList.contains(cls) && !newEl.classList.contains(cls))
+        ].join(' ');
+
+        if ((oldEl.getAttribute('class') ?? '') !== classes) {
+            oldEl.setAttribute('class', classes);
+        }
+    };
+
+    /**
+     * Patch a node
+     *
+     * @param {Node} oldNode The live node
+     * @param {Node} newNode The freshly rendered node
+     * @returns {void}
+     */
+    const patchNode = (oldNode, newNode) => {
+        if (oldNode.isEqualNode(newNode)) {
+            return;
+        }
+
+        if (oldNode.nodeType !== Node.ELEMENT_NODE) {
+            oldNode.nodeValue = newNode.nodeValue;
+
+            return;
+        }
+
+        patchAttributes(oldNode, newNode);
+        patchChildren(oldNode, newNode);
+    };
+
+    /**
+     * Patch the children of a node
+     *
+     * Keyed children are matched by their key, all others by their position.
+     *
+     * @param {Node} oldParent The live parent node
+     * @param {Node} newParent The freshly rendered parent node
+     * @returns {void}
+     */
+    const patchChildren = (oldParent, newParent) => {
+        const keyed = new Map();
+
+        oldParent.childNodes.forEach((child) => {
+            const key = keyOf(child);
+
+            if (key !== null) {
+                keyed.set(key, child);
+            }
+        });
+
+        let current = oldParent.firstChild;
+
+        Array.from(newParent.childNodes).forEach((newChild) => {
+            const key = keyOf(newChild);
+            let match = null;
+
+            if (key !== null) {
+                match = keyed.get(key) ?? null;
+
+                keyed.delete(key);
+            } else if (
+                current
+                && keyOf(current) === null
+                && current.nodeType === newChild.nodeType
+                && current.nodeName === newChild.nodeName
+            ) {
+                match = current;
+            }
+
+            if (match === null) {
+                // New node, tooltips are picked up by the delegated tooltip
+                oldParent.insertBefore(newChild, current);
+
+                return;
+            }
+
+            if (match === current) {
+                current = current.nextSibling;
+            } else {
+                oldParent.insertBefore(match, current);
+            }
+
+            patchNode(match, newChild);
+        });
+
+        // Remove whatever is left
+        while (current) {
+            const next = current.nextSibling;
+
+            disposeTooltips(current);
+            current.remove();
+
+            current = next;
+        }
+    };
+
+    /**
+     * Patch the content of a container with freshly rendered HTML
+     *
+     * @param {HTMLElement} container The container
+     * @param {string} html The freshly rendered HTML
+     * @returns {void}
+     */
+    const patch = (container, html) => {
+        const template = document.createElement('template');
+
+        template.innerHTML = html;
+
+        patchChildren(container, template.content);
+    };
+
+    /**
+     * Initialize a delegated Bootstrap tooltip for all tooltip elements in a container,
+     * including those added later
+     *
+     * @param {HTMLElement} container The container
+     * @returns {void}
+     */
+    const initTooltips = (container) => {
+        bootstrap.Tooltip.getOrCreateInstance(container, {
+            selector: tooltipSelector,
+            html: true
+        });
+    };
+
+    return {
+        patch: patch,
+        initTooltips: initTooltips
+    };
+})();
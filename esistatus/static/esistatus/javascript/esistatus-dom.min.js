@@ -0,0 +1,11 @@
+const esistatusDom=(()=>{'use strict';const tooltipSelector='[data-bs-tooltip="aa-esi-status"]';const keyAttribute='data-esistatus-key';const runtimeAttributes=new Set(['aria-describedby','aria-expanded','aria-label','data-bs-original-title','title']);const runtimeClasses=['collapsed','collapsing','show'];const keyOf=(node)=>{return node.nodeType===Node.ELEMENT_NODE?node.getAttribute(keyAttribute):null;};const disposeTooltips=(node)=>{if(node.nodeType!==Node.ELEMENT_NODE){return;}
+const elements=Array.from(node.querySelectorAll(tooltipSelector));if(node.matches(tooltipSelector)){elements.push(node);}
+elements.forEach((el)=>{const existing=bootstrap.Tooltip.getInstance(el);if(existing){existing.dispose();}});};const patchAttributes=(oldEl,newEl)=>{Array.from(newEl.attributes).forEach(({name,value})=>{if(name==='class'||name==='title'||(runtimeAttributes.has(name)&&oldEl.hasAttribute(name))){return;}
+if(oldEl.getAttribute(name)!==value){oldEl.setAttribute(name,value);}});Array.from(oldEl.attributes).forEach(({name})=>{if(name!=='class'&&!runtimeAttributes.has(name)&&!newEl.hasAttribute(name)){oldEl.removeAttribute(name);}});const title=newEl.getAttribute('title');const currentTitle=oldEl.getAttribute('data-bs-original-title')??oldEl.getAttribute('title');if(title!==null&&title!==currentTitle){disposeTooltips(oldEl);oldEl.removeAttribute('data-bs-original-title');oldEl.setAttribute('title',title);}
+const classes=[...newEl.classList,...runtimeClasses.filter((cls)=>oldEl.classList.contains(cls)&&!newEl.classList.contains(cls))].join(' ');if((oldEl.getAttribute('class')??'')!==classes){oldEl.setAttribute('class',classes);}};const patchNode=(oldNode,newNode)=>{if(oldNode.isEqualNode(newNode)){return;}
+if(oldNode.nodeType!==Node.ELEMENT_NODE){oldNode.nodeValue=newNode.nodeValue;return;}
+patchAttributes(oldNode,newNode);patchChildren(oldNode,newNode);};const patchChildren=(oldParent,newParent)=>{const keyed=new Map();oldParent.childNodes.forEach((child)=>{const key=keyOf(child);if(key!==null){keyed.set(key,child);}});let current=oldParent.firstChild;Array.from(newParent.childNodes).forEach((newChild)=>{const key=keyOf(newChild);let match=null;if(key!==null){match=keyed.get(key)??null;keyed.delete(key);}else if(current&&keyOf(current)===null&&current.nodeType===newChild.nodeType&&current.nodeName===newChild.nodeName){match=current;}
+if(match===null){oldParent.insertBefore(newChild,current);return;}
+if(match===current){current=current.nextSibling;}else{oldParent.insertBefore(match,current);}
+patchNode(match,newChild);});while(current){const next=current.nextSibling;disposeTooltips(current);current.remove();current=next;}};const patch=(container,html)=>{const template=document.createElement('template');template.innerHTML=html;patchChildren(container,template.content);};const initTooltips=(container)=>{bootstrap.Tooltip.getOrCreateInstance(container,{selector:tooltipSelector,html:true});};return{patch:patch,initTooltips:initTooltips};})();
+//# sourceMappingURL=esistatus-dom.min.js.map
\ No newline at end of file
@@ -1,4 +1,4 @@
-/* global bootstrap, esistatusSettings, fetchGet */
+/* global esistatusDom, esistatusSettings, fetchGet */
 
 $(document).ready(() => {
     'use strict';
@@ -6,7 +6,56 @@ $(document).ready(() => {
     const esistatus = {
         esiStatusIndex: $('.esi-status-index'),
         loading: $('.esistatus-loading'),
-        tooltip: '[data-bs-tooltip="aa-esi-status"]',
+    };
+
+    /**
+     * Get the URL of the routes of a category
+     *
+     * The fragment is pre-rendered outside a request, so it only carries the
+     * status and tag, the URL is built from the one rendered for this page.
+     *
+     * @param {HTMLElement} element The category body
+     * @return {string|null} The URL, or null if the element has no routes
+     */
+    const routesUrl = (element) => {
+        const {esistatusRoutesStatus: status, esistatusRoutesTag: tag} = element.dataset;
+
+        if (!status || !tag) {
+            return null;
+        }
+
+        return esistatusSettings.url.routes
+            .replace('__status__', encodeURIComponent(status))
+            .replace('__tag__', encodeURIComponent(tag));
+    };
+
+    /**
+     * Load the routes of a category, they are only fetched when it is expanded
+     *
+     * @param {HTMLElement} element The category body
+     * @return {Promise<void>}
+     */
+    const loadRoutes = async (element) => {
+        const url = routesUrl(element);
+
+        if (!url || element.dataset.esistatusRoutesLoaded) {
+            return;
+        }
+
+        element.dataset.esistatusRoutesLoaded = 'true';
+
+        try {
+            const data = await fetchGet({
+                url: url,
+                responseIsJson: false
+            });
+
+            esistatusDom.patch(element, data);
+        } catch (error) {
+            delete element.dataset.esistatusRoutesLoaded;
+
+            console.error(error);
+        }
     };
 
     /**
@@ -27,29 +76,34 @@ $(document).ready(() => {
             }
 
             esistatus.loading.addClass('d-none');
-            esistatus.esiStatusIndex.html(data);
-
-            // Initialize Bootstrap tooltips
-            $(esistatus.tooltip).each((_, el) => {
-                // new bootstrap.Tooltip(el, {html: true});
-
-                // Dispose existing tooltip instance if it exists
-                const existing = bootstrap.Tooltip.getInstance(el);
+            esistatusDom.patch(esistatus.esiStatusIndex[0], data);
 
-                if (existing) {
-                    existing.dispose();
-                }
-
-                // Remove any leftover tooltip elements
-                $('.bs-tooltip-auto').remove();
-
-                // Create new tooltip instance
-                return new bootstrap.Tooltip(el, {html: true});
-            });
+            // Reload the routes of the categories that are still expanded
+            esistatus.esiStatusIndex[0].querySelectorAll('[data-esistatus-routes-status].show').forEach(loadRoutes);
         } catch (error) {
             console.error(error);
         }
     };
 
+    esistatusDom.initTooltips(esistatus.esiStatusIndex[0]);
+
+    esistatus.esiStatusIndex[0].addEventListener('show.bs.collapse', (event) => loadRoutes(event.target));
+
     fetchEsiStatus();
+
+    // Live updates (Server-Sent Events), if enabled
+    if (esistatusSettings.url.events && typeof EventSource !== 'undefined') {
+        let version = null;
+
+        const eventSource = new EventSource(esistatusSettings.url.events);
+
+        eventSource.addEventListener('version', (event) => {
+            // The first event only tells the version of what has just been loaded
+            if (version !== null && event.data !== version) {
+                fetchEsiStatus();
+            }
+
+            version = event.data;
+        });
+    }
 });
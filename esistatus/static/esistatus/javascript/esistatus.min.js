@@ -1,2 +1,6 @@
-$(document).ready(()=>{'use strict';const t={esiStatusIndex:$('.esi-status-index'),loading:$('.esistatus-loading'),tooltip:'[data-bs-tooltip="aa-esi-status"]'};(async()=>{try{const s=await fetchGet({url:esistatusSettings.url.esistatus,responseIsJson:!1});if(!s)return;t.loading.addClass('d-none'),t.esiStatusIndex.html(s),$(t.tooltip).each((t,s)=>{const o=bootstrap.Tooltip.getInstance(s);return o&&o.dispose(),$('.bs-tooltip-auto').remove(),new bootstrap.Tooltip(s,{html:!0})})}catch(t){console.error(t)}})()});
+$(document).ready(()=>{'use strict';const esistatus={esiStatusIndex:$('.esi-status-index'),loading:$('.esistatus-loading'),};const routesUrl=(element)=>{const{esistatusRoutesStatus:status,esistatusRoutesTag:tag}=element.dataset;if(!status||!tag){return null;}
+return esistatusSettings.url.routes.replace('__status__',encodeURIComponent(status)).replace('__tag__',encodeURIComponent(tag));};const loadRoutes=async(element)=>{const url=routesUrl(element);if(!url||element.dataset.esistatusRoutesLoaded){return;}
+element.dataset.esistatusRoutesLoaded='true';try{const data=await fetchGet({url:url,responseIsJson:false});esistatusDom.patch(element,data);}catch(error){delete element.dataset.esistatusRoutesLoaded;console.error(error);}};const fetchEsiStatus=async()=>{try{const data=await fetchGet({url:esistatusSettings.url.esistatus,responseIsJson:false});if(!data){return;}
+esistatus.loading.addClass('d-none');esistatusDom.patch(esistatus.esiStatusIndex[0],data);esistatus.esiStatusIndex[0].querySelectorAll('[data-esistatus-routes-status].show').forEach(loadRoutes);}catch(error){console.error(error);}};esistatusDom.initTooltips(esistatus.esiStatusIndex[0]);esistatus.esiStatusIndex[0].addEventListener('show.bs.collapse',(event)=>loadRoutes(event.target));fetchEsiStatus();if(esistatusSettings.url.events&&typeof EventSource!=='undefined'){let version=null;const eventSource=new EventSource(esistatusSettings.url.events);eventSource.addEventListener('version',(event)=>{if(version!==null&&event.data!==version){fetchEsiStatus();}
+version=event.data;});}});
 //# sourceMappingURL=esistatus.min.js.map
\ No newline at end of file
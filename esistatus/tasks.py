@@ -4,54 +4,142 @@ Tasks for ESI status monitoring.
 
 # Standard Library
 import datetime
+import hashlib
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
 from typing import Any
 
 # Third Party
 import requests
 from celery import shared_task
 
+try:
+    # Third Party
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+# Django
+from django.db import transaction
+from django.utils import timezone
+
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
 
 # AA ESI Status
 from esistatus import __user_agent__
-from esistatus.constants import ESIMetaUrl
-from esistatus.models import EsiStatus
-from esistatus.providers.applogger import AppLogger
-from esistatus.providers.cache import Cache
+from esistatus.app_settings import (
+    history_prune_batch_size,
+    history_retention_days,
+    openapi_streaming_enabled,
+    update_lock_timeout,
+    update_task_expires,
+)
+from esistatus.changeset import (
+    Changeset,
+    RouteKey,
+    diff_route_statuses,
+    route_statuses,
+)
+from esistatus.constants import (
+    ESI_ROUTE_STATUSES,
+    ESIMetaUrl,
+    UpdateResult,
+    UpdateStage,
+)
+from esistatus.fragments import prerender_fragments
+from esistatus.metrics import UPDATE_LAST_RUN, UPDATE_RUNS, update_stage
+from esistatus.models import EsiRoute, EsiRouteStatusChange, EsiStatus
+from esistatus.providers.applogger import AppLogger, LazyArg
+from esistatus.providers.cache import NOT_MODIFIED, Cache
+from esistatus.providers.esi_meta import EsiMetaClient
+from esistatus.signals import esi_status_changed
 
 logger = AppLogger(my_logger=get_extension_logger(__name__))
 
 request_headers = {"User-Agent": __user_agent__}
 
+# Returned by the fetch helpers when ESI answered a conditional request with 304
+ESI_NOT_MODIFIED = object()
 
-def _get_latest_compatibility_date() -> str | None:
+# Fields of an ESI route that are kept in sync with ESI
+ESI_ROUTE_FIELDS = ("status", "tag", "operation_id", "summary", "description")
+ESI_ROUTE_BATCH_SIZE = 500
+
+
+def _conditional_request_headers(validators: dict) -> dict:
     """
-    Retrieve the latest ESI compatibility date.
+    Build the conditional request headers from cached HTTP validators.
 
-    :return:
-    :rtype:
+    :param validators: The cached HTTP validators (etag/last_modified)
+    :type validators: dict
+    :return: The conditional request headers
+    :rtype: dict
     """
 
-    logger.debug("Retrieving latest ESI compatibility date.")
+    headers = {}
+
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    return headers
+
+
+def _response_validators(response: requests.Response) -> dict:
+    """
+    Extract the HTTP validators (ETag/Last-Modified) from a response.
+
+    :param response: The response
+    :type response: requests.Response
+    :return: The HTTP validators, empty if ESI didn't send any
+    :rtype: dict
+    """
 
-    url = ESIMetaUrl.COMPATIBILITY_DATES.value
-    cache_subkey = "compatibility-dates:latest"
-    cached = Cache(subkey=cache_subkey).get()
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+    return {key: value for key, value in validators.items() if value}
 
-    if cached:
-        logger.debug(f"Using cached ESI compatibility date: {cached}")
 
-        return cached
+def _fetch_latest_compatibility_date(
+    validators: dict | None = None,
+) -> tuple[Any, dict | None]:
+    """
+    Fetch the latest ESI compatibility date from ESI.
+
+    :param validators: HTTP validators of the cached compatibility date, to revalidate it
+    :type validators: dict | None
+    :return: The latest compatibility date (or `NOT_MODIFIED`) and the HTTP validators of the response
+    :rtype: tuple[Any, dict | None]
+    """
 
     try:
-        response = requests.get(url=url, headers=request_headers, timeout=10)
+        response = EsiMetaClient.get(
+            url=ESIMetaUrl.COMPATIBILITY_DATES.url,
+            headers={
+                **request_headers,
+                **_conditional_request_headers(validators=validators or {}),
+            },
+        )
         response.raise_for_status()
 
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            logger.debug("ESI compatibility dates not modified.")
+
+            return NOT_MODIFIED, _response_validators(response=response)
+
+        validators = _response_validators(response=response)
         dates = response.json().get("compatibility_dates", [])
 
-        logger.debug(f"ESI compatibility dates response: {dates}")
+        logger.debug("ESI compatibility dates response: %s", dates)
 
         valid_dates = []
 
@@ -62,122 +150,276 @@ def _get_latest_compatibility_date() -> str | None:
             try:
                 valid_dates.append(datetime.datetime.strptime(d, "%Y-%m-%d").date())
             except ValueError:
-                logger.debug(f"Skipping invalid compatibility date: {d}")
+                logger.debug("Skipping invalid compatibility date: %s", d)
 
                 continue
 
         if not valid_dates:
             logger.debug("No valid ESI compatibility dates found.")
 
-            return None
+            return None, None
 
         latest = max(valid_dates).isoformat()
 
-        logger.debug(f"Latest ESI compatibility date: {latest}")
-
-        Cache(subkey=cache_subkey).set(value=latest)
+        logger.debug("Latest ESI compatibility date: %s", latest)
 
-        return latest
+        return latest, validators
     except (requests.exceptions.RequestException, json.JSONDecodeError) as exc:
-        logger.debug(f"Error retrieving ESI compatibility dates: {exc}")
+        logger.debug("Error retrieving ESI compatibility dates: %s", exc)
 
-        return None
+        return None, None
 
 
-def _get_esi_status_json(compatibility_date: str) -> dict | None:
+def _get_latest_compatibility_date() -> str | None:
+    """
+    Retrieve the latest ESI compatibility date.
+
+    :return:
+    :rtype:
+    """
+
+    logger.debug("Retrieving latest ESI compatibility date.")
+
+    return Cache(subkey="compatibility-dates:latest").get_or_set(
+        default=_fetch_latest_compatibility_date
+    )
+
+
+def _get_esi_status_json(
+    compatibility_date: str, revalidate: bool = True
+) -> tuple[Any, dict]:
     """
     Retrieve the ESI status JSON for a given compatibility date.
 
+    With `revalidate`, the validators of the last stored status are sent along,
+    so an unchanged status is answered with 304, in which case `ESI_NOT_MODIFIED`
+    is returned. The validators of the response are returned instead of cached,
+    the caller stores them once the status has been written to the database.
+
     :param compatibility_date:
     :type compatibility_date:
-    :return:
-    :rtype:
+    :param revalidate: Send the validators of the last stored status along
+    :type revalidate: bool
+    :return: The ESI status (None on error, or `ESI_NOT_MODIFIED`) and the HTTP validators of the response
+    :rtype: tuple[Any, dict]
     """
 
+    validators = (
+        Cache(subkey=f"status:{compatibility_date}").get_validators()
+        if revalidate
+        else {}
+    )
+
     try:
         # Use a copy of the base headers and add X-Compatibility-Date without mutating the module-level dict
-        headers = {**request_headers, "X-Compatibility-Date": compatibility_date}
-        response = requests.get(
-            url=ESIMetaUrl.STATUS.value, headers=headers, timeout=10
-        )
+        headers = {
+            **request_headers,
+            "X-Compatibility-Date": compatibility_date,
+            **_conditional_request_headers(validators=validators),
+        }
+        response = EsiMetaClient.get(url=ESIMetaUrl.STATUS.url, headers=headers)
         response.raise_for_status()
+
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            logger.info(
+                "ESI status not modified for compatibility date: %s.",
+                compatibility_date,
+            )
+
+            return ESI_NOT_MODIFIED, {}
+
         esi_status = response.json()
 
         logger.info(
-            f"ESI status fetched successfully for for compatibility date: {compatibility_date}."
+            "ESI status fetched successfully for for compatibility date: %s.",
+            compatibility_date,
         )
 
-        return esi_status
+        return esi_status, _response_validators(response=response)
     except requests.exceptions.RequestException as exc:
         resp = getattr(exc, "response", None)
         error_str = (
             f"{resp.status_code} - {resp.reason}" if resp is not None else str(exc)
         )
 
-        logger.error(f"Unable to update ESI status. Error: {error_str}")
+        logger.error("Unable to update ESI status. Error: %s", error_str)
 
-        return None
+        return None, {}
     except json.JSONDecodeError:
         logger.error("Unable to update ESI status. ESI returned invalid JSON.")
 
-        return None
+        return None, {}
+
+
+# The only fields of an OpenAPI operation the status enrichment reads
+OPENAPI_OPERATION_FIELDS = ("description", "operationId", "summary", "tags")
+
+
+def _index_openapi_path_item(
+    operation_index: dict[tuple[str, str], dict[str, Any]],
+    path: str,
+    path_item: dict[str, Any],
+) -> None:
+    """
+    Add the operations of an OpenAPI path item to the operation index.
+
+    :param operation_index: The operation index
+    :type operation_index: dict
+    :param path: The path
+    :type path: str
+    :param path_item: The OpenAPI path item
+    :type path_item: dict
+    :return: None
+    :rtype: None
+    """
+
+    for method, operation in path_item.items():
+        # Path items can hold more than operations, e.g. shared "parameters"
+        if not isinstance(operation, dict):
+            continue
+
+        operation_index[(path, method.lower())] = {
+            field: operation[field]
+            for field in OPENAPI_OPERATION_FIELDS
+            if field in operation
+        }
 
 
-def _get_openapi_specs_json(compatibility_date: str) -> dict | None:
+def _build_openapi_operation_index(
+    openapi: dict[str, Any],
+) -> dict[tuple[str, str], dict[str, Any]]:
     """
-    Retrieve the ESI OpenAPI specs JSON for a given compatibility date.
+    Build a compact (path, method) → operation index from the ESI OpenAPI specs.
 
-    :param compatibility_date:
-    :type compatibility_date:
-    :return:
-    :rtype:
+    Only the fields needed to enrich the ESI status are kept, so the index is a
+    fraction of the size of the full specs.
+
+    :param openapi: The ESI OpenAPI specs
+    :type openapi: dict
+    :return: The operation index
+    :rtype: dict
     """
 
-    cacke_subkey = f"openapi:{compatibility_date}"
-    cached = Cache(subkey=cacke_subkey).get()
+    operation_index = {}
 
-    if cached:
-        logger.debug(
-            msg=f"Using cached ESI OpenAPI specs for compatibility date: {compatibility_date}."
+    for path, path_item in openapi.get("paths", {}).items():
+        _index_openapi_path_item(
+            operation_index=operation_index, path=path, path_item=path_item
         )
 
-        return cached
+    return operation_index
+
+
+def _stream_openapi_operation_index(
+    response: requests.Response,
+) -> dict[tuple[str, str], dict[str, Any]]:
+    """
+    Build the operation index while the ESI OpenAPI specs are downloaded.
+
+    Only one path item at a time is held in memory, instead of the object
+    graph of the whole specs.
+
+    :param response: The streamed response
+    :type response: requests.Response
+    :return: The operation index
+    :rtype: dict
+    """
+
+    operation_index = {}
+    path_items = ijson.sendable_list()
+    parser = ijson.kvitems_coro(path_items, "paths")
+
+    try:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            parser.send(chunk)
+
+            for path, path_item in path_items:
+                _index_openapi_path_item(
+                    operation_index=operation_index, path=path, path_item=path_item
+                )
+
+            del path_items[:]
+
+        parser.close()
+    except ijson.JSONError as exc:
+        raise json.JSONDecodeError(msg=str(exc), doc="", pos=0) from exc
+
+    return operation_index
+
+
+def _fetch_openapi_operation_index(
+    compatibility_date: str, validators: dict | None = None
+) -> tuple[Any, dict | None]:
+    """
+    Fetch the ESI OpenAPI specs for a given compatibility date and build the
+    operation index from them.
+
+    :param compatibility_date:
+    :type compatibility_date:
+    :param validators: HTTP validators of the cached operation index, to revalidate it
+    :type validators: dict | None
+    :return: The operation index (or `NOT_MODIFIED`) and the HTTP validators of the response
+    :rtype: tuple[Any, dict | None]
+    """
+
+    streaming = ijson is not None and openapi_streaming_enabled()
 
     try:
         # Use a copy of the base headers and add X-Compatibility-Date without mutating the module-level dict
-        headers = {**request_headers, "X-Compatibility-Date": compatibility_date}
-        response = requests.get(
-            url=ESIMetaUrl.OPENAPI_SPECS.value, headers=headers, timeout=10
-        )
-        response.raise_for_status()
-        openapi_specs = response.json()
+        headers = {
+            **request_headers,
+            "X-Compatibility-Date": compatibility_date,
+            **_conditional_request_headers(validators=validators or {}),
+        }
+
+        with EsiMetaClient.get(
+            url=ESIMetaUrl.OPENAPI_SPECS.url, headers=headers, stream=streaming
+        ) as response:
+            response.raise_for_status()
+
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                logger.debug(
+                    "ESI OpenAPI specs not modified for compatibility date: %s.",
+                    compatibility_date,
+                )
+
+                return NOT_MODIFIED, _response_validators(response=response)
+
+            operation_index = (
+                _stream_openapi_operation_index(response=response)
+                if streaming
+                else _build_openapi_operation_index(openapi=response.json())
+            )
 
         logger.info(
-            f"ESI OpenAPI specs fetched successfully for compatibility date: {compatibility_date}."
+            "ESI OpenAPI specs fetched successfully for compatibility date: %s.",
+            compatibility_date,
         )
 
-        Cache(subkey=cacke_subkey).set(value=openapi_specs)
-
-        return openapi_specs
+        return operation_index, _response_validators(response=response)
     except requests.exceptions.RequestException as exc:
         resp = getattr(exc, "response", None)
         error_str = (
             f"{resp.status_code} - {resp.reason}" if resp is not None else str(exc)
         )
 
-        logger.error(f"Unable to fetch ESI OpenAPI specs. Error: {error_str}")
+        logger.error("Unable to fetch ESI OpenAPI specs. Error: %s", error_str)
 
-        return None
+        return None, None
     except json.JSONDecodeError:
         logger.error("Unable to fetch ESI OpenAPI specs. ESI returned invalid JSON.")
 
-        return None
+        return None, None
 
 
-def _get_esi_names_json(compatibility_date: str):
+def _get_openapi_operation_index(
+    compatibility_date: str,
+) -> dict[tuple[str, str], dict[str, Any]] | None:
     """
-    Get the current name ESI is going by.
-    The three letters have never once meant the same thing twice.
+    Retrieve the ESI OpenAPI operation index for a given compatibility date.
+
+    The index is built once per compatibility date and cached in place of the
+    full OpenAPI specs.
 
     :param compatibility_date:
     :type compatibility_date:
@@ -185,43 +427,82 @@ def _get_esi_names_json(compatibility_date: str):
     :rtype:
     """
 
-    cacke_subkey = f"name:{compatibility_date}"
-    cached = Cache(subkey=cacke_subkey).get()
-
-    if cached:
-        logger.debug(
-            msg=f"Using cached ESI names for compatibility date: {compatibility_date}."
+    return Cache(subkey=f"openapi-index:{compatibility_date}").get_or_set(
+        default=partial(
+            _fetch_openapi_operation_index, compatibility_date=compatibility_date
         )
+    )
 
-        return cached
+
+def _fetch_esi_names_json(
+    compatibility_date: str, validators: dict | None = None
+) -> tuple[Any, dict | None]:
+    """
+    Fetch the names ESI has been going by from ESI.
+
+    :param compatibility_date:
+    :type compatibility_date:
+    :param validators: HTTP validators of the cached ESI names, to revalidate them
+    :type validators: dict | None
+    :return: The ESI names (or `NOT_MODIFIED`) and the HTTP validators of the response
+    :rtype: tuple[Any, dict | None]
+    """
 
     try:
         # Use a copy of the base headers and add X-Compatibility-Date without mutating the module-level dict
-        headers = {**request_headers, "X-Compatibility-Date": compatibility_date}
-        response = requests.get(url=ESIMetaUrl.NAME.value, headers=headers, timeout=10)
+        headers = {
+            **request_headers,
+            "X-Compatibility-Date": compatibility_date,
+            **_conditional_request_headers(validators=validators or {}),
+        }
+        response = EsiMetaClient.get(url=ESIMetaUrl.NAME.url, headers=headers)
         response.raise_for_status()
+
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            logger.debug(
+                "ESI names not modified for compatibility date: %s.",
+                compatibility_date,
+            )
+
+            return NOT_MODIFIED, _response_validators(response=response)
+
         esi_names = response.json()
 
         logger.info(
-            f"ESI names fetched successfully for compatibility date: {compatibility_date}."
+            "ESI names fetched successfully for compatibility date: %s.",
+            compatibility_date,
         )
 
-        Cache(subkey=cacke_subkey).set(value=esi_names)
-
-        return esi_names
+        return esi_names, _response_validators(response=response)
     except requests.exceptions.RequestException as exc:
         resp = getattr(exc, "response", None)
         error_str = (
             f"{resp.status_code} - {resp.reason}" if resp is not None else str(exc)
         )
 
-        logger.error(f"Unable to fetch ESI names. Error: {error_str}")
+        logger.error("Unable to fetch ESI names. Error: %s", error_str)
 
-        return None
+        return None, None
     except json.JSONDecodeError:
         logger.error("Unable to fetch ESI names. ESI returned invalid JSON.")
 
-        return None
+        return None, None
+
+
+def _get_esi_names_json(compatibility_date: str):
+    """
+    Get the current name ESI is going by.
+    The three letters have never once meant the same thing twice.
+
+    :param compatibility_date:
+    :type compatibility_date:
+    :return:
+    :rtype:
+    """
+
+    return Cache(subkey=f"name:{compatibility_date}").get_or_set(
+        default=partial(_fetch_esi_names_json, compatibility_date=compatibility_date)
+    )
 
 
 def _get_esi_name_for_compatibility_date(compatibility_date: str):
@@ -234,17 +515,19 @@ def _get_esi_name_for_compatibility_date(compatibility_date: str):
     :rtype:
     """
 
-    logger.debug(f"Getting ESI Name for compatibility date: {compatibility_date}")
+    logger.debug("Getting ESI Name for compatibility date: %s", compatibility_date)
 
     esi_names = _get_esi_names_json(compatibility_date=compatibility_date)
 
     # Return early
     if not esi_names:
-        logger.debug(f"No ESI Names found for compatibility date: {compatibility_date}")
+        logger.debug(
+            "No ESI Names found for compatibility date: %s", compatibility_date
+        )
 
         return None
 
-    logger.debug(f"ESI Names found: {esi_names.get('history')}")
+    logger.debug("ESI Names found: %s", esi_names.get("history"))
 
     # Parse compatibility_date
     try:
@@ -252,7 +535,7 @@ def _get_esi_name_for_compatibility_date(compatibility_date: str):
             compatibility_date, "%Y-%m-%d"
         ).date()
     except Exception:  # pylint: disable=broad-exception-caught
-        logger.debug(f"Invalid compatibility_date format: {compatibility_date}")
+        logger.debug("Invalid compatibility_date format: %s", compatibility_date)
 
         return None
 
@@ -271,7 +554,7 @@ def _get_esi_name_for_compatibility_date(compatibility_date: str):
                 entry_date_str, "%Y-%m-%d"
             ).date()
         except ValueError:
-            logger.debug(f"Skipping invalid entry date: {entry_date_str}")
+            logger.debug("Skipping invalid entry date: %s", entry_date_str)
 
             continue
 
@@ -285,28 +568,105 @@ def _get_esi_name_for_compatibility_date(compatibility_date: str):
     # if isinstance(esi_name, str):
     #     esi_name = esi_name.replace(" (ESI)", "")
 
-    logger.debug(f"ESI Name: {esi_name}")
+    logger.debug("ESI Name: %s", esi_name)
 
     return esi_name
 
 
-def _enrich_status_json(status: dict[str, Any], openapi: dict[str, Any]) -> list[Any]:
+def _fetch_esi_meta_documents(
+    compatibility_date: str, revalidate: bool = True
+) -> tuple[Any, Any, Any]:
+    """
+    Fetch the ESI status, OpenAPI specs and ESI name concurrently.
+
+    They only depend on the compatibility date, so a run with a cold cache
+    takes as long as the slowest request instead of the sum of all three.
+    Each helper keeps its own error handling and logging.
+
+    :param compatibility_date: The compatibility date
+    :type compatibility_date: str
+    :param revalidate: Revalidate the ESI status against the last stored one
+    :type revalidate: bool
+    :return: ESI status, OpenAPI operation index and ESI name as returned by their helpers
+    :rtype: tuple
     """
-    Enrich ESI status routes with description, operation_id, summary and tags from OpenAPI specs.
+
+    with ThreadPoolExecutor(
+        max_workers=3, thread_name_prefix="esistatus-fetch"
+    ) as executor:
+        esi_status = executor.submit(
+            _get_esi_status_json,
+            compatibility_date=compatibility_date,
+            revalidate=revalidate,
+        )
+        operation_index = executor.submit(
+            _get_openapi_operation_index, compatibility_date=compatibility_date
+        )
+        esi_name = executor.submit(
+            _get_esi_name_for_compatibility_date, compatibility_date=compatibility_date
+        )
+
+    return esi_status.result(), operation_index.result(), esi_name.result()
+
+
+def _status_fingerprint(
+    status: dict[str, Any], compatibility_date: str, esi_name: str | None = None
+) -> str:
+    """
+    Build a fingerprint of the raw ESI status, its compatibility date and ESI name.
+
+    :param status: The raw ESI status JSON
+    :type status: dict
+    :param compatibility_date: The compatibility date the status was fetched for
+    :type compatibility_date: str
+    :param esi_name: The ESI name for the compatibility date
+    :type esi_name: str | None
+    :return: The fingerprint (SHA-256 hex digest)
+    :rtype: str
+    """
+
+    payload = json.dumps(status, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha256(
+        f"{compatibility_date}:{esi_name or ''}:{payload}".encode()
+    ).hexdigest()
+
+
+def _stored_esi_status() -> tuple[str | None, str | None]:
+    """
+    Get the fingerprint and ESI name of the stored ESI status, bypassing the cache.
+
+    :return: The fingerprint and ESI name, None if not stored
+    :rtype: tuple[str | None, str | None]
+    """
+
+    fingerprint, esi_name = EsiStatus.objects.filter(pk=1).values_list(
+        "fingerprint", "esi_name"
+    ).first() or (None, None)
+
+    return fingerprint or None, esi_name or None
+
+
+def _enrich_status_json(
+    status: dict[str, Any], operation_index: dict[tuple[str, str], dict[str, Any]]
+) -> list[Any]:
+    """
+    Enrich ESI status routes with description, operation_id, summary and tags from
+    the OpenAPI operation index.
 
     Inspired by this script by CCP Pinky:
     https://gist.github.com/ccp-pinky/28e60a5a79df5f7db4f7f46704c9f818
 
     :param status:
     :type status:
-    :param openapi:
-    :type openapi:
+    :param operation_index:
+    :type operation_index:
     :return:
     :rtype:
     """
 
     for route in status["routes"]:
-        spec = openapi["paths"].get(route["path"], {}).get(route["method"].lower(), {})
+        spec = operation_index.get((route["path"], route["method"].lower()), {})
 
         route["description"] = spec.get("description", None)
         route["operation_id"] = spec.get("operationId", None)
@@ -349,11 +709,8 @@ def _esi_endpoint_status_from_json(esi_endpoint_json: list) -> dict:
     """
 
     esi_endpoint_status = {
-        "Unknown": {"endpoints": {}, "count": 0, "percentage": "0.00%"},
-        "OK": {"endpoints": {}, "count": 0, "percentage": "0.00%"},
-        "Degraded": {"endpoints": {}, "count": 0, "percentage": "0.00%"},
-        "Down": {"endpoints": {}, "count": 0, "percentage": "0.00%"},
-        "Recovering": {"endpoints": {}, "count": 0, "percentage": "0.00%"},
+        status: {"endpoints": {}, "count": 0, "percentage": "0.00%"}
+        for status in ESI_ROUTE_STATUSES
     }
 
     for esi_endpoint in esi_endpoint_json:
@@ -379,7 +736,12 @@ def _esi_endpoint_status_from_json(esi_endpoint_json: list) -> dict:
     )
 
     for status_data in esi_endpoint_status.values():
-        status_data["endpoints"] = dict(sorted(status_data["endpoints"].items()))
+        status_data["endpoints"] = {
+            tag: sorted(
+                endpoints, key=lambda endpoint: (endpoint["path"], endpoint["method"])
+            )
+            for tag, endpoints in sorted(status_data["endpoints"].items())
+        }
         percentage = (
             (status_data["count"] / endpoints_total * 100)
             if endpoints_total > 0 and status_data["count"] > 0
@@ -391,53 +753,316 @@ def _esi_endpoint_status_from_json(esi_endpoint_json: list) -> dict:
     return {"total_endpoints": endpoints_total, "esi_status": esi_endpoint_status}
 
 
-@shared_task()
-def update_esi_status():
+def _sync_esi_routes(existing: dict[RouteKey, EsiRoute], routes: list) -> None:
     """
-    Task to update ESI status.
+    Bring the stored ESI routes in line with the current ESI status routes,
+    touching only new, changed and removed rows
+
+    :param existing: The stored routes, keyed by (method, path)
+    :type existing: dict[RouteKey, EsiRoute]
+    :param routes: The current (enriched) ESI status routes
+    :type routes: list
+    :return: None
+    :rtype: None
     """
 
-    logger.debug("Starting ESI status update task.")
+    current = {
+        (route["method"].upper(), route["path"]): {
+            "status": route["status"],
+            "tag": route["tags"][0],
+            "operation_id": route["operation_id"],
+            "summary": route["summary"],
+            "description": route["description"],
+        }
+        for route in routes
+    }
+    to_create = []
+    to_update = []
 
-    latest_compatibility_date = _get_latest_compatibility_date()
+    for (method, path), values in current.items():
+        esi_route = existing.get((method, path))
+
+        if esi_route is None:
+            to_create.append(EsiRoute(method=method, path=path, **values))
+        elif any(getattr(esi_route, key) != value for key, value in values.items()):
+            for key, value in values.items():
+                setattr(esi_route, key, value)
+
+            to_update.append(esi_route)
+
+    to_delete = [
+        esi_route.pk for key, esi_route in existing.items() if key not in current
+    ]
+
+    EsiRoute.objects.bulk_create(to_create)
+    EsiRoute.objects.bulk_update(
+        to_update, fields=ESI_ROUTE_FIELDS, batch_size=ESI_ROUTE_BATCH_SIZE
+    )
+    EsiRoute.objects.filter(pk__in=to_delete).delete()
+
+    logger.debug(
+        "ESI routes synced: %s created, %s updated, %s deleted.",
+        len(to_create),
+        len(to_update),
+        len(to_delete),
+    )
+
+
+def _record_route_status_changes(changeset: Changeset) -> int:
+    """
+    Record the status transitions of a changeset
+
+    :param changeset: The changes of this run
+    :type changeset: Changeset
+    :return: The number of recorded changes
+    :rtype: int
+    """
+
+    changed_at = timezone.now()
+
+    EsiRouteStatusChange.objects.bulk_create(
+        [
+            EsiRouteStatusChange(
+                method=transition.method,
+                path=transition.path,
+                old_status=transition.old_status,
+                new_status=transition.new_status,
+                changed_at=changed_at,
+            )
+            for transition in changeset.transitions
+        ]
+    )
+
+    return len(changeset.transitions)
+
+
+def _update_esi_status(timings: dict) -> str:
+    """
+    Update the ESI status, timing each stage.
+
+    :param timings: Collects the duration (in seconds) per stage
+    :type timings: dict
+    :return: The result of the update, see `UpdateResult`
+    :rtype: str
+    """
+
+    with update_stage(stage=UpdateStage.COMPATIBILITY_DATE, timings=timings):
+        latest_compatibility_date = _get_latest_compatibility_date()
 
     if latest_compatibility_date is None:
         logger.error("Failed to retrieve latest compatibility date.")
 
-        return
+        return UpdateResult.FAILED.value
+
+    # From the database, the cached version may outlive a wiped or restored one
+    stored_version, stored_name = _stored_esi_status()
+    status_cache = Cache(subkey=f"status:{latest_compatibility_date}")
 
-    esi_status = _get_esi_status_json(compatibility_date=latest_compatibility_date)
-    openapi_specs = _get_openapi_specs_json(
-        compatibility_date=latest_compatibility_date
+    with update_stage(stage=UpdateStage.FETCH, timings=timings):
+        # Only revalidate against a complete stored status, a 304 would never
+        # fill a wiped or restored database again, nor an ESI name that failed
+        (esi_status, status_validators), operation_index, esi_name = (
+            _fetch_esi_meta_documents(
+                compatibility_date=latest_compatibility_date,
+                revalidate=stored_version is not None and stored_name is not None,
+            )
+        )
+
+    if esi_status is ESI_NOT_MODIFIED:
+        logger.debug("ESI status has not changed. Skipping database update.")
+
+        return UpdateResult.NOT_MODIFIED.value
+
+    fingerprint = (
+        _status_fingerprint(
+            status=esi_status,
+            compatibility_date=latest_compatibility_date,
+            esi_name=esi_name,
+        )
+        if esi_status is not None
+        else None
     )
 
-    if esi_status is None or openapi_specs is None:
+    if fingerprint is not None and fingerprint == stored_version:
+        logger.debug("ESI status fingerprint unchanged. Skipping database update.")
+
+        if status_validators:
+            status_cache.set_validators(validators=status_validators)
+
+        return UpdateResult.UNCHANGED.value
+
+    if esi_status is None or operation_index is None:
         logger.error("Failed to retrieve ESI status or OpenAPI specs.")
 
-        return
+        return UpdateResult.FAILED.value
 
-    enriched_status = _enrich_status_json(status=esi_status, openapi=openapi_specs)
+    with update_stage(stage=UpdateStage.ENRICH, timings=timings):
+        enriched_status = _enrich_status_json(
+            status=esi_status, operation_index=operation_index
+        )
 
     if not any(route.get("tags") for route in enriched_status):
         logger.debug("Enriched ESI status has no tags. Skipping database update.")
 
-        return
+        return UpdateResult.FAILED.value
 
-    esi_status_data = _esi_endpoint_status_from_json(esi_endpoint_json=enriched_status)
-    esi_name = _get_esi_name_for_compatibility_date(
-        compatibility_date=latest_compatibility_date
-    )
+    with update_stage(stage=UpdateStage.AGGREGATE, timings=timings):
+        esi_status_data = _esi_endpoint_status_from_json(
+            esi_endpoint_json=enriched_status
+        )
 
-    EsiStatus.objects.update_or_create(
-        pk=1,
-        defaults={
-            "compatibility_date": latest_compatibility_date,
-            "status_data": esi_status_data.get("esi_status", {}),
-            "total_endpoints": esi_status_data.get("total_endpoints", 0),
-            "esi_name": esi_name,
-        },
-    )
+    with update_stage(stage=UpdateStage.DB_WRITE, timings=timings):
+        existing_routes = {
+            (esi_route.method, esi_route.path): esi_route
+            for esi_route in EsiRoute.objects.all()
+        }
+        changeset = diff_route_statuses(
+            previous={
+                key: esi_route.status for key, esi_route in existing_routes.items()
+            },
+            current=route_statuses(routes=enriched_status),
+        )
+
+        with transaction.atomic():
+            EsiStatus.objects.update_or_create(
+                pk=1,
+                defaults={
+                    "compatibility_date": latest_compatibility_date,
+                    "total_endpoints": esi_status_data.get("total_endpoints", 0),
+                    "status_counts": {
+                        status: {
+                            "count": data["count"],
+                            "percentage": data["percentage"],
+                        }
+                        for status, data in esi_status_data.get(
+                            "esi_status", {}
+                        ).items()
+                    },
+                    "esi_name": esi_name,
+                    "fingerprint": fingerprint,
+                },
+            )
+
+            _sync_esi_routes(existing=existing_routes, routes=enriched_status)
+
+            changes = _record_route_status_changes(changeset=changeset)
+
+            if changeset:
+                transaction.on_commit(
+                    lambda: esi_status_changed.send(
+                        sender=EsiStatus,
+                        changeset=changeset,
+                        compatibility_date=latest_compatibility_date,
+                    )
+                )
+
+    if changes:
+        logger.info("Recorded %s ESI route status change(s).", changes)
+
+    # Only now the status is stored, so a failed write above is fetched again
+    Cache(subkey="status:fingerprint").set(value=fingerprint)
+
+    if status_validators:
+        status_cache.set_validators(validators=status_validators)
+
+    with update_stage(stage=UpdateStage.PRERENDER, timings=timings):
+        prerender_fragments(
+            version=fingerprint,
+            context={
+                "esi_endpoint_status": {
+                    status: {
+                        "count": data["count"],
+                        "percentage": data["percentage"],
+                        "tags": list(data["endpoints"]),
+                    }
+                    for status, data in esi_status_data.get("esi_status", {}).items()
+                },
+                "total_endpoints": esi_status_data.get("total_endpoints", 0),
+                "esi_name": esi_name,
+                "compatibility_date": latest_compatibility_date,
+            },
+        )
 
     logger.info(
-        f"ESI status updated in database for compatibility date: {latest_compatibility_date}."
+        "ESI status updated in database for compatibility date: %s.",
+        latest_compatibility_date,
+    )
+
+    return UpdateResult.UPDATED.value
+
+
+@shared_task(expires=update_task_expires())
+def update_esi_status() -> str:
+    """
+    Task to update ESI status.
+
+    Only one run at a time, a run that starts while another is still in progress
+    returns right away. Runs queued for longer than `ESISTATUS_UPDATE_TASK_EXPIRES`
+    are discarded by Celery.
+
+    :return: The result of the update, see `UpdateResult`
+    :rtype: str
+    """
+
+    logger.debug("Starting ESI status update task.")
+
+    timings = {}
+
+    with Cache(subkey="update").lock(timeout=update_lock_timeout()) as acquired:
+        if not acquired:
+            logger.info("ESI status update already in progress. Skipping this run.")
+
+            UPDATE_RUNS.inc(result=UpdateResult.IN_PROGRESS.value)
+
+            return UpdateResult.IN_PROGRESS.value
+
+        with update_stage(stage=UpdateStage.TOTAL, timings=timings):
+            result = _update_esi_status(timings=timings)
+
+    UPDATE_RUNS.inc(result=result)
+    UPDATE_LAST_RUN.set(value=time.time())
+
+    logger.debug(
+        "ESI status update %s (%s).",
+        result,
+        LazyArg(
+            lambda: ", ".join(
+                f"{stage}: {duration:.3f}s" for stage, duration in timings.items()
+            )
+        ),
     )
+
+    return result
+
+
+@shared_task()
+def prune_esi_status_history() -> int:
+    """
+    Task to delete status changes of ESI routes older than the retention period.
+
+    Deletes in batches to keep the transactions and locks small.
+
+    :return: The number of deleted status changes
+    :rtype: int
+    """
+
+    cutoff = timezone.now() - datetime.timedelta(days=history_retention_days())
+    batch_size = history_prune_batch_size()
+    deleted_total = 0
+
+    while True:
+        batch = list(
+            EsiRouteStatusChange.objects.filter(changed_at__lt=cutoff).values_list(
+                "pk", flat=True
+            )[:batch_size]
+        )
+
+        if not batch:
+            break
+
+        deleted, _ = EsiRouteStatusChange.objects.filter(pk__in=batch).delete()
+        deleted_total += deleted
+
+    logger.info("Pruned %s ESI route status change(s).", deleted_total)
+
+    return deleted_total
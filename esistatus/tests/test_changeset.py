@@ -0,0 +1,109 @@
+"""
+Test the route-level changes between ESI status runs
+"""
+
+# AA ESI Status
+from esistatus.changeset import (
+    Changeset,
+    StatusTransition,
+    diff_route_statuses,
+    route_statuses,
+)
+from esistatus.tests import BaseTestCase
+
+
+class TestRouteStatuses(BaseTestCase):
+    """
+    Test the route_statuses function
+    """
+
+    def test_route_statuses_from_routes(self):
+        """
+        Test that the status of each route is read from the route list
+
+        :return:
+        :rtype:
+        """
+
+        routes = [
+            {"method": "get", "path": "/alliances", "status": "OK"},
+            {"method": "POST", "path": "/universe/names", "status": "Down"},
+        ]
+
+        self.assertEqual(
+            route_statuses(routes=routes),
+            {("GET", "/alliances"): "OK", ("POST", "/universe/names"): "Down"},
+        )
+
+
+class TestDiffRouteStatuses(BaseTestCase):
+    """
+    Test the diff_route_statuses function
+    """
+
+    def test_detects_added_removed_and_changed_routes(self):
+        """
+        Test that added, removed and changed routes are detected
+
+        :return:
+        :rtype:
+        """
+
+        previous = {
+            ("GET", "/alliances"): "OK",
+            ("GET", "/status"): "OK",
+            ("GET", "/gone"): "Down",
+        }
+        current = {
+            ("GET", "/alliances"): "Degraded",
+            ("GET", "/status"): "OK",
+            ("GET", "/new"): "Recovering",
+        }
+
+        changeset = diff_route_statuses(previous=previous, current=current)
+
+        self.assertEqual(changeset.added, {("GET", "/new"): "Recovering"})
+        self.assertEqual(changeset.removed, {("GET", "/gone"): "Down"})
+        self.assertEqual(
+            changeset.transitions,
+            [
+                StatusTransition(
+                    method="GET",
+                    path="/alliances",
+                    old_status="OK",
+                    new_status="Degraded",
+                )
+            ],
+        )
+        self.assertTrue(changeset)
+
+    def test_unchanged_routes_result_in_empty_changeset(self):
+        """
+        Test that unchanged routes result in an empty changeset
+
+        :return:
+        :rtype:
+        """
+
+        statuses = {("GET", "/alliances"): "OK"}
+
+        changeset = diff_route_statuses(previous=statuses, current=dict(statuses))
+
+        self.assertEqual(changeset, Changeset())
+        self.assertFalse(changeset)
+
+    def test_everything_is_added_without_previous_run(self):
+        """
+        Test that all routes are added without a previous run
+
+        :return:
+        :rtype:
+        """
+
+        current = {("GET", "/alliances"): "OK"}
+
+        changeset = diff_route_statuses(previous={}, current=current)
+
+        self.assertEqual(changeset.added, current)
+        self.assertEqual(changeset.removed, {})
+        self.assertEqual(changeset.transitions, [])
@@ -0,0 +1,237 @@
+"""
+Test the pre-rendered HTML fragments
+"""
+
+# Standard Library
+from unittest import mock
+
+# Django
+from django.test import override_settings
+
+# AA ESI Status
+from esistatus import __version__
+from esistatus.constants import EsiStatusFragment
+from esistatus.fragments import (
+    esi_status_version,
+    get_fragment,
+    prerender_fragments,
+    store_fragment,
+)
+from esistatus.models import EsiStatus
+from esistatus.tests import BaseTestCase
+
+
+class TestEsiStatusVersion(BaseTestCase):
+    """
+    Test the esi_status_version function.
+    """
+
+    def test_prefers_cache(self):
+        """
+        Test that the version is read from the cache first.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("esistatus.fragments.Cache.get", return_value="abc"):
+            self.assertEqual(esi_status_version(), "abc")
+
+    def test_falls_back_to_database(self):
+        """
+        Test that the version is read from the database on a cache miss.
+
+        :return:
+        :rtype:
+        """
+
+        EsiStatus.objects.create(
+            pk=1, compatibility_date="2023-10-01", fingerprint="def"
+        )
+
+        with (
+            mock.patch("esistatus.fragments.Cache.get", return_value=False),
+            mock.patch("esistatus.fragments.Cache.set") as mock_set,
+        ):
+            self.assertEqual(esi_status_version(), "def")
+
+        # Cached again, so the next lookups don't hit the database
+        mock_set.assert_called_once_with(value="def")
+
+    def test_is_none_without_data(self):
+        """
+        Test that there is no version without any data.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch("esistatus.fragments.Cache.get", return_value=False),
+            mock.patch("esistatus.fragments.Cache.set") as mock_set,
+        ):
+            self.assertIsNone(esi_status_version())
+
+        mock_set.assert_not_called()
+
+
+class TestGetFragment(BaseTestCase):
+    """
+    Test the get_fragment function.
+    """
+
+    def test_returns_html_for_matching_version(self):
+        """
+        Test that the stored HTML is returned for the matching version.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch(
+            "esistatus.fragments.Cache.get",
+            return_value={"version": "abc", "html": "<p>OK</p>"},
+        ):
+            result = get_fragment(
+                fragment=EsiStatusFragment.INDEX, version="abc", language="en"
+            )
+
+        self.assertEqual(result, "<p>OK</p>")
+
+    def test_returns_none_for_outdated_version(self):
+        """
+        Test that HTML rendered for an older version is not returned.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch(
+            "esistatus.fragments.Cache.get",
+            return_value={"version": "old", "html": "<p>OK</p>"},
+        ):
+            result = get_fragment(
+                fragment=EsiStatusFragment.INDEX, version="abc", language="en"
+            )
+
+        self.assertIsNone(result)
+
+    def test_returns_none_on_cache_miss(self):
+        """
+        Test that nothing is returned on a cache miss.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("esistatus.fragments.Cache.get", return_value=False):
+            result = get_fragment(
+                fragment=EsiStatusFragment.INDEX, version="abc", language="en"
+            )
+
+        self.assertIsNone(result)
+
+
+class TestStoreFragment(BaseTestCase):
+    """
+    Test the store_fragment function.
+    """
+
+    def test_stores_html_with_version_per_fragment_and_language(self):
+        """
+        Test that the HTML is stored together with its version.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("esistatus.fragments.Cache") as mock_cache:
+            store_fragment(
+                fragment=EsiStatusFragment.DASHBOARD_WIDGET,
+                version="abc",
+                language="de",
+                html="<p>OK</p>",
+            )
+
+        mock_cache.assert_called_once_with(
+            subkey=f"html:dashboard_widget:de:{__version__}"
+        )
+        mock_cache.return_value.set.assert_called_once_with(
+            value={"version": "abc", "html": "<p>OK</p>"}
+        )
+
+
+class TestPrerenderFragments(BaseTestCase):
+    """
+    Test the prerender_fragments function.
+    """
+
+    @override_settings(LANGUAGES=[("en", "English"), ("de", "German")])
+    def test_renders_every_fragment_in_every_language(self):
+        """
+        Test that every fragment is rendered and stored in every configured language.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch(
+                "esistatus.fragments.render_to_string", return_value="<p>OK</p>"
+            ) as mock_render,
+            mock.patch("esistatus.fragments.store_fragment") as mock_store,
+        ):
+            prerender_fragments(version="abc", context={"total_endpoints": 1})
+
+        self.assertEqual(mock_render.call_count, 4)
+        mock_render.assert_any_call(
+            template_name=EsiStatusFragment.INDEX.value,
+            context={"total_endpoints": 1},
+        )
+        mock_store.assert_any_call(
+            fragment=EsiStatusFragment.DASHBOARD_WIDGET,
+            version="abc",
+            language="de",
+            html="<p>OK</p>",
+        )
+        self.assertEqual(mock_store.call_count, 4)
+
+    @override_settings(LANGUAGES=[("en", "English")])
+    def test_renders_no_request_dependent_urls(self):
+        """
+        Test that the fragments don't carry URLs, which would miss the script
+        prefix of the web request when rendered in the task.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("esistatus.fragments.store_fragment") as mock_store:
+            prerender_fragments(
+                version="abc",
+                context={
+                    "esi_endpoint_status": {
+                        "Down": {"count": 1, "percentage": "100.00%", "tags": ["Wars"]}
+                    },
+                    "total_endpoints": 1,
+                },
+            )
+
+        html = {
+            call.kwargs["fragment"]: call.kwargs["html"]
+            for call in mock_store.call_args_list
+        }
+
+        self.assertEqual(set(html), set(EsiStatusFragment))
+
+        for fragment, fragment_html in html.items():
+            with self.subTest(fragment=fragment):
+                self.assertNotIn('href="/', fragment_html)
+
+        self.assertIn(
+            'data-esistatus-routes-status="Down"', html[EsiStatusFragment.INDEX]
+        )
+        self.assertIn('data-esistatus-routes-tag="Wars"', html[EsiStatusFragment.INDEX])
+        self.assertIn(
+            "data-esistatus-index-link", html[EsiStatusFragment.DASHBOARD_WIDGET]
+        )
@@ -0,0 +1,106 @@
+"""
+Test the management commands
+"""
+
+# Standard Library
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+# Django
+from django.core.management import CommandError, call_command
+
+# AA ESI Status
+from esistatus.models import EsiRoute
+from esistatus.providers.esi_meta import EsiMetaClient
+from esistatus.tests import BaseTestCase
+
+
+class TestEsistatusBenchmark(BaseTestCase):
+    """
+    Test the esistatus_benchmark management command
+    """
+
+    def test_reports_all_benchmarks_and_rolls_back(self):
+        """
+        Test that all benchmarks are reported, written to the output file, and
+        that nothing is left in the database
+
+        :return:
+        :rtype:
+        """
+
+        stdout = StringIO()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir) / "baseline.json"
+
+            call_command("esistatus_benchmark", rounds=1, output=output, stdout=stdout)
+
+            report = json.loads(output.read_text())
+
+        self.assertEqual(
+            list(report["results"]),
+            [
+                "_enrich_status_json",
+                "_esi_endpoint_status_from_json",
+                "update_esi_status",
+                "ajax_esi_status (render)",
+                "ajax_esi_status (cached)",
+                "ajax_dashboard_widget (render)",
+                "ajax_dashboard_widget (cached)",
+            ],
+        )
+        self.assertEqual(report["rounds"], 1)
+        self.assertGreater(report["results"]["update_esi_status"]["queries"], 0)
+        self.assertGreater(report["results"]["update_esi_status"]["peak_kib"], 0)
+        self.assertIn("update_esi_status", stdout.getvalue())
+        self.assertFalse(EsiRoute.objects.exists())
+        self.assertIsNone(EsiMetaClient._session)
+
+    def test_compares_with_baseline(self):
+        """
+        Test that the results are compared with a baseline
+
+        :return:
+        :rtype:
+        """
+
+        stdout = StringIO()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            baseline = Path(tmp_dir) / "baseline.json"
+            baseline.write_text(
+                json.dumps(
+                    {
+                        "app_version": "1.0.0",
+                        "created": "2026-01-01T00:00:00+00:00",
+                        "size": 1,
+                        "results": {
+                            "update_esi_status": {"median_ms": 1, "peak_kib": 1}
+                        },
+                    }
+                )
+            )
+
+            call_command(
+                "esistatus_benchmark", rounds=1, baseline=baseline, stdout=stdout
+            )
+
+        self.assertIn("Δ median", stdout.getvalue())
+        self.assertIn("Baseline: 1.0.0", stdout.getvalue())
+
+    def test_rejects_invalid_arguments(self):
+        """
+        Test that invalid rounds and an unreadable baseline are rejected
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(CommandError):
+            call_command("esistatus_benchmark", rounds=0)
+
+        with self.assertRaises(CommandError):
+            call_command("esistatus_benchmark", baseline="/nonexistent/baseline.json")
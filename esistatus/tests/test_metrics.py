@@ -0,0 +1,320 @@
+"""
+Test the metrics of the ESI status update
+"""
+
+# Standard Library
+from http import HTTPStatus
+from unittest import mock
+
+# Django
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+
+# AA ESI Status
+from esistatus.constants import ESIMetaUrl, UpdateResult, UpdateStage
+from esistatus.metrics import (
+    CACHE_REQUESTS,
+    ESI_REQUESTS,
+    UPDATE_RUNS,
+    UPDATE_STAGE_DURATION,
+    cache_kind_label,
+    esi_endpoint_label,
+    render_metrics,
+    update_stage,
+)
+from esistatus.providers.cache import Cache
+from esistatus.providers.esi_meta import EsiMetaClient
+from esistatus.tasks import update_esi_status
+from esistatus.tests import BaseTestCase
+from esistatus.tests.utils import LOCMEM_CACHES, create_fake_user, random_id
+from esistatus.views import metrics
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ESISTATUS_METRICS=True)
+class TestMetrics(BaseTestCase):
+    """
+    Test recording and rendering the metrics
+    """
+
+    def setUp(self):
+        """
+        Start each test with empty metrics
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_counts_and_renders_counter(self):
+        """
+        Test that a counter is incremented and rendered with its labels
+
+        :return:
+        :rtype:
+        """
+
+        UPDATE_RUNS.inc(result=UpdateResult.UPDATED.value)
+        UPDATE_RUNS.inc(result=UpdateResult.UPDATED.value)
+
+        output = render_metrics()
+
+        self.assertIn("# TYPE esistatus_update_runs_total counter", output)
+        self.assertIn('esistatus_update_runs_total{result="updated"} 2', output)
+        # Series without a value are left out
+        self.assertNotIn('esistatus_update_runs_total{result="failed"}', output)
+
+    def test_observes_summary_in_seconds(self):
+        """
+        Test that a summary keeps the sum and count of the durations
+
+        :return:
+        :rtype:
+        """
+
+        UPDATE_STAGE_DURATION.observe(seconds=0.25, stage=UpdateStage.FETCH.value)
+        UPDATE_STAGE_DURATION.observe(seconds=0.5, stage=UpdateStage.FETCH.value)
+
+        output = render_metrics()
+
+        self.assertIn(
+            'esistatus_update_stage_duration_seconds_sum{stage="fetch"} 0.75', output
+        )
+        self.assertIn(
+            'esistatus_update_stage_duration_seconds_count{stage="fetch"} 2', output
+        )
+
+    def test_update_stage_records_timings(self):
+        """
+        Test that a timed stage ends up in the timings and the metrics
+
+        :return:
+        :rtype:
+        """
+
+        timings = {}
+
+        with update_stage(stage=UpdateStage.ENRICH, timings=timings):
+            pass
+
+        self.assertIn("enrich", timings)
+        self.assertIn(
+            'esistatus_update_stage_last_duration_seconds{stage="enrich"}',
+            render_metrics(),
+        )
+
+    def test_counts_cache_hits_and_misses(self):
+        """
+        Test that cache lookups are counted per subkey
+
+        :return:
+        :rtype:
+        """
+
+        Cache(subkey="name").get()
+        Cache(subkey="name").set(value="Tranquility")
+        Cache(subkey="name").get()
+
+        output = render_metrics()
+
+        self.assertIn(
+            'esistatus_cache_requests_total{subkey="name",result="miss"} 1', output
+        )
+        self.assertIn(
+            'esistatus_cache_requests_total{subkey="name",result="hit"} 1', output
+        )
+
+    @override_settings(
+        ESISTATUS_HTTP_TRANSPORT="esistatus.providers.esi_stub.EsiStubAdapter"
+    )
+    def test_counts_esi_requests(self):
+        """
+        Test that ESI requests are counted and sized per endpoint
+
+        :return:
+        :rtype:
+        """
+
+        EsiMetaClient.reset_session()
+
+        try:
+            etag = EsiMetaClient.get(url=ESIMetaUrl.NAME.url).headers["ETag"]
+            EsiMetaClient.get(url=ESIMetaUrl.NAME.url, headers={"If-None-Match": etag})
+        finally:
+            EsiMetaClient.reset_session()
+
+        output = render_metrics()
+
+        self.assertIn(
+            'esistatus_esi_requests_total{endpoint="name",outcome="ok"} 1', output
+        )
+        self.assertIn(
+            'esistatus_esi_requests_total{endpoint="name",outcome="not_modified"} 1',
+            output,
+        )
+        self.assertIn('esistatus_esi_response_size_bytes{endpoint="name"}', output)
+
+    def test_counts_update_runs(self):
+        """
+        Test that the update task counts its result and times its stages
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch(
+            "esistatus.tasks._get_latest_compatibility_date", return_value=None
+        ):
+            update_esi_status()
+
+        output = render_metrics()
+
+        self.assertIn('esistatus_update_runs_total{result="failed"} 1', output)
+        self.assertIn(
+            'esistatus_update_stage_duration_seconds_count{stage="total"} 1', output
+        )
+        self.assertIn("esistatus_update_last_run_timestamp_seconds ", output)
+
+    @override_settings(ESISTATUS_METRICS=False)
+    def test_records_nothing_when_disabled(self):
+        """
+        Test that nothing is written to the cache with the metrics disabled
+
+        :return:
+        :rtype:
+        """
+
+        ESI_REQUESTS.inc(endpoint="status", outcome="ok")
+        CACHE_REQUESTS.inc(subkey="status", result="hit")
+
+        self.assertNotIn("esistatus_esi_requests_total{", render_metrics())
+
+
+class TestMetricLabels(BaseTestCase):
+    """
+    Test the label helpers
+    """
+
+    def test_esi_endpoint_label(self):
+        """
+        Test that URLs are mapped to their ESI meta endpoint
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(esi_endpoint_label(url=ESIMetaUrl.STATUS.url), "status")
+        self.assertEqual(
+            esi_endpoint_label(url="https://esi.evetech.net/alliances"), "other"
+        )
+
+    def test_cache_kind_label(self):
+        """
+        Test that cache subkeys are mapped to their first segment
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(cache_kind_label(subkey="status:2025-11-06"), "status")
+        self.assertEqual(cache_kind_label(subkey="something"), "other")
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ESISTATUS_METRICS=True)
+class TestMetricsView(BaseTestCase):
+    """
+    Test the metrics view
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Set up the users
+
+        :return:
+        :rtype:
+        """
+
+        super().setUpClass()
+
+        cls.user = create_fake_user(
+            character_id=random_id(), character_name="Peter Parker"
+        )
+        cls.superuser = create_fake_user(
+            character_id=random_id(), character_name="Clark Kent"
+        )
+        cls.superuser.is_superuser = True
+        cls.superuser.save()
+
+    @override_settings(ESISTATUS_METRICS=False)
+    def test_returns_404_when_disabled(self):
+        """
+        Test that the view doesn't exist with the metrics disabled
+
+        :return:
+        :rtype:
+        """
+
+        response = self.client.get(path="/esi-status/-/metrics/")
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_forbids_regular_users(self):
+        """
+        Test that users who aren't superusers are forbidden
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(user=self.user)
+
+        response = self.client.get(path="/esi-status/-/metrics/")
+
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+    def test_allows_superusers(self):
+        """
+        Test that superusers can read the metrics
+
+        :return:
+        :rtype:
+        """
+
+        self.client.force_login(user=self.superuser)
+
+        response = self.client.get(path="/esi-status/-/metrics/")
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertContains(response, "# TYPE esistatus_update_runs_total counter")
+
+    @override_settings(ESISTATUS_METRICS_TOKEN="s3cr3t")
+    def test_allows_bearer_token(self):
+        """
+        Test that the metrics can be read with the configured token
+
+        :return:
+        :rtype:
+        """
+
+        response = metrics(
+            request=RequestFactory().get("/", HTTP_AUTHORIZATION="Bearer s3cr3t")
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    @override_settings(ESISTATUS_METRICS_TOKEN="s3cr3t")
+    def test_forbids_wrong_bearer_token(self):
+        """
+        Test that a wrong token is forbidden
+
+        :return:
+        :rtype:
+        """
+
+        response = self.client.get(
+            path="/esi-status/-/metrics/", HTTP_AUTHORIZATION="Bearer wrong"
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
@@ -4,10 +4,11 @@ Test for the providers module.
 
 # Standard Library
 import logging
+from unittest import mock
 
 # AA ESI Status
 from esistatus import __title__
-from esistatus.providers.applogger import AppLogger
+from esistatus.providers.applogger import AppLogger, LazyArg
 from esistatus.tests import BaseTestCase
 
 
@@ -47,3 +48,41 @@ class TestAppLogger(BaseTestCase):
             app_logger.info("")
 
         self.assertIn(f"[{__title__}] ", log.output[0])
+
+    def test_formats_arguments_lazily(self):
+        """
+        Tests that %-style arguments are formatted into the prefixed message.
+
+        :return:
+        :rtype:
+        """
+
+        logger = logging.getLogger("test_logger")
+        app_logger = AppLogger(logger)
+
+        with self.assertLogs("test_logger", level="INFO") as log:
+            app_logger.info("Pruned %s change(s) (%.1f%%)", 3, 12.5)
+
+        self.assertIn(f"[{__title__}] Pruned 3 change(s) (12.5%)", log.output[0])
+
+    def test_does_not_compute_arguments_when_disabled(self):
+        """
+        Tests that arguments of a disabled log level are never computed.
+
+        :return:
+        :rtype:
+        """
+
+        logger = logging.getLogger("test_logger")
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.INFO)
+        app_logger = AppLogger(logger)
+        func = mock.Mock(return_value="expensive")
+
+        with self.assertLogs("test_logger", level="INFO") as log:
+            app_logger.debug("Value: %s", LazyArg(func))
+            app_logger.info("Value: %s", LazyArg(func))
+
+        func.assert_called_once_with()
+        self.assertEqual(len(log.output), 1)
+        self.assertIn(f"[{__title__}] Value: expensive", log.output[0])
@@ -2,9 +2,19 @@
 import datetime
 from unittest import mock
 
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+
 # AA ESI Status
-from esistatus.providers.cache import Cache
+from esistatus.providers.cache import (
+    NOT_MODIFIED,
+    Cache,
+    CacheEntry,
+    CompressedValue,
+)
 from esistatus.tests import BaseTestCase
+from esistatus.tests.utils import LOCMEM_CACHES
 
 
 class TestCacheClassInit(BaseTestCase):
@@ -129,6 +139,7 @@ class TestCacheSet(BaseTestCase):
     Test the Cache.set function.
     """
 
+    @override_settings(ESISTATUS_CACHE_STALE_TTL=600, ESISTATUS_CACHE_EXPIRY_JITTER=0)
     def test_sets_cache_value_with_correct_key_and_timeout(self):
         """
         Test that the function sets the cache value with the correct key and timeout.
@@ -145,13 +156,34 @@ class TestCacheSet(BaseTestCase):
         with (
             mock.patch("django.core.cache.cache.set") as mock_set,
             mock.patch.object(Cache, "_get_max_cache_time", return_value=mock_timeout),
+            mock.patch("esistatus.providers.cache.time.time", return_value=1000.0),
         ):
             cache_instance.set(mock_value)
 
             mock_set.assert_called_once_with(
-                key=mock_cache_key, value=mock_value, timeout=mock_timeout
+                key=mock_cache_key, value=mock.ANY, timeout=mock_timeout + 600
             )
 
+            entry = mock_set.call_args.kwargs["value"]
+
+            self.assertIsInstance(entry, CacheEntry)
+            self.assertEqual(entry.value, mock_value)
+            self.assertEqual(entry.fresh_until, 1000.0 + mock_timeout)
+
+    @override_settings(ESISTATUS_CACHE_STALE_TTL=600, ESISTATUS_CACHE_EXPIRY_JITTER=300)
+    def test_spreads_expiry_with_jitter(self):
+        """
+        Test that the expiry of a value is spread by the configured jitter.
+
+        :return:
+        :rtype:
+        """
+
+        timeouts = {Cache._get_expiry_time(fresh_time=3600) for _ in range(50)}
+
+        self.assertTrue(all(4200 <= timeout <= 4500 for timeout in timeouts))
+        self.assertGreater(len(timeouts), 1)
+
     def test_raises_type_error_when_subkey_is_not_string(self):
         """
         Test that providing a non-string subkey raises a TypeError.
@@ -175,6 +207,378 @@ class TestCacheSet(BaseTestCase):
             Cache(subkey="   ")
 
 
+class TestCacheCompression(BaseTestCase):
+    """
+    Test the optional compression of cache values.
+    """
+
+    large_value = {
+        "paths": {f"/path/{i}/": {"get": {"tags": ["tag"]}} for i in range(500)}
+    }
+
+    @override_settings(ESISTATUS_CACHE_COMPRESSION=False)
+    def test_stores_value_uncompressed_when_disabled(self):
+        """
+        Test that values are stored as they are when compression is disabled.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("django.core.cache.cache.set") as mock_set:
+            Cache(subkey="test_key").set(self.large_value)
+
+            self.assertEqual(mock_set.call_args.kwargs["value"].value, self.large_value)
+
+    @override_settings(
+        ESISTATUS_CACHE_COMPRESSION=True, ESISTATUS_CACHE_COMPRESSION_THRESHOLD=4096
+    )
+    def test_stores_small_value_uncompressed(self):
+        """
+        Test that values below the threshold are stored as they are.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("django.core.cache.cache.set") as mock_set:
+            Cache(subkey="test_key").set("small")
+
+            self.assertEqual(mock_set.call_args.kwargs["value"].value, "small")
+
+    @override_settings(
+        ESISTATUS_CACHE_COMPRESSION=True, ESISTATUS_CACHE_COMPRESSION_THRESHOLD=4096
+    )
+    def test_compresses_large_value_and_decompresses_on_get(self):
+        """
+        Test that large values are stored compressed and returned decompressed.
+
+        :return:
+        :rtype:
+        """
+
+        cache_instance = Cache(subkey="test_key")
+
+        with (
+            mock.patch("django.core.cache.cache.set") as mock_set,
+            mock.patch("esistatus.providers.cache.logger") as mock_logger,
+        ):
+            mock_logger.isEnabledFor.return_value = True
+
+            cache_instance.set(self.large_value)
+
+            stored = mock_set.call_args.kwargs["value"]
+
+            self.assertIsInstance(stored.value, CompressedValue)
+            self.assertIn(
+                "ratio",
+                " ".join(str(call.args[0]) for call in mock_logger.debug.mock_calls),
+            )
+
+        with mock.patch("django.core.cache.cache.get", return_value=stored):
+            self.assertEqual(cache_instance.get(), self.large_value)
+
+
+class TestCacheValidators(BaseTestCase):
+    """
+    Test the HTTP validator handling of the Cache class.
+    """
+
+    @override_settings(ESISTATUS_CACHE_STALE_TTL=600, ESISTATUS_CACHE_EXPIRY_JITTER=0)
+    def test_stores_validators_next_to_value(self):
+        """
+        Test that validators passed to set are stored under their own key, and kept
+        as long as the value.
+
+        :return:
+        :rtype:
+        """
+
+        cache_instance = Cache(subkey="test_key")
+        validators = {"etag": '"abc"'}
+
+        with (
+            mock.patch("django.core.cache.cache.set") as mock_set,
+            mock.patch.object(Cache, "_get_max_cache_time", return_value=3600),
+        ):
+            cache_instance.set("test_value", validators=validators)
+
+            mock_set.assert_any_call(
+                key="esi:meta:test_key", value=mock.ANY, timeout=4200
+            )
+            mock_set.assert_any_call(
+                key="esi:meta:test_key:validators", value=validators, timeout=4200
+            )
+
+    def test_does_not_store_empty_validators(self):
+        """
+        Test that no validators key is written when there are no validators.
+
+        :return:
+        :rtype:
+        """
+
+        cache_instance = Cache(subkey="test_key")
+
+        with mock.patch("django.core.cache.cache.set") as mock_set:
+            cache_instance.set("test_value", validators={})
+
+            mock_set.assert_called_once()
+
+    def test_returns_empty_dict_when_no_validators_are_cached(self):
+        """
+        Test that get_validators returns an empty dict on a cache miss.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("django.core.cache.cache.get", return_value=None) as mock_get:
+            result = Cache(subkey="test_key").get_validators()
+
+            mock_get.assert_called_once_with(
+                key="esi:meta:test_key:validators", default=None
+            )
+            self.assertEqual(result, {})
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestCacheLock(BaseTestCase):
+    """
+    Test the Cache.lock function.
+    """
+
+    def test_acquires_lock_once(self):
+        """
+        Test that only the first caller acquires the lock, until it is released.
+
+        :return:
+        :rtype:
+        """
+
+        with Cache(subkey="test_lock").lock(timeout=60) as first:
+            with Cache(subkey="test_lock").lock(timeout=60) as second:
+                self.assertTrue(first)
+                self.assertFalse(second)
+
+        with Cache(subkey="test_lock").lock(timeout=60) as third:
+            self.assertTrue(third)
+
+    def test_does_not_release_lock_of_another_process(self):
+        """
+        Test that an expired lock taken over by another process is left alone.
+
+        :return:
+        :rtype:
+        """
+
+        cache_instance = Cache(subkey="test_lock")
+
+        with (
+            mock.patch("django.core.cache.cache.add", return_value=True),
+            mock.patch("django.core.cache.cache.get", return_value="other-token"),
+            mock.patch("django.core.cache.cache.delete") as mock_delete,
+        ):
+            with cache_instance.lock(timeout=60) as acquired:
+                self.assertTrue(acquired)
+
+        mock_delete.assert_not_called()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TestCacheGetOrSet(BaseTestCase):
+    """
+    Test the Cache.get_or_set function.
+    """
+
+    def setUp(self):
+        """
+        Start each test with an empty cache.
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+        self.cache_instance = Cache(subkey="test_single_flight")
+
+    def tearDown(self):
+        """
+        Clean up the cache.
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_returns_cached_value_without_computing_it(self):
+        """
+        Test that a cached value is returned as it is.
+
+        :return:
+        :rtype:
+        """
+
+        self.cache_instance.set(value="cached")
+        default = mock.Mock()
+
+        self.assertEqual(self.cache_instance.get_or_set(default=default), "cached")
+        default.assert_not_called()
+
+    def test_computes_and_caches_missing_value(self):
+        """
+        Test that a missing value is computed once and cached with its validators.
+
+        :return:
+        :rtype:
+        """
+
+        default = mock.Mock(return_value=("fresh", {"etag": '"v1"'}))
+
+        self.assertEqual(self.cache_instance.get_or_set(default=default), "fresh")
+        self.assertEqual(self.cache_instance.get_or_set(default=default), "fresh")
+        default.assert_called_once_with(validators={})
+        self.assertEqual(self.cache_instance.get_validators(), {"etag": '"v1"'})
+
+    def test_does_not_cache_none(self):
+        """
+        Test that a failed computation isn't cached.
+
+        :return:
+        :rtype:
+        """
+
+        default = mock.Mock(return_value=(None, None))
+
+        self.assertIsNone(self.cache_instance.get_or_set(default=default))
+        self.assertFalse(self.cache_instance.get())
+
+    def test_waits_for_value_computed_by_lock_holder(self):
+        """
+        Test that a caller waits for the value while another one computes it.
+
+        :return:
+        :rtype:
+        """
+
+        default = mock.Mock(return_value=("own", None))
+
+        with (
+            self.cache_instance.lock(timeout=60),
+            mock.patch(
+                "esistatus.providers.cache.time.sleep",
+                side_effect=lambda _: self.cache_instance.set(value="shared"),
+            ),
+        ):
+            result = self.cache_instance.get_or_set(default=default)
+
+        self.assertEqual(result, "shared")
+        default.assert_not_called()
+
+    @override_settings(ESISTATUS_CACHE_LOCK_TIMEOUT=0)
+    def test_computes_value_itself_after_waiting_too_long(self):
+        """
+        Test that a caller computes the value itself when the lock holder takes too long.
+
+        :return:
+        :rtype:
+        """
+
+        default = mock.Mock(return_value=("own", None))
+
+        with self.cache_instance.lock(timeout=60):
+            result = self.cache_instance.get_or_set(default=default)
+
+        self.assertEqual(result, "own")
+        default.assert_called_once_with(validators={})
+
+    def _expire(self) -> None:
+        """
+        Make the cached value stale.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch.object(Cache, "_get_max_cache_time", return_value=-1):
+            self.cache_instance.set(
+                value=self.cache_instance.get(),
+                validators=self.cache_instance.get_validators(),
+            )
+
+    def test_returns_stale_value_and_refreshes_it_in_background(self):
+        """
+        Test that a stale value is returned right away and refreshed in the background.
+
+        :return:
+        :rtype:
+        """
+
+        self.cache_instance.set(value="stale", validators={"etag": '"v1"'})
+        self._expire()
+
+        default = mock.Mock(return_value=("fresh", {"etag": '"v2"'}))
+
+        with mock.patch("esistatus.providers.cache.threading.Thread") as mock_thread:
+            result = self.cache_instance.get_or_set(default=default)
+
+            self.assertEqual(result, "stale")
+            default.assert_not_called()
+
+            # Run the background refresh
+            mock_thread.call_args.kwargs["target"]()
+
+        default.assert_called_once_with(validators={"etag": '"v1"'})
+        self.assertEqual(self.cache_instance._get_entry(), ("fresh", True))
+        self.assertEqual(self.cache_instance.get_validators(), {"etag": '"v2"'})
+
+    def test_revalidates_stale_value(self):
+        """
+        Test that a stale value that is unchanged at its source is kept and fresh again.
+
+        :return:
+        :rtype:
+        """
+
+        self.cache_instance.set(value="stale", validators={"etag": '"v1"'})
+        self._expire()
+
+        default = mock.Mock(return_value=(NOT_MODIFIED, {}))
+
+        with mock.patch("esistatus.providers.cache.threading.Thread") as mock_thread:
+            self.cache_instance.get_or_set(default=default)
+
+            mock_thread.call_args.kwargs["target"]()
+
+        self.assertEqual(self.cache_instance._get_entry(), ("stale", True))
+        self.assertEqual(self.cache_instance.get_validators(), {"etag": '"v1"'})
+
+    def test_skips_refresh_while_another_process_refreshes(self):
+        """
+        Test that only one process refreshes a stale value.
+
+        :return:
+        :rtype:
+        """
+
+        self.cache_instance.set(value="stale")
+        self._expire()
+
+        default = mock.Mock(return_value=("fresh", None))
+
+        with (
+            self.cache_instance.lock(timeout=60),
+            mock.patch("esistatus.providers.cache.threading.Thread") as mock_thread,
+        ):
+            self.assertEqual(self.cache_instance.get_or_set(default=default), "stale")
+
+            mock_thread.call_args.kwargs["target"]()
+
+        default.assert_not_called()
+
+
 class TestCacheHelperGetCacheKey(BaseTestCase):
     """
     Test the Cache._get_cache_key function.
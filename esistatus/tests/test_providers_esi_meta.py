@@ -0,0 +1,118 @@
+"""
+Test the ESI meta client provider
+"""
+
+# Standard Library
+from unittest import mock
+
+# Django
+from django.test import override_settings
+
+# AA ESI Status
+from esistatus import __user_agent__
+from esistatus.providers.esi_meta import EsiMetaClient
+from esistatus.tests import BaseTestCase
+
+
+class TestEsiMetaClient(BaseTestCase):
+    """
+    Test the EsiMetaClient provider
+    """
+
+    def setUp(self):
+        """
+        Reset the per-process session before each test
+
+        :return:
+        :rtype:
+        """
+
+        EsiMetaClient._session = None
+        EsiMetaClient._session_pid = None
+
+    def tearDown(self):
+        """
+        Reset the per-process session after each test
+
+        :return:
+        :rtype:
+        """
+
+        EsiMetaClient._session = None
+        EsiMetaClient._session_pid = None
+
+    def test_reuses_session_within_the_same_process(self):
+        """
+        Test that the session is created once per process
+
+        :return:
+        :rtype:
+        """
+
+        first = EsiMetaClient.session()
+        second = EsiMetaClient.session()
+
+        self.assertIs(first, second)
+
+    def test_creates_new_session_after_fork(self):
+        """
+        Test that a session created in another process is not reused
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("esistatus.providers.esi_meta.os.getpid", return_value=1):
+            parent_session = EsiMetaClient.session()
+
+        with mock.patch("esistatus.providers.esi_meta.os.getpid", return_value=2):
+            child_session = EsiMetaClient.session()
+
+        self.assertIsNot(parent_session, child_session)
+
+    def test_session_sends_user_agent(self):
+        """
+        Test that the session sends the app's User-Agent
+
+        :return:
+        :rtype:
+        """
+
+        session = EsiMetaClient.session()
+
+        self.assertEqual(session.headers["User-Agent"], __user_agent__)
+
+    @override_settings(
+        ESISTATUS_HTTP_POOL_SIZE=8,
+        ESISTATUS_HTTP_MAX_RETRIES=5,
+        ESISTATUS_HTTP_BACKOFF_FACTOR=1.5,
+    )
+    def test_session_uses_configured_pool_and_retries(self):
+        """
+        Test that the session adapter uses the configured pool size and retries
+
+        :return:
+        :rtype:
+        """
+
+        adapter = EsiMetaClient.session().get_adapter(url="https://esi.evetech.net/")
+
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertEqual(adapter.max_retries.total, 5)
+        self.assertEqual(adapter.max_retries.backoff_factor, 1.5)
+
+    @override_settings(ESISTATUS_HTTP_CONNECT_TIMEOUT=2, ESISTATUS_HTTP_READ_TIMEOUT=7)
+    def test_get_uses_configured_timeout(self):
+        """
+        Test that get passes the configured timeouts to the session
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch.object(EsiMetaClient, "session") as mock_session:
+            EsiMetaClient.get(url="https://esi.evetech.net/meta/status", headers={})
+
+            mock_session.return_value.get.assert_called_once_with(
+                url="https://esi.evetech.net/meta/status", headers={}, timeout=(2, 7)
+            )
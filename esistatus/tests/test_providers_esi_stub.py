@@ -0,0 +1,225 @@
+"""
+Test the ESI stand-in transport provider
+"""
+
+# Standard Library
+from http import HTTPStatus
+from unittest import mock
+
+# Third Party
+import requests
+
+# Django
+from django.test import override_settings
+
+# AA ESI Status
+from esistatus.constants import ESIMetaUrl, UpdateResult
+from esistatus.models import EsiRoute
+from esistatus.providers.esi_meta import EsiMetaClient
+from esistatus.providers.esi_stub import EsiStubAdapter
+from esistatus.tasks import update_esi_status
+from esistatus.tests import BaseTestCase
+from esistatus.tests.utils import LOCMEM_CACHES
+
+
+def _session(adapter: EsiStubAdapter) -> requests.Session:
+    """
+    Get a session with the stub adapter mounted
+
+    :param adapter:
+    :type adapter:
+    :return:
+    :rtype:
+    """
+
+    session = requests.Session()
+    session.mount(prefix="https://", adapter=adapter)
+
+    return session
+
+
+class TestEsiStubAdapter(BaseTestCase):
+    """
+    Test the EsiStubAdapter provider
+    """
+
+    def test_serves_payloads_of_the_meta_endpoints(self):
+        """
+        Test that each ESI meta endpoint is answered from its payload
+
+        :return:
+        :rtype:
+        """
+
+        session = _session(adapter=EsiStubAdapter())
+
+        status = session.get(url=ESIMetaUrl.STATUS.url)
+        dates = session.get(url=ESIMetaUrl.COMPATIBILITY_DATES.url)
+        names = session.get(url=ESIMetaUrl.NAME.url)
+        specs = session.get(url=ESIMetaUrl.OPENAPI_SPECS.url, stream=True)
+
+        self.assertEqual(status.status_code, HTTPStatus.OK)
+        self.assertEqual(len(status.json()["routes"]), 203)
+        self.assertIn("2025-11-06", dates.json()["compatibility_dates"])
+        self.assertTrue(names.json()["history"])
+        self.assertIn("/alliances", specs.json()["paths"])
+        self.assertIn("ETag", status.headers)
+
+    def test_answers_unknown_path_with_not_found(self):
+        """
+        Test that a path that isn't an ESI meta endpoint is answered with 404
+
+        :return:
+        :rtype:
+        """
+
+        response = _session(adapter=EsiStubAdapter()).get(
+            url="https://esi.evetech.net/alliances"
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_answers_matching_etag_with_not_modified(self):
+        """
+        Test that a conditional request with the current ETag is answered with 304
+
+        :return:
+        :rtype:
+        """
+
+        session = _session(adapter=EsiStubAdapter())
+        etag = session.get(url=ESIMetaUrl.STATUS.url).headers["ETag"]
+
+        response = session.get(
+            url=ESIMetaUrl.STATUS.url, headers={"If-None-Match": etag}
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_simulates_errors(self):
+        """
+        Test that the configured share of requests is answered with an error
+
+        :return:
+        :rtype:
+        """
+
+        session = _session(
+            adapter=EsiStubAdapter(error_rate=1, error_status=HTTPStatus.BAD_GATEWAY)
+        )
+
+        response = session.get(url=ESIMetaUrl.STATUS.url)
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_GATEWAY)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            response.raise_for_status()
+
+    def test_simulates_latency(self):
+        """
+        Test that each response is delayed by the configured latency
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("esistatus.providers.esi_stub.time.sleep") as mock_sleep:
+            _session(adapter=EsiStubAdapter(latency=0.25)).get(url=ESIMetaUrl.NAME.url)
+
+        mock_sleep.assert_called_once_with(0.25)
+
+    def test_scales_status_and_specs(self):
+        """
+        Test that the ESI status and OpenAPI specs are scaled up consistently
+
+        :return:
+        :rtype:
+        """
+
+        session = _session(adapter=EsiStubAdapter(size=3))
+
+        routes = session.get(url=ESIMetaUrl.STATUS.url).json()["routes"]
+        paths = session.get(url=ESIMetaUrl.OPENAPI_SPECS.url).json()["paths"]
+
+        self.assertEqual(len(routes), 203 * 3)
+        self.assertIn("/stub-2/alliances", {route["path"] for route in routes})
+        self.assertIn("/stub-2/alliances", paths)
+
+    @override_settings(ESISTATUS_ESI_BASE_URL="http://esi.localhost:8080/")
+    def test_follows_configured_base_url(self):
+        """
+        Test that the ESI meta endpoint URLs use the configured base URL
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(ESIMetaUrl.STATUS.url, "http://esi.localhost:8080/meta/status")
+
+        session = requests.Session()
+        session.mount(prefix="http://", adapter=EsiStubAdapter())
+
+        self.assertEqual(
+            session.get(url=ESIMetaUrl.STATUS.url).status_code, HTTPStatus.OK
+        )
+
+
+class TestEsiMetaClientTransport(BaseTestCase):
+    """
+    Test the configurable transport of the EsiMetaClient provider
+    """
+
+    def tearDown(self):
+        """
+        Reset the per-process session after each test
+
+        :return:
+        :rtype:
+        """
+
+        EsiMetaClient._session = None
+        EsiMetaClient._session_pid = None
+
+    @override_settings(
+        ESISTATUS_HTTP_TRANSPORT="esistatus.providers.esi_stub.EsiStubAdapter",
+        ESISTATUS_HTTP_TRANSPORT_OPTIONS={"latency": 0.1, "size": 2},
+    )
+    def test_mounts_configured_transport(self):
+        """
+        Test that the configured transport is mounted with its options
+
+        :return:
+        :rtype:
+        """
+
+        EsiMetaClient._session = None
+
+        adapter = EsiMetaClient.session().get_adapter(url=ESIMetaUrl.STATUS.url)
+
+        self.assertIsInstance(adapter, EsiStubAdapter)
+        self.assertEqual(adapter.latency, 0.1)
+        self.assertEqual(adapter.size, 2)
+
+    @override_settings(
+        CACHES=LOCMEM_CACHES,
+        ESISTATUS_HTTP_TRANSPORT="esistatus.providers.esi_stub.EsiStubAdapter",
+    )
+    def test_runs_update_pipeline_offline(self):
+        """
+        Test that the update task runs against the stand-in without network access
+
+        :return:
+        :rtype:
+        """
+
+        EsiMetaClient._session = None
+
+        with (
+            mock.patch("esistatus.tasks._stored_esi_status", return_value=(None, None)),
+            mock.patch("esistatus.tasks.prerender_fragments"),
+        ):
+            result = update_esi_status()
+
+        self.assertEqual(result, UpdateResult.UPDATED.value)
+        self.assertEqual(EsiRoute.objects.count(), 203)
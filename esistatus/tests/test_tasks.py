@@ -1,24 +1,46 @@
 # Standard Library
+import datetime
 import json
+import threading
 from unittest import mock
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 # Third Party
 import requests
 
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
 # AA ESI Status
+from esistatus.changeset import Changeset, StatusTransition
+from esistatus.constants import UpdateResult
+from esistatus.models import EsiRoute, EsiRouteStatusChange, EsiStatus
+from esistatus.providers.cache import NOT_MODIFIED, Cache
+from esistatus.providers.esi_meta import EsiMetaClient
+from esistatus.signals import esi_status_changed
 from esistatus.tasks import (
+    ESI_NOT_MODIFIED,
     _append_value,
+    _build_openapi_operation_index,
     _enrich_status_json,
     _esi_endpoint_status_from_json,
+    _fetch_esi_meta_documents,
+    _fetch_esi_names_json,
     _get_esi_name_for_compatibility_date,
     _get_esi_names_json,
     _get_esi_status_json,
     _get_latest_compatibility_date,
-    _get_openapi_specs_json,
+    _get_openapi_operation_index,
+    _record_route_status_changes,
+    _status_fingerprint,
+    _sync_esi_routes,
+    prune_esi_status_history,
     update_esi_status,
 )
 from esistatus.tests import BaseTestCase
+from esistatus.tests.utils import LOCMEM_CACHES
 
 
 class TestHelperGetLatestCompatibilityDate(BaseTestCase):
@@ -50,7 +72,8 @@ class TestHelperGetLatestCompatibilityDate(BaseTestCase):
         """
 
         with mock.patch(
-            "esistatus.providers.cache.Cache.get", return_value=self.latest_date
+            "esistatus.providers.cache.Cache._get_entry",
+            return_value=(self.latest_date, True),
         ) as mock_cache:
             result = _get_latest_compatibility_date()
 
@@ -66,12 +89,15 @@ class TestHelperGetLatestCompatibilityDate(BaseTestCase):
         """
 
         mock_response = mock.Mock()
+        mock_response.headers = {}
         mock_response.json.return_value = self.compatibility_date_json
 
         with (
-            mock.patch("esistatus.providers.cache.Cache.get", return_value=None),
             mock.patch(
-                "esistatus.tasks.requests.get", return_value=mock_response
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            mock.patch(
+                "esistatus.tasks.EsiMetaClient.get", return_value=mock_response
             ) as mock_get,
             mock.patch("esistatus.providers.cache.Cache.set") as mock_set_cache,
         ):
@@ -79,7 +105,9 @@ class TestHelperGetLatestCompatibilityDate(BaseTestCase):
 
             self.assertEqual(result, self.latest_date)
             mock_get.assert_called_once()
-            mock_set_cache.assert_called_once_with(value=self.latest_date)
+            mock_set_cache.assert_called_once_with(
+                value=self.latest_date, validators={}
+            )
 
     def test_skips_invalid_dates_in_api_response(self):
         """
@@ -90,19 +118,22 @@ class TestHelperGetLatestCompatibilityDate(BaseTestCase):
         """
 
         mock_response = mock.Mock()
+        mock_response.headers = {}
         mock_response.json.return_value = {
             "compatibility_dates": ["invalid-date", "2023-10-01"]
         }
 
         with (
-            mock.patch("esistatus.providers.cache.Cache.get", return_value=None),
+            mock.patch(
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
             mock.patch("esistatus.providers.cache.Cache.set") as mock_set_cache,
-            mock.patch("esistatus.tasks.requests.get", return_value=mock_response),
+            mock.patch("esistatus.tasks.EsiMetaClient.get", return_value=mock_response),
         ):
             result = _get_latest_compatibility_date()
 
             self.assertEqual(result, "2023-10-01")
-            mock_set_cache.assert_called_once_with(value="2023-10-01")
+            mock_set_cache.assert_called_once_with(value="2023-10-01", validators={})
 
     def test_returns_none_when_no_valid_dates_found(self):
         """
@@ -116,8 +147,10 @@ class TestHelperGetLatestCompatibilityDate(BaseTestCase):
         mock_response.json.return_value = {"compatibility_dates": ["invalid-date"]}
 
         with (
-            mock.patch("esistatus.providers.cache.Cache.get", return_value=None),
-            mock.patch("esistatus.tasks.requests.get", return_value=mock_response),
+            mock.patch(
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            mock.patch("esistatus.tasks.EsiMetaClient.get", return_value=mock_response),
         ):
             result = _get_latest_compatibility_date()
 
@@ -132,9 +165,11 @@ class TestHelperGetLatestCompatibilityDate(BaseTestCase):
         """
 
         with (
-            mock.patch("esistatus.providers.cache.Cache.get", return_value=None),
             mock.patch(
-                "esistatus.tasks.requests.get",
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            mock.patch(
+                "esistatus.tasks.EsiMetaClient.get",
                 side_effect=requests.exceptions.RequestException,
             ),
         ):
@@ -151,19 +186,22 @@ class TestHelperGetLatestCompatibilityDate(BaseTestCase):
         """
 
         mock_response = mock.Mock()
+        mock_response.headers = {}
         mock_response.json.return_value = {
             "compatibility_dates": [123, None, "2023-10-01"]
         }
 
         with (
-            mock.patch("esistatus.providers.cache.Cache.get", return_value=None),
+            mock.patch(
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
             mock.patch("esistatus.providers.cache.Cache.set") as mock_set_cache,
-            mock.patch("esistatus.tasks.requests.get", return_value=mock_response),
+            mock.patch("esistatus.tasks.EsiMetaClient.get", return_value=mock_response),
         ):
             result = _get_latest_compatibility_date()
 
             self.assertEqual(result, "2023-10-01")
-            mock_set_cache.assert_called_once_with(value="2023-10-01")
+            mock_set_cache.assert_called_once_with(value="2023-10-01", validators={})
 
     def test_handles_empty_dates_list(self):
         """
@@ -177,8 +215,10 @@ class TestHelperGetLatestCompatibilityDate(BaseTestCase):
         mock_response.json.return_value = {"compatibility_dates": []}
 
         with (
-            mock.patch("esistatus.providers.cache.Cache.get", return_value=None),
-            mock.patch("esistatus.tasks.requests.get", return_value=mock_response),
+            mock.patch(
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            mock.patch("esistatus.tasks.EsiMetaClient.get", return_value=mock_response),
         ):
             result = _get_latest_compatibility_date()
 
@@ -196,8 +236,10 @@ class TestHelperGetLatestCompatibilityDate(BaseTestCase):
         mock_response.json.side_effect = json.JSONDecodeError("Expecting value", "", 0)
 
         with (
-            mock.patch("esistatus.providers.cache.Cache.get", return_value=None),
-            mock.patch("esistatus.tasks.requests.get", return_value=mock_response),
+            mock.patch(
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            mock.patch("esistatus.tasks.EsiMetaClient.get", return_value=mock_response),
         ):
             result = _get_latest_compatibility_date()
 
@@ -218,21 +260,111 @@ class TestHelperGetESIStatusJson(BaseTestCase):
         """
 
         with (
-            patch("esistatus.tasks.requests.get") as mock_get,
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
+            patch("esistatus.tasks.Cache.get_validators", return_value={}),
+            patch("esistatus.tasks.Cache.set_validators") as mock_set_validators,
             patch("esistatus.tasks.logger.info") as mock_logger,
         ):
             mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.headers = {"ETag": '"v1"'}
             mock_response.json.return_value = {"status": "ok"}
             mock_response.raise_for_status = Mock()
             mock_get.return_value = mock_response
 
             result = _get_esi_status_json("2023-10-01")
 
-            self.assertEqual(result, {"status": "ok"})
+            self.assertEqual(result, ({"status": "ok"}, {"etag": '"v1"'}))
+            self.assertNotIn("If-None-Match", mock_get.call_args.kwargs["headers"])
+            # Stored by the caller once the status is written to the database
+            mock_set_validators.assert_not_called()
             mock_logger.assert_called_once_with(
-                "ESI status fetched successfully for for compatibility date: 2023-10-01."
+                "ESI status fetched successfully for for compatibility date: %s.",
+                "2023-10-01",
+            )
+
+    def test_sends_cached_validators_as_conditional_headers(self):
+        """
+        Test sending the cached validators as conditional request headers.
+
+        :return:
+        :rtype:
+        """
+
+        validators = {
+            "etag": '"v1"',
+            "last_modified": "Sun, 01 Oct 2023 11:00:00 GMT",
+        }
+
+        with (
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
+            patch("esistatus.tasks.Cache.get_validators", return_value=validators),
+            patch("esistatus.tasks.Cache.set_validators"),
+        ):
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.headers = {}
+            mock_response.json.return_value = {"status": "ok"}
+            mock_get.return_value = mock_response
+
+            _get_esi_status_json("2023-10-01")
+
+            headers = mock_get.call_args.kwargs["headers"]
+
+            self.assertEqual(headers["If-None-Match"], '"v1"')
+            self.assertEqual(
+                headers["If-Modified-Since"], "Sun, 01 Oct 2023 11:00:00 GMT"
             )
 
+    def test_skips_conditional_headers_without_revalidation(self):
+        """
+        Test not sending the cached validators when not revalidating.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
+            patch(
+                "esistatus.tasks.Cache.get_validators", return_value={"etag": '"v1"'}
+            ),
+        ):
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.headers = {}
+            mock_response.json.return_value = {"status": "ok"}
+            mock_get.return_value = mock_response
+
+            _get_esi_status_json("2023-10-01", revalidate=False)
+
+            self.assertNotIn("If-None-Match", mock_get.call_args.kwargs["headers"])
+
+    def test_returns_not_modified_sentinel_on_304(self):
+        """
+        Test returning the not-modified sentinel without decoding JSON on a 304.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
+            patch(
+                "esistatus.tasks.Cache.get_validators", return_value={"etag": '"v1"'}
+            ),
+            patch("esistatus.tasks.Cache.set_validators") as mock_set_validators,
+        ):
+            mock_response = Mock()
+            mock_response.status_code = 304
+            mock_get.return_value = mock_response
+
+            result, _ = _get_esi_status_json("2023-10-01")
+
+            self.assertIs(result, ESI_NOT_MODIFIED)
+            mock_response.json.assert_not_called()
+            mock_set_validators.assert_not_called()
+
     def test_handles_request_exception_and_logs_error(self):
         """
         Test handling a RequestException and logging the error.
@@ -242,17 +374,18 @@ class TestHelperGetESIStatusJson(BaseTestCase):
         """
 
         with (
+            patch("esistatus.tasks.Cache.get_validators", return_value={}),
             patch(
-                "esistatus.tasks.requests.get",
+                "esistatus.tasks.EsiMetaClient.get",
                 side_effect=requests.exceptions.RequestException("Request failed"),
             ),
             patch("esistatus.tasks.logger.error") as mock_logger,
         ):
             result = _get_esi_status_json("2023-10-01")
 
-            self.assertIsNone(result)
+            self.assertEqual(result, (None, {}))
             mock_logger.assert_called_once_with(
-                "Unable to update ESI status. Error: Request failed"
+                "Unable to update ESI status. Error: %s", "Request failed"
             )
 
     def test_handles_json_decode_error_and_logs_message(self):
@@ -264,10 +397,12 @@ class TestHelperGetESIStatusJson(BaseTestCase):
         """
 
         with (
-            patch("esistatus.tasks.requests.get") as mock_get,
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
+            patch("esistatus.tasks.Cache.get_validators", return_value={}),
             patch("esistatus.tasks.logger.error") as mock_logger,
         ):
             mock_response = Mock()
+            mock_response.status_code = 200
             mock_response.json.side_effect = json.JSONDecodeError(
                 "Expecting value", "", 0
             )
@@ -276,7 +411,7 @@ class TestHelperGetESIStatusJson(BaseTestCase):
 
             result = _get_esi_status_json("2023-10-01")
 
-            self.assertIsNone(result)
+            self.assertEqual(result, (None, {}))
             mock_logger.assert_called_once_with(
                 "Unable to update ESI status. ESI returned invalid JSON."
             )
@@ -284,9 +419,10 @@ class TestHelperGetESIStatusJson(BaseTestCase):
 
 class TestHelperGetOpenAPISpecsJson(BaseTestCase):
     """
-    Test the _get_openapi_specs_json function.
+    Test the _get_openapi_operation_index function.
     """
 
+    @override_settings(ESISTATUS_OPENAPI_STREAMING=False)
     def test_fetches_openapi_specs_successfully(self):
         """
         Test fetching the OpenAPI specs successfully.
@@ -296,23 +432,34 @@ class TestHelperGetOpenAPISpecsJson(BaseTestCase):
         """
 
         with (
-            patch("esistatus.providers.cache.Cache.get", return_value=None),
-            patch("esistatus.tasks.requests.get") as mock_get,
+            patch(
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
             patch("esistatus.providers.cache.Cache.set") as mock_set_cache,
             patch("esistatus.tasks.logger.info") as mock_logger,
         ):
-            mock_response = Mock()
-            mock_response.json.return_value = {"openapi": "3.0.0"}
+            mock_response = MagicMock()
+            mock_response.__enter__.return_value = mock_response
+            mock_response.headers = {"ETag": '"abc"'}
+            mock_response.json.return_value = {
+                "openapi": "3.0.0",
+                "paths": {"/path1": {"get": {"tags": ["Public"], "responses": {}}}},
+            }
             mock_response.raise_for_status = Mock()
             mock_get.return_value = mock_response
 
-            result = _get_openapi_specs_json("2023-10-01")
+            result = _get_openapi_operation_index("2023-10-01")
 
-            self.assertEqual(result, {"openapi": "3.0.0"})
+            self.assertEqual(result, {("/path1", "get"): {"tags": ["Public"]}})
             mock_logger.assert_called_once_with(
-                "ESI OpenAPI specs fetched successfully for compatibility date: 2023-10-01."
+                "ESI OpenAPI specs fetched successfully for compatibility date: %s.",
+                "2023-10-01",
+            )
+            mock_set_cache.assert_called_once_with(
+                value={("/path1", "get"): {"tags": ["Public"]}},
+                validators={"etag": '"abc"'},
             )
-            mock_set_cache.assert_called_once_with(value={"openapi": "3.0.0"})
 
     def test_uses_cached_openapi_specs_if_available(self):
         """
@@ -324,16 +471,15 @@ class TestHelperGetOpenAPISpecsJson(BaseTestCase):
 
         with (
             patch(
-                "esistatus.providers.cache.Cache.get", return_value={"openapi": "3.0.0"}
+                "esistatus.providers.cache.Cache._get_entry",
+                return_value=({("/path1", "get"): {"tags": ["Public"]}}, True),
             ),
-            patch("esistatus.tasks.logger.debug") as mock_logger,
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
         ):
-            result = _get_openapi_specs_json("2023-10-01")
+            result = _get_openapi_operation_index("2023-10-01")
 
-            self.assertEqual(result, {"openapi": "3.0.0"})
-            mock_logger.assert_called_once_with(
-                msg="Using cached ESI OpenAPI specs for compatibility date: 2023-10-01."
-            )
+            self.assertEqual(result, {("/path1", "get"): {"tags": ["Public"]}})
+            mock_get.assert_not_called()
 
     def test_handles_request_exception_and_logs_error(self):
         """
@@ -344,20 +490,23 @@ class TestHelperGetOpenAPISpecsJson(BaseTestCase):
         """
 
         with (
-            patch("esistatus.providers.cache.Cache.get", return_value=None),
             patch(
-                "esistatus.tasks.requests.get",
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            patch(
+                "esistatus.tasks.EsiMetaClient.get",
                 side_effect=requests.exceptions.RequestException("Request failed"),
             ),
             patch("esistatus.tasks.logger.error") as mock_logger,
         ):
-            result = _get_openapi_specs_json("2023-10-01")
+            result = _get_openapi_operation_index("2023-10-01")
 
             self.assertIsNone(result)
             mock_logger.assert_called_once_with(
-                "Unable to fetch ESI OpenAPI specs. Error: Request failed"
+                "Unable to fetch ESI OpenAPI specs. Error: %s", "Request failed"
             )
 
+    @override_settings(ESISTATUS_OPENAPI_STREAMING=False)
     def test_handles_json_decode_error_and_logs_message(self):
         """
         Test handling a JSONDecodeError and logging the message.
@@ -367,24 +516,183 @@ class TestHelperGetOpenAPISpecsJson(BaseTestCase):
         """
 
         with (
-            patch("esistatus.providers.cache.Cache.get", return_value=None),
-            patch("esistatus.tasks.requests.get") as mock_get,
+            patch(
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
             patch("esistatus.tasks.logger.error") as mock_logger,
         ):
-            mock_response = Mock()
+            mock_response = MagicMock()
+            mock_response.__enter__.return_value = mock_response
             mock_response.json.side_effect = json.JSONDecodeError(
                 "Expecting value", "", 0
             )
             mock_response.raise_for_status = Mock()
             mock_get.return_value = mock_response
 
-            result = _get_openapi_specs_json("2023-10-01")
+            result = _get_openapi_operation_index("2023-10-01")
+            self.assertIsNone(result)
+            mock_logger.assert_called_once_with(
+                "Unable to fetch ESI OpenAPI specs. ESI returned invalid JSON."
+            )
+
+    def test_streams_openapi_specs_into_operation_index(self):
+        """
+        Test building the operation index while the OpenAPI specs are streamed.
+
+        :return:
+        :rtype:
+        """
+
+        body = json.dumps(
+            {
+                "openapi": "3.0.0",
+                "paths": {
+                    "/path1": {
+                        "parameters": [{"name": "page"}],
+                        "get": {
+                            "operationId": "GetPath1",
+                            "tags": ["Public"],
+                            "responses": {"200": {"description": "OK"}},
+                        },
+                    },
+                    "/path2": {"post": {"summary": "Post it", "tags": ["Private"]}},
+                },
+                "components": {"schemas": {}},
+            }
+        ).encode()
+
+        with (
+            patch(
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
+            patch("esistatus.providers.cache.Cache.set"),
+        ):
+            mock_response = MagicMock()
+            mock_response.__enter__.return_value = mock_response
+            mock_response.headers = {}
+            mock_response.iter_content.return_value = [
+                body[i : i + 16] for i in range(0, len(body), 16)
+            ]
+            mock_get.return_value = mock_response
+
+            result = _get_openapi_operation_index("2023-10-01")
+
+            self.assertEqual(
+                result,
+                {
+                    ("/path1", "get"): {"operationId": "GetPath1", "tags": ["Public"]},
+                    ("/path2", "post"): {"summary": "Post it", "tags": ["Private"]},
+                },
+            )
+            self.assertTrue(mock_get.call_args.kwargs["stream"])
+            mock_response.json.assert_not_called()
+
+    def test_handles_truncated_stream_and_logs_message(self):
+        """
+        Test handling a truncated OpenAPI specs stream.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch(
+                "esistatus.providers.cache.Cache._get_entry", return_value=(False, True)
+            ),
+            patch("esistatus.tasks.EsiMetaClient.get") as mock_get,
+            patch("esistatus.providers.cache.Cache.set") as mock_set_cache,
+            patch("esistatus.tasks.logger.error") as mock_logger,
+        ):
+            mock_response = MagicMock()
+            mock_response.__enter__.return_value = mock_response
+            mock_response.iter_content.return_value = [b'{"paths": {"/path1": {']
+            mock_get.return_value = mock_response
+
+            result = _get_openapi_operation_index("2023-10-01")
+
             self.assertIsNone(result)
+            mock_set_cache.assert_not_called()
             mock_logger.assert_called_once_with(
                 "Unable to fetch ESI OpenAPI specs. ESI returned invalid JSON."
             )
 
 
+class TestHelperBuildOpenAPIOperationIndex(BaseTestCase):
+    """
+    Test the _build_openapi_operation_index function.
+    """
+
+    def test_keeps_only_the_enrichment_fields(self):
+        """
+        Test that only description, operationId, summary and tags are kept.
+
+        :return:
+        :rtype:
+        """
+
+        openapi = {
+            "paths": {
+                "/path1": {
+                    "get": {
+                        "description": "Description",
+                        "operationId": "GetPath1",
+                        "summary": "Summary",
+                        "tags": ["Public"],
+                        "parameters": [{"name": "page"}],
+                        "responses": {"200": {}},
+                    }
+                }
+            }
+        }
+
+        result = _build_openapi_operation_index(openapi)
+
+        self.assertEqual(
+            result,
+            {
+                ("/path1", "get"): {
+                    "description": "Description",
+                    "operationId": "GetPath1",
+                    "summary": "Summary",
+                    "tags": ["Public"],
+                }
+            },
+        )
+
+    def test_skips_non_operation_entries_of_a_path(self):
+        """
+        Test that path level entries which aren't operations are skipped.
+
+        :return:
+        :rtype:
+        """
+
+        openapi = {
+            "paths": {
+                "/path1": {
+                    "parameters": [{"name": "page"}],
+                    "POST": {"tags": ["Private"]},
+                }
+            }
+        }
+
+        result = _build_openapi_operation_index(openapi)
+
+        self.assertEqual(result, {("/path1", "post"): {"tags": ["Private"]}})
+
+    def test_handles_specs_without_paths(self):
+        """
+        Test that specs without paths result in an empty index.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(_build_openapi_operation_index({"openapi": "3.0.0"}), {})
+
+
 class TestHelperAddTagsToStatus(BaseTestCase):
     """
     Test the _enrich_status_json function.
@@ -401,7 +709,7 @@ class TestHelperAddTagsToStatus(BaseTestCase):
         status = {"routes": [{"path": "/path1", "method": "GET"}]}
         openapi = {"paths": {"/path1": {"get": {"tags": ["Public"]}}}}
 
-        result = _enrich_status_json(status, openapi)
+        result = _enrich_status_json(status, _build_openapi_operation_index(openapi))
 
         self.assertEqual(result[0]["tags"], ["Public"])
 
@@ -416,7 +724,7 @@ class TestHelperAddTagsToStatus(BaseTestCase):
         status = {"routes": [{"path": "/path1", "method": "GET"}]}
         openapi = {"paths": {}}
 
-        result = _enrich_status_json(status, openapi)
+        result = _enrich_status_json(status, _build_openapi_operation_index(openapi))
 
         self.assertEqual(result[0]["tags"], ["Deprecated"])
 
@@ -441,7 +749,7 @@ class TestHelperAddTagsToStatus(BaseTestCase):
             }
         }
 
-        result = _enrich_status_json(status, openapi)
+        result = _enrich_status_json(status, _build_openapi_operation_index(openapi))
 
         self.assertEqual(result[0]["tags"], ["Public"])
         self.assertEqual(result[1]["tags"], ["Private"])
@@ -457,7 +765,7 @@ class TestHelperAddTagsToStatus(BaseTestCase):
         status = {"routes": []}
         openapi = {"paths": {"/path1": {"get": {"tags": ["Public"]}}}}
 
-        result = _enrich_status_json(status, openapi)
+        result = _enrich_status_json(status, _build_openapi_operation_index(openapi))
 
         self.assertEqual(result, [])
 
@@ -472,7 +780,7 @@ class TestHelperAddTagsToStatus(BaseTestCase):
         status = {"routes": [{"path": "/path1", "method": "GET"}]}
         openapi = {"paths": {"/path1": {}}}
 
-        result = _enrich_status_json(status, openapi)
+        result = _enrich_status_json(status, _build_openapi_operation_index(openapi))
 
         self.assertEqual(result[0]["tags"], ["Deprecated"])
 
@@ -709,139 +1017,206 @@ class TestUpdateESIStatus(BaseTestCase):
             ),
             mock.patch(
                 "esistatus.tasks._get_esi_status_json",
-                return_value={
-                    "routes": [{"method": "GET", "path": "/alliances", "status": "OK"}]
-                },
+                return_value=(
+                    {
+                        "routes": [
+                            {"method": "GET", "path": "/alliances", "status": "OK"}
+                        ]
+                    },
+                    {},
+                ),
             ),
             mock.patch(
-                "esistatus.tasks._get_openapi_specs_json",
-                return_value={
-                    "paths": {"/alliances": {"get": {"tags": ["alliances"]}}}
-                },
+                "esistatus.tasks._get_openapi_operation_index",
+                return_value={("/alliances", "get"): {"tags": ["alliances"]}},
             ),
             mock.patch(
                 "esistatus.tasks._get_esi_name_for_compatibility_date",
                 return_value="EVE Swagger interface",
             ),
+            mock.patch("esistatus.tasks._stored_esi_status", return_value=(None, None)),
             mock.patch(
                 "esistatus.tasks.EsiStatus.objects.update_or_create"
             ) as mock_update,
+            mock.patch("esistatus.tasks.Cache.set") as mock_cache_set,
+            mock.patch("esistatus.tasks.prerender_fragments") as mock_prerender,
         ):
-            update_esi_status()
+            result = update_esi_status()
 
-            expected_status_data = {
-                "Unknown": {"endpoints": {}, "count": 0, "percentage": "0.00%"},
-                "OK": {
-                    "endpoints": {
-                        "alliances": [
-                            {
-                                "path": "/alliances",
-                                "method": "GET",
-                                "operation_id": None,
-                                "summary": None,
-                                "description": None,
-                            }
-                        ]
-                    },
-                    "count": 1,
-                    "percentage": "100.00%",
+            fingerprint = _status_fingerprint(
+                status={
+                    "routes": [{"method": "GET", "path": "/alliances", "status": "OK"}]
                 },
-                "Degraded": {"endpoints": {}, "count": 0, "percentage": "0.00%"},
-                "Down": {"endpoints": {}, "count": 0, "percentage": "0.00%"},
-                "Recovering": {"endpoints": {}, "count": 0, "percentage": "0.00%"},
+                compatibility_date="2023-10-01",
+                esi_name="EVE Swagger interface",
+            )
+
+            expected_status_data = {
+                "Unknown": {"count": 0, "percentage": "0.00%", "tags": []},
+                "OK": {"count": 1, "percentage": "100.00%", "tags": ["alliances"]},
+                "Degraded": {"count": 0, "percentage": "0.00%", "tags": []},
+                "Down": {"count": 0, "percentage": "0.00%", "tags": []},
+                "Recovering": {"count": 0, "percentage": "0.00%", "tags": []},
             }
 
             mock_update.assert_called_once_with(
                 pk=1,
                 defaults={
                     "compatibility_date": "2023-10-01",
-                    "status_data": expected_status_data,
+                    "total_endpoints": 1,
+                    "status_counts": {
+                        "Unknown": {"count": 0, "percentage": "0.00%"},
+                        "OK": {"count": 1, "percentage": "100.00%"},
+                        "Degraded": {"count": 0, "percentage": "0.00%"},
+                        "Down": {"count": 0, "percentage": "0.00%"},
+                        "Recovering": {"count": 0, "percentage": "0.00%"},
+                    },
+                    "esi_name": "EVE Swagger interface",
+                    "fingerprint": fingerprint,
+                },
+            )
+            mock_cache_set.assert_called_once_with(value=fingerprint)
+            mock_prerender.assert_called_once_with(
+                version=fingerprint,
+                context={
+                    "esi_endpoint_status": expected_status_data,
                     "total_endpoints": 1,
                     "esi_name": "EVE Swagger interface",
+                    "compatibility_date": "2023-10-01",
                 },
             )
+            self.assertEqual(result, UpdateResult.UPDATED.value)
 
-    def test_skips_status_update_when_compatibility_date_is_none(self):
+    def test_records_route_status_changes_against_stored_status(self):
         """
-        Test skipping the status update when the compatibility date is None.
+        Test that status changes against the stored ESI status are recorded
+        along with the update and announced via the esi_status_changed signal.
 
         :return:
         :rtype:
         """
 
-        with (
-            mock.patch(
-                "esistatus.tasks._get_latest_compatibility_date", return_value=None
-            ),
-            mock.patch("esistatus.tasks.logger.error") as mock_logger,
-        ):
-            update_esi_status()
+        received = []
 
-            mock_logger.assert_called_with(
-                "Failed to retrieve latest compatibility date."
-            )
+        def receiver(sender, **kwargs):  # pylint: disable=unused-argument
+            received.append(kwargs)
 
-    def test_logs_error_when_esi_status_is_none(self):
-        """
-        Test logging an error when ESI status is None.
+        esi_status_changed.connect(receiver)
+        self.addCleanup(esi_status_changed.disconnect, receiver)
 
-        :return:
-        :rtype:
-        """
+        EsiStatus.objects.create(
+            pk=1, compatibility_date="2023-10-01", total_endpoints=1
+        )
+        EsiRoute.objects.create(
+            method="GET", path="/alliances", status="OK", tag="alliances"
+        )
 
         with (
-            patch(
+            mock.patch(
                 "esistatus.tasks._get_latest_compatibility_date",
                 return_value="2023-10-01",
             ),
-            patch("esistatus.tasks._get_esi_status_json", return_value=None),
-            patch(
-                "esistatus.tasks._get_openapi_specs_json",
-                return_value={"openapi": "3.0.0"},
+            mock.patch(
+                "esistatus.tasks._get_esi_status_json",
+                return_value=(
+                    {
+                        "routes": [
+                            {"method": "GET", "path": "/alliances", "status": "Down"}
+                        ]
+                    },
+                    {},
+                ),
             ),
-            patch("esistatus.tasks.logger.error") as mock_error,
+            mock.patch(
+                "esistatus.tasks._get_openapi_operation_index",
+                return_value={("/alliances", "get"): {"tags": ["alliances"]}},
+            ),
+            mock.patch(
+                "esistatus.tasks._get_esi_name_for_compatibility_date",
+                return_value="EVE Swagger interface",
+            ),
+            mock.patch("esistatus.tasks._stored_esi_status", return_value=(None, None)),
+            mock.patch("esistatus.tasks.Cache.set"),
+            mock.patch("esistatus.tasks.prerender_fragments"),
+            self.captureOnCommitCallbacks(execute=True),
         ):
-            update_esi_status()
+            result = update_esi_status()
 
-            mock_error.assert_called_once_with(
-                "Failed to retrieve ESI status or OpenAPI specs."
-            )
+        self.assertEqual(result, UpdateResult.UPDATED.value)
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]["compatibility_date"], "2023-10-01")
+        self.assertEqual(
+            received[0]["changeset"].transitions,
+            [
+                StatusTransition(
+                    method="GET", path="/alliances", old_status="OK", new_status="Down"
+                )
+            ],
+        )
+        self.assertEqual(
+            list(
+                EsiRouteStatusChange.objects.values_list(
+                    "method", "path", "old_status", "new_status"
+                )
+            ),
+            [("GET", "/alliances", "OK", "Down")],
+        )
+        self.assertEqual(
+            list(EsiRoute.objects.values_list("method", "path", "status")),
+            [("GET", "/alliances", "Down")],
+        )
 
-    def test_logs_error_when_openapi_specs_is_none(self):
+    def test_skips_enrichment_and_database_update_when_fingerprint_unchanged(self):
         """
-        Test logging an error when OpenAPI specs is None.
+        Test skipping enrichment and the database update when the fingerprint is unchanged.
 
         :return:
         :rtype:
         """
 
+        esi_status = {"routes": [{"method": "GET", "path": "/alliances"}]}
+        fingerprint = _status_fingerprint(
+            status=esi_status,
+            compatibility_date="2023-10-01",
+            esi_name="EVE Swagger Interface",
+        )
+
         with (
-            patch(
+            mock.patch(
                 "esistatus.tasks._get_latest_compatibility_date",
                 return_value="2023-10-01",
             ),
-            patch(
-                "esistatus.tasks._get_esi_status_json", return_value={"status": "ok"}
+            mock.patch(
+                "esistatus.tasks._get_esi_status_json", return_value=(esi_status, {})
             ),
-            patch("esistatus.tasks._get_openapi_specs_json", return_value=None),
-            patch("esistatus.tasks.logger.error") as mock_error,
+            mock.patch(
+                "esistatus.tasks._stored_esi_status",
+                return_value=(fingerprint, "EVE Swagger Interface"),
+            ),
+            mock.patch("esistatus.tasks._get_openapi_operation_index"),
+            mock.patch(
+                "esistatus.tasks._get_esi_name_for_compatibility_date",
+                return_value="EVE Swagger Interface",
+            ),
+            mock.patch("esistatus.tasks._enrich_status_json") as mock_enrich,
+            mock.patch(
+                "esistatus.tasks.EsiStatus.objects.update_or_create"
+            ) as mock_update,
         ):
-            update_esi_status()
+            result = update_esi_status()
 
-            mock_error.assert_called_once_with(
-                "Failed to retrieve ESI status or OpenAPI specs."
-            )
+            self.assertEqual(result, UpdateResult.UNCHANGED.value)
+            mock_enrich.assert_not_called()
+            mock_update.assert_not_called()
 
-    def test_skips_database_update_when_no_tags_in_enriched_status(self):
+    def test_skips_database_update_when_esi_status_not_modified(self):
         """
-        Test skipping the database update when there are no tags in the enriched status.
+        Test skipping everything after the fetch when ESI answered with 304.
 
         :return:
         :rtype:
         """
 
-        enriched_status = [{"path": "/path1", "method": "GET", "tags": []}]
-
         with (
             mock.patch(
                 "esistatus.tasks._get_latest_compatibility_date",
@@ -849,14 +1224,138 @@ class TestUpdateESIStatus(BaseTestCase):
             ),
             mock.patch(
                 "esistatus.tasks._get_esi_status_json",
-                return_value={"routes": [{"path": "/path1", "method": "GET"}]},
+                return_value=(ESI_NOT_MODIFIED, {}),
             ),
             mock.patch(
-                "esistatus.tasks._get_openapi_specs_json",
-                return_value={"paths": {}},
+                "esistatus.tasks._stored_esi_status",
+                return_value=("v1", "EVE Swagger Interface"),
             ),
+            mock.patch("esistatus.tasks._get_openapi_operation_index"),
+            mock.patch("esistatus.tasks._get_esi_name_for_compatibility_date"),
+            mock.patch("esistatus.tasks._enrich_status_json") as mock_enrich,
             mock.patch(
-                "esistatus.tasks._enrich_status_json", return_value=enriched_status
+                "esistatus.tasks.EsiStatus.objects.update_or_create"
+            ) as mock_update,
+        ):
+            result = update_esi_status()
+
+            self.assertEqual(result, UpdateResult.NOT_MODIFIED.value)
+            mock_enrich.assert_not_called()
+            mock_update.assert_not_called()
+
+    def test_skips_status_update_when_compatibility_date_is_none(self):
+        """
+        Test skipping the status update when the compatibility date is None.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch(
+                "esistatus.tasks._get_latest_compatibility_date", return_value=None
+            ),
+            mock.patch("esistatus.tasks.logger.error") as mock_logger,
+        ):
+            update_esi_status()
+
+            mock_logger.assert_called_with(
+                "Failed to retrieve latest compatibility date."
+            )
+
+    def test_logs_error_when_esi_status_is_none(self):
+        """
+        Test logging an error when ESI status is None.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch(
+                "esistatus.tasks._get_latest_compatibility_date",
+                return_value="2023-10-01",
+            ),
+            patch("esistatus.tasks._get_esi_status_json", return_value=(None, {})),
+            patch(
+                "esistatus.tasks._get_openapi_operation_index",
+                return_value={"openapi": "3.0.0"},
+            ),
+            patch(
+                "esistatus.tasks._get_esi_name_for_compatibility_date",
+                return_value=None,
+            ),
+            patch("esistatus.tasks.logger.error") as mock_error,
+        ):
+            update_esi_status()
+
+            mock_error.assert_called_once_with(
+                "Failed to retrieve ESI status or OpenAPI specs."
+            )
+
+    def test_logs_error_when_openapi_specs_is_none(self):
+        """
+        Test logging an error when OpenAPI specs is None.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            patch(
+                "esistatus.tasks._get_latest_compatibility_date",
+                return_value="2023-10-01",
+            ),
+            patch(
+                "esistatus.tasks._get_esi_status_json",
+                return_value=({"status": "ok"}, {"etag": '"v1"'}),
+            ),
+            patch("esistatus.tasks._get_openapi_operation_index", return_value=None),
+            patch(
+                "esistatus.tasks._get_esi_name_for_compatibility_date",
+                return_value=None,
+            ),
+            patch("esistatus.tasks._stored_esi_status", return_value=(None, None)),
+            patch("esistatus.tasks.logger.error") as mock_error,
+            patch("esistatus.tasks.Cache.set_validators") as mock_set_validators,
+        ):
+            update_esi_status()
+
+            mock_error.assert_called_once_with(
+                "Failed to retrieve ESI status or OpenAPI specs."
+            )
+            mock_set_validators.assert_not_called()
+
+    def test_skips_database_update_when_no_tags_in_enriched_status(self):
+        """
+        Test skipping the database update when there are no tags in the enriched status.
+
+        :return:
+        :rtype:
+        """
+
+        enriched_status = [{"path": "/path1", "method": "GET", "tags": []}]
+
+        with (
+            mock.patch(
+                "esistatus.tasks._get_latest_compatibility_date",
+                return_value="2023-10-01",
+            ),
+            mock.patch(
+                "esistatus.tasks._get_esi_status_json",
+                return_value=({"routes": [{"path": "/path1", "method": "GET"}]}, {}),
+            ),
+            mock.patch(
+                "esistatus.tasks._get_openapi_operation_index",
+                return_value={"paths": {}},
+            ),
+            mock.patch(
+                "esistatus.tasks._get_esi_name_for_compatibility_date",
+                return_value=None,
+            ),
+            mock.patch("esistatus.tasks._stored_esi_status", return_value=(None, None)),
+            mock.patch(
+                "esistatus.tasks._enrich_status_json", return_value=enriched_status
             ),
             mock.patch("esistatus.tasks.logger.debug") as mock_debug,
             mock.patch(
@@ -870,6 +1369,275 @@ class TestUpdateESIStatus(BaseTestCase):
             )
             mock_update.assert_not_called()
 
+    @override_settings(
+        CACHES=LOCMEM_CACHES,
+        ESISTATUS_HTTP_TRANSPORT="esistatus.providers.esi_stub.EsiStubAdapter",
+    )
+    def test_refetches_status_after_failed_database_write(self):
+        """
+        Test that a run after a failed database write fetches the status again
+        instead of skipping it as not modified.
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+        EsiMetaClient.reset_session()
+        self.addCleanup(EsiMetaClient.reset_session)
+
+        with mock.patch(
+            "esistatus.tasks._sync_esi_routes", side_effect=RuntimeError("DB error")
+        ):
+            with self.assertRaises(RuntimeError):
+                update_esi_status()
+
+        self.assertFalse(EsiStatus.objects.exists())
+
+        self.assertEqual(update_esi_status(), UpdateResult.UPDATED.value)
+        self.assertTrue(EsiStatus.objects.exists())
+        self.assertTrue(EsiRoute.objects.exists())
+
+        # Now that the status is stored, the next run is answered with 304
+        self.assertEqual(update_esi_status(), UpdateResult.NOT_MODIFIED.value)
+
+    @override_settings(
+        CACHES=LOCMEM_CACHES,
+        ESISTATUS_HTTP_TRANSPORT="esistatus.providers.esi_stub.EsiStubAdapter",
+    )
+    def test_refetches_status_when_nothing_is_stored(self):
+        """
+        Test that cached validators are ignored when no status is stored,
+        so a wiped database is filled again.
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+        EsiMetaClient.reset_session()
+        self.addCleanup(EsiMetaClient.reset_session)
+
+        self.assertEqual(update_esi_status(), UpdateResult.UPDATED.value)
+
+        # The cached version of the wiped status is still around
+        EsiRoute.objects.all().delete()
+        EsiStatus.objects.all().delete()
+
+        self.assertEqual(update_esi_status(), UpdateResult.UPDATED.value)
+        self.assertTrue(EsiRoute.objects.exists())
+
+    @override_settings(
+        CACHES=LOCMEM_CACHES,
+        ESISTATUS_HTTP_TRANSPORT="esistatus.providers.esi_stub.EsiStubAdapter",
+    )
+    def test_stores_esi_name_once_it_recovers(self):
+        """
+        Test that an ESI name that failed to load is stored by a later run,
+        although the ESI status itself is unchanged.
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+        EsiMetaClient.reset_session()
+        self.addCleanup(EsiMetaClient.reset_session)
+
+        with mock.patch(
+            "esistatus.tasks._fetch_esi_names_json", return_value=(None, None)
+        ):
+            self.assertEqual(update_esi_status(), UpdateResult.UPDATED.value)
+
+        self.assertIsNone(EsiStatus.objects.get(pk=1).esi_name)
+
+        self.assertEqual(update_esi_status(), UpdateResult.UPDATED.value)
+        self.assertIsNotNone(EsiStatus.objects.get(pk=1).esi_name)
+
+        # Complete now, so the next run is answered with 304
+        self.assertEqual(update_esi_status(), UpdateResult.NOT_MODIFIED.value)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_skips_run_while_another_is_in_progress(self):
+        """
+        Test that a run returns right away while another run holds the lock.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            Cache(subkey="update").lock(timeout=60) as acquired,
+            mock.patch("esistatus.tasks._update_esi_status") as mock_update,
+        ):
+            self.assertTrue(acquired)
+
+            result = update_esi_status()
+
+        self.assertEqual(result, UpdateResult.IN_PROGRESS.value)
+        mock_update.assert_not_called()
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_releases_lock_after_run(self):
+        """
+        Test that the lock is released after a run, also when it fails.
+
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("esistatus.tasks._update_esi_status", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                update_esi_status()
+
+        with mock.patch(
+            "esistatus.tasks._update_esi_status",
+            return_value=UpdateResult.UPDATED.value,
+        ):
+            self.assertEqual(update_esi_status(), UpdateResult.UPDATED.value)
+
+    def test_queued_duplicates_expire(self):
+        """
+        Test that queued runs of the task expire.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(update_esi_status.expires, 55)
+
+
+class TestHelperFetchEsiMetaDocuments(BaseTestCase):
+    """
+    Test the _fetch_esi_meta_documents function.
+    """
+
+    def test_fetches_all_documents_for_the_compatibility_date(self):
+        """
+        Test that all three documents are fetched for the compatibility date.
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch(
+                "esistatus.tasks._get_esi_status_json",
+                return_value=({"routes": []}, {}),
+            ) as mock_status,
+            mock.patch(
+                "esistatus.tasks._get_openapi_operation_index",
+                return_value={"paths": {}},
+            ) as mock_openapi,
+            mock.patch(
+                "esistatus.tasks._get_esi_name_for_compatibility_date",
+                return_value="EVE Swagger Interface",
+            ) as mock_name,
+        ):
+            result = _fetch_esi_meta_documents(compatibility_date="2023-10-01")
+
+            self.assertEqual(
+                result,
+                (({"routes": []}, {}), {"paths": {}}, "EVE Swagger Interface"),
+            )
+            mock_status.assert_called_once_with(
+                compatibility_date="2023-10-01", revalidate=True
+            )
+            mock_openapi.assert_called_once_with(compatibility_date="2023-10-01")
+            mock_name.assert_called_once_with(compatibility_date="2023-10-01")
+
+    def test_runs_requests_concurrently(self):
+        """
+        Test that the requests are in flight at the same time.
+
+        :return:
+        :rtype:
+        """
+
+        barrier = threading.Barrier(parties=3, timeout=5)
+
+        def wait_for_all(
+            compatibility_date, **kwargs
+        ):  # pylint: disable=unused-argument
+            barrier.wait()
+
+            return compatibility_date
+
+        with (
+            mock.patch(
+                "esistatus.tasks._get_esi_status_json", side_effect=wait_for_all
+            ),
+            mock.patch(
+                "esistatus.tasks._get_openapi_operation_index", side_effect=wait_for_all
+            ),
+            mock.patch(
+                "esistatus.tasks._get_esi_name_for_compatibility_date",
+                side_effect=wait_for_all,
+            ),
+        ):
+            result = _fetch_esi_meta_documents(compatibility_date="2023-10-01")
+
+            self.assertEqual(result, ("2023-10-01", "2023-10-01", "2023-10-01"))
+
+
+class TestHelperStatusFingerprint(BaseTestCase):
+    """
+    Test the _status_fingerprint function.
+    """
+
+    def test_fingerprint_ignores_key_order(self):
+        """
+        Test that the fingerprint doesn't depend on the key order of the payload.
+
+        :return:
+        :rtype:
+        """
+
+        first = _status_fingerprint(
+            status={"routes": [{"path": "/a", "method": "GET"}]},
+            compatibility_date="2023-10-01",
+        )
+        second = _status_fingerprint(
+            status={"routes": [{"method": "GET", "path": "/a"}]},
+            compatibility_date="2023-10-01",
+        )
+
+        self.assertEqual(first, second)
+
+    def test_fingerprint_changes_with_esi_name(self):
+        """
+        Test that the fingerprint changes with the ESI name.
+
+        :return:
+        :rtype:
+        """
+
+        status = {"routes": [{"path": "/a", "method": "GET"}]}
+
+        self.assertNotEqual(
+            _status_fingerprint(status=status, compatibility_date="2023-10-01"),
+            _status_fingerprint(
+                status=status,
+                compatibility_date="2023-10-01",
+                esi_name="EVE Swagger Interface",
+            ),
+        )
+
+    def test_fingerprint_changes_with_compatibility_date(self):
+        """
+        Test that the fingerprint changes with the compatibility date.
+
+        :return:
+        :rtype:
+        """
+
+        status = {"routes": [{"path": "/a", "method": "GET"}]}
+
+        self.assertNotEqual(
+            _status_fingerprint(status=status, compatibility_date="2023-10-01"),
+            _status_fingerprint(status=status, compatibility_date="2023-10-02"),
+        )
+
 
 class TestGetEsiNamesJson(BaseTestCase):
     """
@@ -888,9 +1656,9 @@ class TestGetEsiNamesJson(BaseTestCase):
 
         with (
             mock.patch(
-                "esistatus.tasks.Cache.get", return_value=cached_value
+                "esistatus.tasks.Cache._get_entry", return_value=(cached_value, True)
             ) as mock_cache_get,
-            mock.patch("esistatus.tasks.requests.get") as mock_requests_get,
+            mock.patch("esistatus.tasks.EsiMetaClient.get") as mock_requests_get,
         ):
 
             result = _get_esi_names_json("2026-07-14")
@@ -908,9 +1676,9 @@ class TestGetEsiNamesJson(BaseTestCase):
         """
 
         with (
-            mock.patch("esistatus.tasks.Cache.get", return_value=False),
+            mock.patch("esistatus.tasks.Cache._get_entry", return_value=(False, True)),
             mock.patch(
-                "esistatus.tasks.requests.get",
+                "esistatus.tasks.EsiMetaClient.get",
                 side_effect=requests.exceptions.RequestException("boom"),
             ),
         ):
@@ -932,8 +1700,8 @@ class TestGetEsiNamesJson(BaseTestCase):
         mock_resp.json.side_effect = json.JSONDecodeError("msg", "doc", 0)
 
         with (
-            mock.patch("esistatus.tasks.Cache.get", return_value=False),
-            mock.patch("esistatus.tasks.requests.get", return_value=mock_resp),
+            mock.patch("esistatus.tasks.Cache._get_entry", return_value=(False, True)),
+            mock.patch("esistatus.tasks.EsiMetaClient.get", return_value=mock_resp),
         ):
 
             result = _get_esi_names_json("2026-07-14")
@@ -950,13 +1718,14 @@ class TestGetEsiNamesJson(BaseTestCase):
 
         response_json = {"history": [{"date": "2026-07-14", "name": "Fetched (ESI)"}]}
         mock_resp = mock.Mock()
+        mock_resp.headers = {"Last-Modified": "Tue, 14 Jul 2026 11:00:00 GMT"}
         mock_resp.raise_for_status.return_value = None
         mock_resp.json.return_value = response_json
 
         with (
-            mock.patch("esistatus.tasks.Cache.get", return_value=False),
+            mock.patch("esistatus.tasks.Cache._get_entry", return_value=(False, True)),
             mock.patch(
-                "esistatus.tasks.requests.get", return_value=mock_resp
+                "esistatus.tasks.EsiMetaClient.get", return_value=mock_resp
             ) as mock_get,
             mock.patch("esistatus.tasks.Cache.set") as mock_cache_set,
         ):
@@ -964,9 +1733,36 @@ class TestGetEsiNamesJson(BaseTestCase):
             result = _get_esi_names_json("2026-07-14")
 
             mock_get.assert_called_once()
-            mock_cache_set.assert_called_once_with(value=response_json)
+            mock_cache_set.assert_called_once_with(
+                value=response_json,
+                validators={"last_modified": "Tue, 14 Jul 2026 11:00:00 GMT"},
+            )
             self.assertEqual(result, response_json)
 
+    def test_revalidates_cached_names_with_validators(self):
+        """
+        Test that the cached validators are sent along and a 304 is passed on.
+
+        :return:
+        :rtype:
+        """
+
+        mock_resp = mock.Mock()
+        mock_resp.status_code = 304
+        mock_resp.headers = {"ETag": '"v1"'}
+        mock_resp.raise_for_status.return_value = None
+
+        with mock.patch(
+            "esistatus.tasks.EsiMetaClient.get", return_value=mock_resp
+        ) as mock_get:
+            result = _fetch_esi_names_json(
+                compatibility_date="2026-07-14", validators={"etag": '"v1"'}
+            )
+
+        self.assertEqual(result, (NOT_MODIFIED, {"etag": '"v1"'}))
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+        mock_resp.json.assert_not_called()
+
 
 class TestGetEsiNameForCompatibilityDate(BaseTestCase):
     """
@@ -1103,3 +1899,222 @@ class TestGetEsiNameForCompatibilityDate(BaseTestCase):
             result = _get_esi_name_for_compatibility_date("2026-07-01")
 
             self.assertEqual(result, "Good Entry (ESI)")
+
+
+class TestHelperSyncEsiRoutes(BaseTestCase):
+    """
+    Test the _sync_esi_routes function.
+    """
+
+    @staticmethod
+    def _route(path: str, status: str, summary: str = "Summary") -> dict:
+        """
+        Build an enriched ESI status route.
+
+        :param path:
+        :type path:
+        :param status:
+        :type status:
+        :param summary:
+        :type summary:
+        :return:
+        :rtype:
+        """
+
+        return {
+            "method": "get",
+            "path": path,
+            "status": status,
+            "tags": ["Tag", "Other Tag"],
+            "operation_id": None,
+            "summary": summary,
+            "description": None,
+        }
+
+    def test_creates_updates_and_deletes_only_changed_routes(self):
+        """
+        Test that only new, changed and removed routes are written.
+
+        :return:
+        :rtype:
+        """
+
+        EsiRoute.objects.bulk_create(
+            [
+                EsiRoute(
+                    method="GET",
+                    path="/unchanged",
+                    status="OK",
+                    tag="Tag",
+                    summary="Summary",
+                ),
+                EsiRoute(
+                    method="GET",
+                    path="/changed",
+                    status="OK",
+                    tag="Tag",
+                    summary="Summary",
+                ),
+                EsiRoute(
+                    method="GET",
+                    path="/removed",
+                    status="OK",
+                    tag="Tag",
+                    summary="Summary",
+                ),
+            ]
+        )
+        existing = {
+            (route.method, route.path): route for route in EsiRoute.objects.all()
+        }
+
+        with mock.patch(
+            "esistatus.tasks.EsiRoute.objects.bulk_update",
+            wraps=EsiRoute.objects.bulk_update,
+        ) as mock_bulk_update:
+            _sync_esi_routes(
+                existing=existing,
+                routes=[
+                    self._route(path="/unchanged", status="OK"),
+                    self._route(path="/changed", status="Down"),
+                    self._route(path="/new", status="Degraded"),
+                ],
+            )
+
+        updated = mock_bulk_update.call_args.args[0]
+
+        self.assertEqual([route.path for route in updated], ["/changed"])
+        self.assertEqual(
+            sorted(EsiRoute.objects.values_list("method", "path", "status", "tag")),
+            [
+                ("GET", "/changed", "Down", "Tag"),
+                ("GET", "/new", "Degraded", "Tag"),
+                ("GET", "/unchanged", "OK", "Tag"),
+            ],
+        )
+
+    def test_updates_route_when_only_its_description_changed(self):
+        """
+        Test that a route is updated when only its summary or description changed.
+
+        :return:
+        :rtype:
+        """
+
+        EsiRoute.objects.create(
+            method="GET", path="/route", status="OK", tag="Tag", summary="Old"
+        )
+        existing = {
+            (route.method, route.path): route for route in EsiRoute.objects.all()
+        }
+
+        _sync_esi_routes(
+            existing=existing,
+            routes=[self._route(path="/route", status="OK", summary="New")],
+        )
+
+        self.assertEqual(EsiRoute.objects.get(path="/route").summary, "New")
+
+
+class TestHelperRecordRouteStatusChanges(BaseTestCase):
+    """
+    Test the _record_route_status_changes function.
+    """
+
+    def test_records_status_transitions_of_changeset(self):
+        """
+        Test that only the status transitions of the changeset are recorded.
+
+        :return:
+        :rtype:
+        """
+
+        changeset = Changeset(
+            added={("GET", "/new"): "Down"},
+            removed={("GET", "/gone"): "OK"},
+            transitions=[
+                StatusTransition(
+                    method="GET",
+                    path="/alliances",
+                    old_status="OK",
+                    new_status="Degraded",
+                )
+            ],
+        )
+
+        result = _record_route_status_changes(changeset=changeset)
+
+        self.assertEqual(result, 1)
+        self.assertEqual(
+            list(
+                EsiRouteStatusChange.objects.values_list(
+                    "method", "path", "old_status", "new_status"
+                )
+            ),
+            [("GET", "/alliances", "OK", "Degraded")],
+        )
+
+
+class TestPruneEsiStatusHistory(BaseTestCase):
+    """
+    Test the prune_esi_status_history task.
+    """
+
+    @override_settings(
+        ESISTATUS_HISTORY_RETENTION_DAYS=30, ESISTATUS_HISTORY_PRUNE_BATCH_SIZE=2
+    )
+    def test_deletes_changes_older_than_retention_in_batches(self):
+        """
+        Test that changes older than the retention period are deleted in batches.
+
+        :return:
+        :rtype:
+        """
+
+        now = timezone.now()
+
+        EsiRouteStatusChange.objects.bulk_create(
+            [
+                EsiRouteStatusChange(
+                    method="GET",
+                    path=f"/old/{i}",
+                    old_status="OK",
+                    new_status="Down",
+                    changed_at=now - datetime.timedelta(days=31),
+                )
+                for i in range(5)
+            ]
+            + [
+                EsiRouteStatusChange(
+                    method="GET",
+                    path="/recent",
+                    old_status="OK",
+                    new_status="Down",
+                    changed_at=now - datetime.timedelta(days=1),
+                )
+            ]
+        )
+
+        with mock.patch(
+            "esistatus.tasks.EsiRouteStatusChange.objects.filter",
+            wraps=EsiRouteStatusChange.objects.filter,
+        ) as mock_filter:
+            result = prune_esi_status_history()
+
+        self.assertEqual(result, 5)
+        self.assertEqual(
+            list(EsiRouteStatusChange.objects.values_list("path", flat=True)),
+            ["/recent"],
+        )
+        # 3 batches of selecting and deleting, plus the final empty selection
+        self.assertEqual(mock_filter.call_count, 7)
+
+    def test_returns_zero_without_old_changes(self):
+        """
+        Test that nothing is deleted without old changes.
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(prune_esi_status_history(), 0)
@@ -3,16 +3,35 @@ Test the apps' views
 """
 
 # Standard Library
+import json
+from http import HTTPStatus
 from unittest import mock
 
+# Third Party
+from asgiref.sync import async_to_sync
+
+# Django
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+from django.utils import translation
+
 # AA ESI Status
-from esistatus.models import EsiStatus
+from esistatus import __version__
+from esistatus.constants import EsiStatusFragment
+from esistatus.models import EsiRoute, EsiStatus
 from esistatus.tests import BaseTestCase
+from esistatus.tests.utils import create_fake_user, random_id
 from esistatus.views import (
     _esi_status,
+    _esi_status_event_stream,
     _render_esi_status,
     ajax_dashboard_widget,
     ajax_esi_status,
+    ajax_esi_status_events,
+    ajax_esi_status_json,
+    ajax_esi_status_routes,
     dashboard_widget,
     index,
 )
@@ -38,7 +57,9 @@ class TestDashboardWidget(BaseTestCase):
             dashboard_widget(request)
 
             mock_render.assert_called_once_with(
-                template_name="esistatus/dashboard-widget.html", request=request
+                template_name="esistatus/dashboard-widget.html",
+                context={"live_updates": False},
+                request=request,
             )
 
     def test_returns_empty_string_for_non_superuser(self):
@@ -72,7 +93,9 @@ class TestAjaxEsiStatus(BaseTestCase):
 
         with (
             mock.patch("esistatus.views._esi_status") as mock_esi_status,
-            mock.patch("esistatus.views.render") as mock_render,
+            mock.patch(
+                "esistatus.views.render", return_value=HttpResponse()
+            ) as mock_render,
         ):
             mock_esi_status.return_value = {
                 "esi_status": {"key": "value"},
@@ -81,7 +104,7 @@ class TestAjaxEsiStatus(BaseTestCase):
                 "esi_name": "EVE Swagger Interface",
             }
 
-            response = ajax_esi_status(request=mock.Mock())
+            response = ajax_esi_status(request=RequestFactory().get("/"))
 
             mock_render.assert_called_once_with(
                 request=mock.ANY,
@@ -105,11 +128,13 @@ class TestAjaxEsiStatus(BaseTestCase):
 
         with (
             mock.patch("esistatus.views._esi_status") as mock_esi_status,
-            mock.patch("esistatus.views.render") as mock_render,
+            mock.patch(
+                "esistatus.views.render", return_value=HttpResponse()
+            ) as mock_render,
         ):
             mock_esi_status.return_value = {}
 
-            response = ajax_esi_status(request=mock.Mock())
+            response = ajax_esi_status(request=RequestFactory().get("/"))
 
             mock_render.assert_called_once_with(
                 request=mock.ANY,
@@ -123,6 +148,195 @@ class TestAjaxEsiStatus(BaseTestCase):
             )
             self.assertEqual(response, mock_render.return_value)
 
+    def test_returns_pre_rendered_fragment_when_available(self):
+        """
+        Test that the AJAX ESI status view returns the pre-rendered fragment
+        for the current data version without rendering
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch("esistatus.views.esi_status_version", return_value="abc"),
+            mock.patch(
+                "esistatus.views.get_fragment", return_value="<p>OK</p>"
+            ) as mock_get_fragment,
+            mock.patch("esistatus.views._render_esi_status") as mock_render,
+            translation.override("en"),
+        ):
+            response = ajax_esi_status(request=RequestFactory().get("/"))
+
+            mock_get_fragment.assert_called_once_with(
+                fragment=EsiStatusFragment.INDEX, version="abc", language="en"
+            )
+            mock_render.assert_not_called()
+            self.assertEqual(response.content, b"<p>OK</p>")
+            self.assertEqual(response.headers["X-ESI-Status-Version"], "abc")
+
+    def test_stores_rendered_fragment_on_miss(self):
+        """
+        Test that the AJAX ESI status view stores the live rendered fragment
+        when there is no pre-rendered one
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch("esistatus.views.esi_status_version", return_value="abc"),
+            mock.patch("esistatus.views.get_fragment", return_value=None),
+            mock.patch(
+                "esistatus.views._render_esi_status",
+                return_value=HttpResponse("<p>Live</p>"),
+            ),
+            mock.patch("esistatus.views.store_fragment") as mock_store_fragment,
+            translation.override("en"),
+        ):
+            response = ajax_esi_status(request=RequestFactory().get("/"))
+
+            mock_store_fragment.assert_called_once_with(
+                fragment=EsiStatusFragment.INDEX,
+                version="abc",
+                language="en",
+                html="<p>Live</p>",
+            )
+            self.assertEqual(response.content, b"<p>Live</p>")
+            self.assertEqual(response.headers["X-ESI-Status-Version"], "abc")
+
+    def test_does_not_store_fragment_without_data(self):
+        """
+        Test that nothing is stored when there is no ESI status data yet
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch("esistatus.views.esi_status_version", return_value=None),
+            mock.patch("esistatus.views.get_fragment") as mock_get_fragment,
+            mock.patch(
+                "esistatus.views._render_esi_status",
+                return_value=HttpResponse("<p>Live</p>"),
+            ),
+            mock.patch("esistatus.views.store_fragment") as mock_store_fragment,
+        ):
+            response = ajax_esi_status(request=RequestFactory().get("/"))
+
+            mock_get_fragment.assert_not_called()
+            mock_store_fragment.assert_not_called()
+            self.assertNotIn("X-ESI-Status-Version", response.headers)
+
+
+class TestAjaxEsiStatusConditionalRequests(BaseTestCase):
+    """
+    Test the HTTP caching headers of the AJAX ESI Status views
+    """
+
+    def test_sets_etag_and_cache_control(self):
+        """
+        Test that the response carries an ETag and must be revalidated
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch("esistatus.views.esi_status_version", return_value="abc"),
+            mock.patch("esistatus.views.get_fragment", return_value="<p>OK</p>"),
+            translation.override("en"),
+        ):
+            response = ajax_esi_status(request=RequestFactory().get("/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], f'"abc:en:{__version__}"')
+        self.assertIn("no-cache", response.headers["Cache-Control"])
+        self.assertIn("private", response.headers["Cache-Control"])
+
+    def test_looks_up_version_once_per_request(self):
+        """
+        Test that the ETag and the view share one lookup of the data version
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch(
+                "esistatus.views.esi_status_version", return_value="abc"
+            ) as mock_version,
+            mock.patch("esistatus.views.get_fragment", return_value="<p>OK</p>"),
+        ):
+            ajax_esi_status(request=RequestFactory().get("/"))
+
+        mock_version.assert_called_once_with()
+
+    def test_answers_matching_etag_with_not_modified(self):
+        """
+        Test that a request with a matching ETag is answered with 304
+        without rendering anything
+
+        :return:
+        :rtype:
+        """
+
+        request = RequestFactory().get(
+            "/", HTTP_IF_NONE_MATCH=f'"abc:en:{__version__}"'
+        )
+
+        with (
+            mock.patch("esistatus.views.esi_status_version", return_value="abc"),
+            mock.patch("esistatus.views.get_fragment") as mock_get_fragment,
+            mock.patch("esistatus.views._render_esi_status") as mock_render,
+            translation.override("en"),
+        ):
+            response = ajax_dashboard_widget(request=request)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertIn("no-cache", response.headers["Cache-Control"])
+        mock_get_fragment.assert_not_called()
+        mock_render.assert_not_called()
+
+    def test_etag_changes_with_language(self):
+        """
+        Test that a fragment in another language is not answered with 304
+
+        :return:
+        :rtype:
+        """
+
+        request = RequestFactory().get(
+            "/", HTTP_IF_NONE_MATCH=f'"abc:en:{__version__}"'
+        )
+
+        with (
+            mock.patch("esistatus.views.esi_status_version", return_value="abc"),
+            mock.patch("esistatus.views.get_fragment", return_value="<p>OK</p>"),
+            translation.override("de"),
+        ):
+            response = ajax_esi_status(request=request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], f'"abc:de:{__version__}"')
+
+    def test_no_etag_without_data(self):
+        """
+        Test that there is no ETag without ESI status data
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch("esistatus.views.esi_status_version", return_value=None),
+            mock.patch(
+                "esistatus.views._render_esi_status", return_value=HttpResponse()
+            ),
+        ):
+            response = ajax_esi_status(request=RequestFactory().get("/"))
+
+        self.assertNotIn("ETag", response.headers)
+
 
 class TestAjaxEsiStatusDasboardWidget(BaseTestCase):
     """
@@ -139,7 +353,9 @@ class TestAjaxEsiStatusDasboardWidget(BaseTestCase):
 
         with (
             mock.patch("esistatus.views._esi_status") as mock_esi_status,
-            mock.patch("esistatus.views.render") as mock_render,
+            mock.patch(
+                "esistatus.views.render", return_value=HttpResponse()
+            ) as mock_render,
         ):
             mock_esi_status.return_value = {
                 "esi_status": {"status": "OK"},
@@ -148,7 +364,7 @@ class TestAjaxEsiStatusDasboardWidget(BaseTestCase):
                 "esi_name": "EVE Swagger Interface",
             }
 
-            ajax_dashboard_widget(request=mock.Mock())
+            ajax_dashboard_widget(request=RequestFactory().get("/"))
 
             mock_render.assert_called_once_with(
                 request=mock.ANY,
@@ -171,11 +387,13 @@ class TestAjaxEsiStatusDasboardWidget(BaseTestCase):
 
         with (
             mock.patch("esistatus.views._esi_status") as mock_esi_status,
-            mock.patch("esistatus.views.render") as mock_render,
+            mock.patch(
+                "esistatus.views.render", return_value=HttpResponse()
+            ) as mock_render,
         ):
             mock_esi_status.return_value = {}
 
-            ajax_dashboard_widget(request=mock.Mock())
+            ajax_dashboard_widget(request=RequestFactory().get("/"))
 
             mock_render.assert_called_once_with(
                 request=mock.ANY,
@@ -189,6 +407,434 @@ class TestAjaxEsiStatusDasboardWidget(BaseTestCase):
             )
 
 
+class TestAjaxEsiStatusRoutes(BaseTestCase):
+    """
+    Test the AJAX ESI Status view for the routes of a single status and tag
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Set up the ESI routes
+
+        :return:
+        :rtype:
+        """
+
+        EsiRoute.objects.bulk_create(
+            [
+                EsiRoute(
+                    method="GET",
+                    path="/universe/types",
+                    status="OK",
+                    tag="Universe",
+                    operation_id="GetUniverseTypes",
+                    summary="Get types",
+                    description="Get a list of type ids",
+                ),
+                EsiRoute(
+                    method="GET",
+                    path="/alliances",
+                    status="OK",
+                    tag="Alliance",
+                ),
+                EsiRoute(
+                    method="POST",
+                    path="/universe/names",
+                    status="Down",
+                    tag="Universe",
+                ),
+            ]
+        )
+
+    def test_renders_routes_of_status_and_tag(self):
+        """
+        Test that only the routes of the requested status and tag are rendered
+
+        :return:
+        :rtype:
+        """
+
+        response = ajax_esi_status_routes(
+            request=RequestFactory().get("/"), status="OK", tag="Universe"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "/universe/types")
+        self.assertContains(response, "GetUniverseTypes")
+        self.assertNotContains(response, "/alliances")
+        self.assertNotContains(response, "/universe/names")
+
+    def test_raises_404_for_unknown_status(self):
+        """
+        Test that an unknown status is answered with 404
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(Http404):
+            ajax_esi_status_routes(
+                request=RequestFactory().get("/"), status="Broken", tag="Universe"
+            )
+
+
+class TestAjaxEsiStatusJson(BaseTestCase):
+    """
+    Test the AJAX ESI Status JSON view
+    """
+
+    def setUp(self):
+        """
+        Set up the ESI status and routes
+
+        :return:
+        :rtype:
+        """
+
+        EsiStatus.objects.create(
+            pk=1,
+            compatibility_date="2023-10-01",
+            esi_name="EVE Swagger Interface",
+            total_endpoints=3,
+            status_counts={
+                "OK": {"count": 2, "percentage": "66.67%"},
+                "Down": {"count": 1, "percentage": "33.33%"},
+            },
+        )
+        EsiRoute.objects.bulk_create(
+            [
+                EsiRoute(
+                    method="GET",
+                    path="/alliances",
+                    status="OK",
+                    tag="Alliance",
+                    operation_id="GetAlliances",
+                    summary="List all alliances",
+                    description="List all active player alliances",
+                ),
+                EsiRoute(
+                    method="GET",
+                    path="/universe/types",
+                    status="OK",
+                    tag="Universe",
+                    operation_id="GetUniverseTypes",
+                    summary="Get types",
+                    description="Get a list of type ids",
+                ),
+                EsiRoute(
+                    method="POST",
+                    path="/universe/names",
+                    status="Down",
+                    tag="Universe",
+                    operation_id="PostUniverseNames",
+                    summary="Get names",
+                    description="Resolve a set of IDs to names",
+                ),
+            ]
+        )
+
+    def _get_json(self, **query) -> dict:
+        """
+        Request the JSON view and return the decoded response
+
+        :param query:
+        :type query:
+        :return:
+        :rtype:
+        """
+
+        with mock.patch("esistatus.views.esi_status_version", return_value=None):
+            response = ajax_esi_status_json(
+                request=RequestFactory().get("/", data=query)
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(b", ", response.content)
+
+        return json.loads(response.content)
+
+    def test_returns_totals_and_counts_without_routes(self):
+        """
+        Test that only totals and counts are returned by default
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(
+            self._get_json(),
+            {
+                "compatibility_date": "2023-10-01",
+                "esi_name": "EVE Swagger Interface",
+                "total_endpoints": 3,
+                "statuses": {
+                    "Unknown": {"count": 0, "percentage": "0.00%"},
+                    "OK": {"count": 2, "percentage": "66.67%"},
+                    "Degraded": {"count": 0, "percentage": "0.00%"},
+                    "Down": {"count": 1, "percentage": "33.33%"},
+                    "Recovering": {"count": 0, "percentage": "0.00%"},
+                },
+            },
+        )
+
+    def test_returns_routes_filtered_by_status(self):
+        """
+        Test that routes can be requested and filtered by status
+
+        :return:
+        :rtype:
+        """
+
+        data = self._get_json(routes="true", status="down")
+
+        self.assertEqual(list(data["statuses"]), ["Down"])
+        self.assertEqual(
+            data["routes"],
+            [
+                {
+                    "status": "Down",
+                    "tag": "Universe",
+                    "path": "/universe/names",
+                    "method": "POST",
+                    "operation_id": "PostUniverseNames",
+                    "summary": "Get names",
+                    "description": "Resolve a set of IDs to names",
+                }
+            ],
+        )
+
+    def test_returns_routes_filtered_by_tag_without_descriptions(self):
+        """
+        Test that routes can be filtered by tag and returned without descriptions
+
+        :return:
+        :rtype:
+        """
+
+        data = self._get_json(routes="1", tag="Universe", descriptions="false")
+
+        self.assertEqual(
+            data["routes"],
+            [
+                {
+                    "status": "OK",
+                    "tag": "Universe",
+                    "path": "/universe/types",
+                    "method": "GET",
+                    "operation_id": "GetUniverseTypes",
+                },
+                {
+                    "status": "Down",
+                    "tag": "Universe",
+                    "path": "/universe/names",
+                    "method": "POST",
+                    "operation_id": "PostUniverseNames",
+                },
+            ],
+        )
+
+    def test_accepts_multiple_statuses(self):
+        """
+        Test that multiple statuses can be given comma-separated
+
+        :return:
+        :rtype:
+        """
+
+        data = self._get_json(routes="true", status="OK,Down", tag="alliance")
+
+        self.assertEqual(list(data["statuses"]), ["OK", "Down"])
+        self.assertEqual([route["path"] for route in data["routes"]], ["/alliances"])
+
+    def test_handles_missing_esi_status(self):
+        """
+        Test that the JSON view handles missing ESI status data gracefully
+
+        :return:
+        :rtype:
+        """
+
+        EsiStatus.objects.all().delete()
+
+        self.assertEqual(
+            self._get_json(routes="true"),
+            {
+                "compatibility_date": None,
+                "esi_name": None,
+                "total_endpoints": 0,
+                "statuses": {},
+                "routes": [],
+            },
+        )
+
+
+class TestAjaxEsiStatusEvents(BaseTestCase):
+    """
+    Test the AJAX ESI Status Server-Sent Events view
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Set up the user
+
+        :return:
+        :rtype:
+        """
+
+        super().setUpClass()
+
+        cls.user = create_fake_user(
+            character_id=random_id(), character_name="Bruce Wayne"
+        )
+
+    def _asgi_request(self, user) -> ASGIRequest:
+        """
+        Get an ASGI request for the view
+
+        :param user:
+        :type user:
+        :return:
+        :rtype:
+        """
+
+        request = AsyncRequestFactory().get("/")
+        request.user = user
+
+        return request
+
+    @override_settings(ESISTATUS_LIVE_UPDATES=False)
+    def test_returns_404_when_live_updates_are_disabled(self):
+        """
+        Test that the view is not available when live updates are disabled
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(Http404):
+            ajax_esi_status_events(request=self._asgi_request(user=self.user))
+
+    @override_settings(ESISTATUS_LIVE_UPDATES=True)
+    def test_returns_404_under_wsgi(self):
+        """
+        Test that the stream isn't served under WSGI, where it would keep a
+        web worker busy
+
+        :return:
+        :rtype:
+        """
+
+        request = RequestFactory().get("/")
+        request.user = self.user
+
+        with self.assertRaises(Http404):
+            ajax_esi_status_events(request=request)
+
+    @override_settings(ESISTATUS_LIVE_UPDATES=True)
+    def test_forbids_anonymous_users(self):
+        """
+        Test that anonymous users don't get a stream
+
+        :return:
+        :rtype:
+        """
+
+        response = ajax_esi_status_events(
+            request=self._asgi_request(user=AnonymousUser())
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+    @override_settings(ESISTATUS_LIVE_UPDATES=True)
+    def test_returns_event_stream_when_live_updates_are_enabled(self):
+        """
+        Test that the view streams events when live updates are enabled
+
+        :return:
+        :rtype:
+        """
+
+        response = ajax_esi_status_events(request=self._asgi_request(user=self.user))
+
+        self.assertTrue(response.streaming)
+        self.assertTrue(response.is_async)
+        self.assertEqual(response.headers["Content-Type"], "text/event-stream")
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        self.assertEqual(response.headers["X-Accel-Buffering"], "no")
+
+    def _collect(self, timeout: int) -> list[str]:
+        """
+        Collect the events of the stream
+
+        The event loop needs a local socket pair, which the network guard blocks.
+
+        :param timeout:
+        :type timeout:
+        :return:
+        :rtype:
+        """
+
+        async def collect():
+            return [event async for event in _esi_status_event_stream(timeout=timeout)]
+
+        with mock.patch("socket.socket", self.socket_original):
+            return async_to_sync(collect)()
+
+    def test_stream_sends_version_changes_and_keep_alives(self):
+        """
+        Test that the stream sends an event for every new version, keep-alive
+        comments in between, and ends after the timeout
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch(
+                "esistatus.views.esi_status_version",
+                side_effect=["abc", "abc", "def", "def", "def"],
+            ),
+            # Only the clock of the view, the event loop uses time.monotonic as well
+            mock.patch("esistatus.views.time") as mock_time,
+            mock.patch("esistatus.views.asyncio.sleep") as mock_sleep,
+        ):
+            mock_time.monotonic.side_effect = [0, 2, 4, 6, 20, 30]
+
+            events = self._collect(timeout=30)
+
+        self.assertEqual(
+            events,
+            [
+                "retry: 10000\n\n",
+                "event: version\ndata: abc\n\n",
+                "event: version\ndata: def\n\n",
+                ": keep-alive\n\n",
+            ],
+        )
+        self.assertEqual(mock_sleep.call_count, 4)
+
+    def test_stream_sends_empty_version_without_data(self):
+        """
+        Test that the stream sends an empty version without ESI status data
+
+        :return:
+        :rtype:
+        """
+
+        with (
+            mock.patch("esistatus.views.esi_status_version", return_value=None),
+            mock.patch("esistatus.views.time") as mock_time,
+            mock.patch("esistatus.views.asyncio.sleep"),
+        ):
+            mock_time.monotonic.side_effect = [0, 0]
+
+            events = self._collect(timeout=0)
+
+        self.assertEqual(events[1], "event: version\ndata: \n\n")
+
+
 class TestIndex(BaseTestCase):
     """
     Test the index view
@@ -204,10 +850,40 @@ class TestIndex(BaseTestCase):
 
         request = mock.Mock()
 
-        with mock.patch("esistatus.views.render") as mock_render:
+        with mock.patch(
+            "esistatus.views.render", return_value=HttpResponse()
+        ) as mock_render:
             index(request)
             mock_render.assert_called_once_with(
-                request=request, template_name="esistatus/index.html"
+                request=request,
+                template_name="esistatus/index.html",
+                context={"live_updates": False},
+            )
+
+    @override_settings(ESISTATUS_LIVE_UPDATES=True)
+    def test_enables_live_updates_only_under_asgi(self):
+        """
+        Test that the pages only connect to the stream under ASGI
+
+        :return:
+        :rtype:
+        """
+
+        user = create_fake_user(character_id=random_id(), character_name="Diana Prince")
+
+        for request, expected in (
+            (RequestFactory().get("/"), False),
+            (AsyncRequestFactory().get("/"), True),
+        ):
+            request.user = user
+
+            with mock.patch(
+                "esistatus.views.render", return_value=HttpResponse()
+            ) as mock_render:
+                index(request)
+
+            self.assertEqual(
+                mock_render.call_args.kwargs["context"], {"live_updates": expected}
             )
 
 
@@ -216,31 +892,177 @@ class TestHelperEsiStatus(BaseTestCase):
     Test the _esi_status function
     """
 
-    def test_returns_esi_status_with_valid_data(self):
+    def setUp(self):
         """
-        Test that the _esi_status function returns ESI status with valid data
+        Set up the ESI status and routes
 
         :return:
         :rtype:
         """
 
-        with mock.patch("esistatus.views.EsiStatus.objects.get") as mock_get:
-            mock_get.return_value.total_endpoints = 5
-            mock_get.return_value.status_data = {"key": "value"}
-            mock_get.return_value.compatibility_date = "2023-10-01"
-            mock_get.return_value.esi_name = "EVE Swagger Interface"
+        EsiStatus.objects.create(
+            pk=1,
+            compatibility_date="2023-10-01",
+            esi_name="EVE Swagger Interface",
+            total_endpoints=3,
+            status_counts={
+                "OK": {"count": 2, "percentage": "66.67%"},
+                "Down": {"count": 1, "percentage": "33.33%"},
+            },
+        )
+        EsiRoute.objects.bulk_create(
+            [
+                EsiRoute(
+                    method="GET",
+                    path="/universe/types",
+                    status="OK",
+                    tag="Universe",
+                    operation_id="GetUniverseTypes",
+                    summary="Get types",
+                    description="Get a list of type ids",
+                ),
+                EsiRoute(
+                    method="GET",
+                    path="/alliances",
+                    status="OK",
+                    tag="Alliance",
+                    operation_id="GetAlliances",
+                    summary="List all alliances",
+                    description="List all active player alliances",
+                ),
+                EsiRoute(
+                    method="POST",
+                    path="/universe/names",
+                    status="Down",
+                    tag="Universe",
+                    operation_id="PostUniverseNames",
+                    summary="Get names",
+                    description="Resolve a set of IDs to names",
+                ),
+            ]
+        )
 
-            result = _esi_status()
+    def test_returns_esi_status_with_valid_data(self):
+        """
+        Test that the _esi_status function returns the ESI status grouped by status
+        and tag
 
-            self.assertEqual(
-                result,
-                {
-                    "total_endpoints": 5,
-                    "esi_status": {"key": "value"},
-                    "compatibility_date": "2023-10-01",
-                    "esi_name": "EVE Swagger Interface",
+        :return:
+        :rtype:
+        """
+
+        result = _esi_status()
+
+        self.assertEqual(result["total_endpoints"], 3)
+        self.assertEqual(result["compatibility_date"], "2023-10-01")
+        self.assertEqual(result["esi_name"], "EVE Swagger Interface")
+        self.assertEqual(
+            list(result["esi_status"]),
+            ["Unknown", "OK", "Degraded", "Down", "Recovering"],
+        )
+        self.assertEqual(
+            result["esi_status"]["OK"],
+            {
+                "endpoints": {
+                    "Alliance": [
+                        {
+                            "path": "/alliances",
+                            "method": "GET",
+                            "operation_id": "GetAlliances",
+                            "summary": "List all alliances",
+                            "description": "List all active player alliances",
+                        }
+                    ],
+                    "Universe": [
+                        {
+                            "path": "/universe/types",
+                            "method": "GET",
+                            "operation_id": "GetUniverseTypes",
+                            "summary": "Get types",
+                            "description": "Get a list of type ids",
+                        }
+                    ],
                 },
-            )
+                "count": 2,
+                "percentage": "66.67%",
+            },
+        )
+        self.assertEqual(result["esi_status"]["Down"]["count"], 1)
+        self.assertEqual(result["esi_status"]["Down"]["percentage"], "33.33%")
+        self.assertEqual(
+            result["esi_status"]["Unknown"],
+            {"endpoints": {}, "count": 0, "percentage": "0.00%"},
+        )
+
+    def test_returns_only_counts_without_routes(self):
+        """
+        Test that the _esi_status function doesn't load any routes when they are
+        not needed
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(1):
+            result = _esi_status(with_routes=False)
+
+        self.assertEqual(result["esi_status"]["OK"]["count"], 2)
+        self.assertEqual(result["esi_status"]["OK"]["endpoints"], {})
+        self.assertEqual(result["esi_status"]["Down"]["count"], 1)
+
+    def test_returns_tags_per_status(self):
+        """
+        Test that the _esi_status function can load only the tags per status
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertNumQueries(2):
+            result = _esi_status(with_routes=False, with_tags=True)
+
+        self.assertEqual(result["esi_status"]["OK"]["tags"], ["Alliance", "Universe"])
+        self.assertEqual(result["esi_status"]["OK"]["endpoints"], {})
+        self.assertEqual(result["esi_status"]["Down"]["tags"], ["Universe"])
+        self.assertNotIn("tags", result["esi_status"]["Unknown"])
+
+    def test_returns_routes_without_descriptions(self):
+        """
+        Test that the _esi_status function can leave out summary and description
+
+        :return:
+        :rtype:
+        """
+
+        result = _esi_status(with_descriptions=False)
+
+        self.assertEqual(
+            result["esi_status"]["Down"]["endpoints"],
+            {
+                "Universe": [
+                    {
+                        "path": "/universe/names",
+                        "method": "POST",
+                        "operation_id": "PostUniverseNames",
+                    }
+                ]
+            },
+        )
+
+    def test_filters_routes_by_status_and_tag(self):
+        """
+        Test that the _esi_status function filters the routes by status and tag,
+        while still counting all of them
+
+        :return:
+        :rtype:
+        """
+
+        result = _esi_status(statuses={"ok"}, tags={"universe"})
+
+        self.assertEqual(list(result["esi_status"]["OK"]["endpoints"]), ["Universe"])
+        self.assertEqual(result["esi_status"]["Down"]["endpoints"], {})
+        self.assertEqual(result["esi_status"]["Down"]["count"], 1)
 
     def test_returns_empty_dict_when_esi_status_does_not_exist(self):
         """
@@ -250,43 +1072,34 @@ class TestHelperEsiStatus(BaseTestCase):
         :rtype:
         """
 
-        with (
-            mock.patch(
-                "esistatus.views.EsiStatus.objects.get",
-                side_effect=EsiStatus.DoesNotExist,
-            ),
-            mock.patch("esistatus.views.logger.debug") as mock_debug,
-        ):
+        EsiStatus.objects.all().delete()
+
+        with mock.patch("esistatus.views.logger.debug") as mock_debug:
             result = _esi_status()
 
             self.assertEqual(result, {})
             mock_debug.assert_called_with("ESI Status data does not exist.")
 
-    def test_processes_empty_esi_status_data(self):
+    def test_processes_esi_status_without_routes(self):
         """
-        Test that the _esi_status function processes empty ESI status data
+        Test that the _esi_status function handles an ESI status without routes
 
         :return:
         :rtype:
         """
 
-        with mock.patch("esistatus.views.EsiStatus.objects.get") as mock_get:
-            mock_get.return_value.total_endpoints = 0
-            mock_get.return_value.status_data = []
-            mock_get.return_value.compatibility_date = None
-            mock_get.return_value.esi_name = "EVE Swagger Interface"
+        EsiRoute.objects.all().delete()
+        EsiStatus.objects.filter(pk=1).update(status_counts={})
 
-            result = _esi_status()
+        result = _esi_status()
 
-            self.assertEqual(
-                result,
-                {
-                    "total_endpoints": 0,
-                    "esi_status": [],
-                    "compatibility_date": None,
-                    "esi_name": "EVE Swagger Interface",
-                },
+        self.assertEqual(result["total_endpoints"], 3)
+        self.assertTrue(
+            all(
+                data == {"endpoints": {}, "count": 0, "percentage": "0.00%"}
+                for data in result["esi_status"].values()
             )
+        )
 
 
 class TestHelperRenderEsiStatus(BaseTestCase):
@@ -304,7 +1117,9 @@ class TestHelperRenderEsiStatus(BaseTestCase):
 
         with (
             mock.patch("esistatus.views._esi_status") as mock_esi_status,
-            mock.patch("esistatus.views.render") as mock_render,
+            mock.patch(
+                "esistatus.views.render", return_value=HttpResponse()
+            ) as mock_render,
         ):
             mock_esi_status.return_value = {
                 "esi_status": {"status": "OK"},
@@ -340,7 +1155,9 @@ class TestHelperRenderEsiStatus(BaseTestCase):
 
         with (
             mock.patch("esistatus.views._esi_status") as mock_esi_status,
-            mock.patch("esistatus.views.render") as mock_render,
+            mock.patch(
+                "esistatus.views.render", return_value=HttpResponse()
+            ) as mock_render,
         ):
             mock_esi_status.return_value = {
                 "esi_status": {"status": "OK"},
@@ -375,7 +1192,9 @@ class TestHelperRenderEsiStatus(BaseTestCase):
 
         with (
             mock.patch("esistatus.views._esi_status") as mock_esi_status,
-            mock.patch("esistatus.views.render") as mock_render,
+            mock.patch(
+                "esistatus.views.render", return_value=HttpResponse()
+            ) as mock_render,
         ):
             mock_esi_status.return_value = {}
 
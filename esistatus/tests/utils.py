@@ -10,6 +10,14 @@ import secrets
 from allianceauth.authentication.models import User
 from allianceauth.tests.auth_utils import AuthUtils
 
+# In-process cache for tests that need a working cache, the tests can't reach Redis
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "esistatus-tests",
+    }
+}
+
 
 def create_fake_user(
     character_id: int,
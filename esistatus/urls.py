@@ -26,6 +26,21 @@ ajax_urls = [
                     view=views.ajax_esi_status,
                     name="ajax_esi_status",
                 ),
+                path(
+                    route="esi-status/events/",
+                    view=views.ajax_esi_status_events,
+                    name="ajax_esi_status_events",
+                ),
+                path(
+                    route="esi-status/routes/<str:status>/<str:tag>/",
+                    view=views.ajax_esi_status_routes,
+                    name="ajax_esi_status_routes",
+                ),
+                path(
+                    route="esi-status/json/",
+                    view=views.ajax_esi_status_json,
+                    name="ajax_esi_status_json",
+                ),
             ]
         ),
     ),
@@ -37,4 +52,5 @@ urlpatterns = [
         route=f"{INTERNAL_URL_PREFIX}/",
         view=include(ajax_urls),
     ),
+    path(route=f"{INTERNAL_URL_PREFIX}/metrics/", view=views.metrics, name="metrics"),
 ]
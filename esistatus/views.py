@@ -2,40 +2,149 @@
 The views
 """
 
+# Standard Library
+import asyncio
+import operator
+import time
+from collections.abc import AsyncIterator
+from functools import reduce
+
+# Third Party
+from asgiref.sync import sync_to_async
+
 # Django
+from django.core.handlers.asgi import ASGIRequest
 from django.core.handlers.wsgi import WSGIRequest
-from django.http import HttpResponse
+from django.db.models import Q
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
 from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
 
 # AA ESI Status
-from esistatus.models import EsiStatus
+from esistatus import __version__
+from esistatus.app_settings import (
+    live_updates_enabled,
+    live_updates_timeout,
+    metrics_enabled,
+    metrics_token,
+)
+from esistatus.constants import ESI_ROUTE_STATUSES, EsiStatusFragment
+from esistatus.fragments import esi_status_version, get_fragment, store_fragment
+from esistatus.metrics import render_metrics
+from esistatus.models import EsiRoute, EsiStatus
 from esistatus.providers.applogger import AppLogger
 
 logger = AppLogger(my_logger=get_extension_logger(__name__))
 
+# Live updates: how often (in seconds) the stream checks for a new data version,
+# sends a keep-alive comment, and how long the browser waits before reconnecting
+LIVE_UPDATES_CHECK_INTERVAL = 2
+LIVE_UPDATES_KEEPALIVE = 15
+LIVE_UPDATES_RETRY = 10
+
+# Response header carrying the ESI status data version
+ESI_STATUS_VERSION_HEADER = "X-ESI-Status-Version"
+
 
-def _esi_status() -> dict:
+def _esi_status(
+    with_routes: bool = True,
+    with_descriptions: bool = True,
+    with_tags: bool = False,
+    statuses: set[str] | None = None,
+    tags: set[str] | None = None,
+) -> dict:
     """
     Get the ESI status
 
+    The counts per status are always included (they are stored with the ESI status,
+    so they cost no extra query), the routes only when asked for.
+
+    :param with_routes: Include the routes
+    :type with_routes: bool
+    :param with_descriptions: Include summary and description of the routes
+    :type with_descriptions: bool
+    :param with_tags: Include the tags that have routes, per status
+    :type with_tags: bool
+    :param statuses: Lower-cased statuses to include routes for, all if empty
+    :type statuses: set[str] | None
+    :param tags: Lower-cased tags to include routes for, all if empty
+    :type tags: set[str] | None
     :return: The ESI status
     :rtype: dict
     """
 
     try:
-        esi_status = EsiStatus.objects.get(pk=1)
+        esi_status = EsiStatus.objects.only(
+            "total_endpoints", "compatibility_date", "esi_name", "status_counts"
+        ).get(pk=1)
     except EsiStatus.DoesNotExist:
         logger.debug("ESI Status data does not exist.")
 
         return {}
 
+    esi_endpoint_status = {
+        status: {"endpoints": {}, "count": 0, "percentage": "0.00%"}
+        for status in ESI_ROUTE_STATUSES
+    }
+
+    for status, counts in esi_status.status_counts.items():
+        esi_endpoint_status.setdefault(status, {"endpoints": {}})
+        esi_endpoint_status[status].update(counts)
+
+    if with_routes:
+        fields = ["status", "tag", "path", "method", "operation_id"]
+
+        if with_descriptions:
+            fields += ["summary", "description"]
+
+        routes = EsiRoute.objects.order_by("tag", "path", "method")
+
+        if statuses:
+            routes = routes.filter(
+                status__in=[
+                    status
+                    for status in esi_endpoint_status
+                    if status.lower() in statuses
+                ]
+            )
+
+        if tags:
+            routes = routes.filter(
+                reduce(operator.or_, (Q(tag__iexact=tag) for tag in tags))
+            )
+
+        for route in routes.values(*fields):
+            status = route.pop("status")
+            tag = route.pop("tag")
+
+            esi_endpoint_status[status]["endpoints"].setdefault(tag, []).append(route)
+
+    if with_tags:
+        for route in (
+            EsiRoute.objects.order_by("status", "tag")
+            .values("status", "tag")
+            .distinct()
+        ):
+            esi_endpoint_status[route["status"]].setdefault("tags", []).append(
+                route["tag"]
+            )
+
     return {
         "total_endpoints": esi_status.total_endpoints,
-        "esi_status": esi_status.status_data,
+        "esi_status": esi_endpoint_status,
         "compatibility_date": esi_status.compatibility_date,
         "esi_name": esi_status.esi_name,
     }
@@ -51,11 +160,18 @@ def index(request: WSGIRequest) -> HttpResponse:
     :rtype: HttpResponse
     """
 
-    return render(request=request, template_name="esistatus/index.html")
+    return render(
+        request=request,
+        template_name="esistatus/index.html",
+        context={"live_updates": _live_updates_available(request=request)},
+    )
 
 
 def _render_esi_status(
-    request: WSGIRequest, template_name: str, with_compat_date: bool = False
+    request: WSGIRequest,
+    template_name: str,
+    with_compat_date: bool = False,
+    with_tags: bool = False,
 ) -> HttpResponse:
     """
     Render the ESI status template with the ESI status context data
@@ -64,11 +180,15 @@ def _render_esi_status(
     :type request:
     :param template_name:
     :type template_name:
+    :param with_compat_date:
+    :type with_compat_date:
+    :param with_tags: Load the tags per status, for templates that list them
+    :type with_tags: bool
     :return:
     :rtype:
     """
 
-    esi_status = _esi_status() or {}
+    esi_status = _esi_status(with_routes=False, with_tags=with_tags) or {}
     context = {
         "esi_endpoint_status": esi_status.get("esi_status"),
         "total_endpoints": esi_status.get("total_endpoints"),
@@ -85,6 +205,99 @@ def _render_esi_status(
     )
 
 
+def _esi_status_version(request: WSGIRequest) -> str | None:
+    """
+    Get the current ESI status data version, looked up once per request
+
+    The ETag and the view both need it, so it is kept on the request.
+
+    :param request:
+    :type request:
+    :return: The version, or None if there is no ESI status data yet
+    :rtype: str | None
+    """
+
+    if not hasattr(request, "_esistatus_version"):
+        request._esistatus_version = (  # pylint: disable=protected-access
+            esi_status_version()
+        )
+
+    return request._esistatus_version  # pylint: disable=protected-access
+
+
+def _esi_status_fragment(
+    request: WSGIRequest, fragment: EsiStatusFragment
+) -> HttpResponse:
+    """
+    Return the pre-rendered ESI status fragment for the current data version and
+    language, falling back to a live render (which is then stored) if there is none
+
+    :param request:
+    :type request:
+    :param fragment:
+    :type fragment:
+    :return:
+    :rtype:
+    """
+
+    version = _esi_status_version(request=request)
+    language = translation.get_language()
+    html = (
+        get_fragment(fragment=fragment, version=version, language=language)
+        if version
+        else None
+    )
+
+    if html is not None:
+        response = HttpResponse(html)
+    else:
+        response = _render_esi_status(
+            request=request,
+            template_name=fragment.value,
+            with_compat_date=True,
+            with_tags=fragment is EsiStatusFragment.INDEX,
+        )
+
+        if version and response.status_code == 200:
+            store_fragment(
+                fragment=fragment,
+                version=version,
+                language=language,
+                html=response.content.decode(response.charset),
+            )
+
+    # Lets the polling clients tell if anything changed since their last request
+    if version:
+        response[ESI_STATUS_VERSION_HEADER] = version
+
+    return response
+
+
+def _esi_status_etag(
+    request: WSGIRequest, *args, **kwargs  # pylint: disable=unused-argument
+) -> str | None:
+    """
+    Get the ETag for the ESI status fragments
+
+    The ETag is derived from the current data version, the language and the app
+    version, so conditional requests can be answered without touching the templates.
+
+    :param request:
+    :type request:
+    :return: The ETag, or None if there is no ESI status data yet
+    :rtype: str | None
+    """
+
+    version = _esi_status_version(request=request)
+
+    if not version:
+        return None
+
+    return f'"{version}:{translation.get_language()}:{__version__}"'
+
+
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_esi_status_etag)
 def ajax_esi_status(request: WSGIRequest) -> HttpResponse:
     """
     AJAX ESI Status view for the main index page
@@ -95,13 +308,11 @@ def ajax_esi_status(request: WSGIRequest) -> HttpResponse:
     :rtype:
     """
 
-    return _render_esi_status(
-        request=request,
-        template_name="esistatus/partials/index/esi-status.html",
-        with_compat_date=True,
-    )
+    return _esi_status_fragment(request=request, fragment=EsiStatusFragment.INDEX)
 
 
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_esi_status_etag)
 def ajax_dashboard_widget(request: WSGIRequest) -> HttpResponse:
     """
     AJAX ESI Status view for the dashboard widget
@@ -112,10 +323,291 @@ def ajax_dashboard_widget(request: WSGIRequest) -> HttpResponse:
     :rtype:
     """
 
-    return _render_esi_status(
+    return _esi_status_fragment(
+        request=request, fragment=EsiStatusFragment.DASHBOARD_WIDGET
+    )
+
+
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_esi_status_etag)
+def ajax_esi_status_routes(request: WSGIRequest, status: str, tag: str) -> HttpResponse:
+    """
+    AJAX ESI Status view for the routes of a single status and tag, loaded when
+    the category is expanded on the main index page
+
+    :param request:
+    :type request:
+    :param status:
+    :type status:
+    :param tag:
+    :type tag:
+    :return:
+    :rtype:
+    """
+
+    if status not in ESI_ROUTE_STATUSES:
+        raise Http404("Unknown ESI route status.")
+
+    endpoints = (
+        EsiRoute.objects.filter(status=status, tag=tag)
+        .order_by("path", "method")
+        .values("path", "method", "operation_id", "summary", "description")
+    )
+
+    return render(
         request=request,
-        template_name="esistatus/partials/dashboard-widget/esi-status.html",
-        with_compat_date=True,
+        template_name="esistatus/partials/routes.html",
+        context={"endpoints": endpoints},
+    )
+
+
+def _query_list(request: WSGIRequest, key: str) -> set[str]:
+    """
+    Get a query parameter as a set of lower-cased values
+
+    Values can be given as repeated parameters or comma-separated.
+
+    :param request:
+    :type request:
+    :param key:
+    :type key:
+    :return:
+    :rtype:
+    """
+
+    return {
+        value.strip().lower()
+        for values in request.GET.getlist(key)
+        for value in values.split(",")
+        if value.strip()
+    }
+
+
+def _query_flag(request: WSGIRequest, key: str, default: bool) -> bool:
+    """
+    Get a query parameter as a boolean flag
+
+    :param request:
+    :type request:
+    :param key:
+    :type key:
+    :param default:
+    :type default:
+    :return:
+    :rtype:
+    """
+
+    value = request.GET.get(key)
+
+    if value is None:
+        return default
+
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _esi_status_routes(esi_status: dict) -> list[dict]:
+    """
+    Flatten the ESI status data into a list of routes
+
+    :param esi_status: The ESI status data, grouped by status and tag
+    :type esi_status: dict
+    :return: The routes
+    :rtype: list[dict]
+    """
+
+    return [
+        {"status": status, "tag": tag, **endpoint}
+        for status, data in esi_status.items()
+        for tag, endpoints in data.get("endpoints", {}).items()
+        for endpoint in endpoints
+    ]
+
+
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_esi_status_etag)
+def ajax_esi_status_json(request: WSGIRequest) -> JsonResponse:
+    """
+    AJAX ESI Status view returning the ESI status as JSON
+
+    Query parameters:
+
+    - ``status``: Only include these statuses (comma-separated or repeated)
+    - ``tag``: Only include routes with these tags (comma-separated or repeated)
+    - ``routes``: Include the routes (default: false)
+    - ``descriptions``: Include summary and description of the routes (default: true)
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    statuses = _query_list(request=request, key="status")
+    with_routes = _query_flag(request=request, key="routes", default=False)
+    esi_status = (
+        _esi_status(
+            with_routes=with_routes,
+            with_descriptions=_query_flag(
+                request=request, key="descriptions", default=True
+            ),
+            statuses=statuses,
+            tags=_query_list(request=request, key="tag"),
+        )
+        or {}
+    )
+    status_data = esi_status.get("esi_status") or {}
+
+    data = {
+        "compatibility_date": esi_status.get("compatibility_date"),
+        "esi_name": esi_status.get("esi_name"),
+        "total_endpoints": esi_status.get("total_endpoints", 0),
+        "statuses": {
+            status: {
+                "count": values.get("count", 0),
+                "percentage": values.get("percentage"),
+            }
+            for status, values in status_data.items()
+            if not statuses or status.lower() in statuses
+        },
+    }
+
+    if with_routes:
+        data["routes"] = _esi_status_routes(esi_status=status_data)
+
+    return JsonResponse(data=data, json_dumps_params={"separators": (",", ":")})
+
+
+def _live_updates_available(request: WSGIRequest) -> bool:
+    """
+    Check if live updates can be served for the request
+
+    The stream stays open for minutes, so it is only served under ASGI, where
+    it doesn't keep a web worker busy, and only to logged-in users.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    return (
+        live_updates_enabled()
+        and isinstance(request, ASGIRequest)
+        and request.user.is_authenticated
+    )
+
+
+async def _esi_status_event_stream(timeout: int) -> AsyncIterator[str]:
+    """
+    Stream the ESI status data version as Server-Sent Events
+
+    An event is sent when the stream starts and whenever the update task stored a
+    new data version, a comment keeps the connection alive in between. The stream
+    ends after the timeout and the browser reconnects.
+
+    :param timeout: Maximum time (in seconds) to keep the stream open
+    :type timeout: int
+    :return:
+    :rtype:
+    """
+
+    started = last_sent = time.monotonic()
+    last_version = None
+
+    yield f"retry: {LIVE_UPDATES_RETRY * 1000}\n\n"
+
+    while True:
+        version = await sync_to_async(esi_status_version)() or ""
+        now = time.monotonic()
+
+        if version != last_version:
+            yield f"event: version\ndata: {version}\n\n"
+
+            last_version = version
+            last_sent = now
+        elif now - last_sent >= LIVE_UPDATES_KEEPALIVE:
+            yield ": keep-alive\n\n"
+
+            last_sent = now
+
+        if now - started >= timeout:
+            return
+
+        await asyncio.sleep(LIVE_UPDATES_CHECK_INTERVAL)
+
+
+def ajax_esi_status_events(request: WSGIRequest) -> HttpResponse:
+    """
+    AJAX ESI Status view streaming data version changes as Server-Sent Events
+
+    Only available under ASGI, under WSGI every open stream would keep a web
+    worker busy until it times out.
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    if not live_updates_enabled():
+        raise Http404("Live updates are disabled.")
+
+    if not isinstance(request, ASGIRequest):
+        raise Http404("Live updates need Auth to be served via ASGI.")
+
+    if not request.user.is_authenticated:
+        return HttpResponseForbidden()
+
+    response = StreamingHttpResponse(
+        streaming_content=_esi_status_event_stream(timeout=live_updates_timeout()),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+
+    return response
+
+
+def _metrics_authorized(request: WSGIRequest) -> bool:
+    """
+    Check if the request may read the metrics, either with the configured token
+    as bearer token or as superuser
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    token = metrics_token()
+    authorization = request.headers.get("Authorization", "")
+
+    if token and authorization.startswith("Bearer "):
+        return constant_time_compare(authorization.removeprefix("Bearer "), token)
+
+    return request.user.is_authenticated and request.user.is_superuser
+
+
+@cache_control(private=True, no_store=True)
+def metrics(request: WSGIRequest) -> HttpResponse:
+    """
+    Metrics of the ESI status update in the Prometheus text format
+
+    :param request:
+    :type request:
+    :return:
+    :rtype:
+    """
+
+    if not metrics_enabled():
+        raise Http404("Metrics are disabled.")
+
+    if not _metrics_authorized(request=request):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        content=render_metrics(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
     )
 
 
@@ -131,7 +623,9 @@ def dashboard_widget(request: WSGIRequest) -> str:
 
     return (
         render_to_string(
-            template_name="esistatus/dashboard-widget.html", request=request
+            template_name="esistatus/dashboard-widget.html",
+            context={"live_updates": _live_updates_available(request=request)},
+            request=request,
         )
         if request.user.is_superuser
         else ""